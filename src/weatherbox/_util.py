@@ -0,0 +1,8 @@
+"""
+Small numeric helpers shared by the display and brightness packages.
+"""
+
+
+def clamp_u8(value: int) -> int:
+    """Clamp a value to the 0-255 range of a pixel or brightness level."""
+    return 0 if value < 0 else (255 if value > 255 else int(value))
@@ -0,0 +1,68 @@
+"""
+Numeric kernels for the per-frame brightness pipeline.
+Compiled with numba when available; otherwise run as plain Python.
+"""
+
+try:
+    from numba import njit
+except ImportError:
+    # numba wheels are often unavailable on Pi ARM builds
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Fixed-point scale: ADC deltas are multiplied by a Q16.16 factor so the
+# kernel stays in integer arithmetic
+Q16_SHIFT = 16
+
+
+def adc_scale_q16(adc_range: int) -> int:
+    """Precompute the Q16.16 factor mapping an ADC range onto 0-255."""
+    if adc_range <= 0:
+        return 0
+    return (255 << Q16_SHIFT) // adc_range
+
+
+@njit(cache=True)
+def normalize_adc(raw, min_adc, max_adc, scale_q16, invert):
+    """
+    Map a raw ADC reading linearly onto 0-255.
+
+    Args:
+        raw: Raw ADC value
+        min_adc: ADC value corresponding to darkness
+        max_adc: ADC value corresponding to bright
+        scale_q16: Factor from adc_scale_q16(max_adc - min_adc)
+        invert: Invert reading (darker = higher value)
+
+    Returns:
+        Brightness value (0-255)
+    """
+    if raw <= min_adc:
+        value = 0
+    elif raw >= max_adc:
+        value = 255
+    else:
+        value = ((raw - min_adc) * scale_q16) >> Q16_SHIFT
+    if invert:
+        value = 255 - value
+    return value
+
+
+@njit(cache=True)
+def combine(base, sensor, cap):
+    """
+    Combine base and sensor brightness under the hardware cap.
+
+    Args:
+        base: Day/night base brightness
+        sensor: Ambient sensor brightness (0-255)
+        cap: Hardware brightness cap
+
+    Returns:
+        min(base, sensor, cap)
+    """
+    value = sensor if sensor < base else base
+    return cap if value > cap else value
@@ -3,10 +3,15 @@ Brightness controller for LED matrix displays.
 Handles hardware brightness limits, night mode, and optional sensor integration.
 """
 
+import functools
 import logging
-from datetime import datetime, time
+import time
+from datetime import datetime
 from typing import Optional
 
+from weatherbox.brightness import _kernel
+from weatherbox._util import clamp_u8
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,10 +25,33 @@ class BrightnessController:
     - Optional ambient brightness sensor integration
     """
 
+    __slots__ = (
+        'max_brightness', 'night_mode_brightness', 'day_brightness',
+        'current_brightness', 'sensor_adapter', 'last_sensor_value',
+        '_night_start_s', '_night_end_s',
+        '_sensor_cache_ttl', '_sensor_last_read_mono',
+        '_read_sensor_cached', '_sensor_hysteresis',
+        '_cached_minute', '_cached_night',
+        '_last_is_night', '_last_mode_ts',
+    )
+
     # Night mode threshold (hour when brightness reduces)
     NIGHT_MODE_START_HOUR = 22  # 22:00
     NIGHT_MODE_END_HOUR = 6     # 06:00 (morning)
 
+    # Minimum seconds between ambient sensor reads (I2C bus transactions)
+    DEFAULT_SENSOR_POLL_SECONDS = 2.0
+
+    # Sensor changes smaller than this are treated as jitter and ignored
+    DEFAULT_SENSOR_HYSTERESIS = 8
+
+    # get_status reuses the mode from calculate_brightness up to this age
+    STATUS_MODE_MAX_AGE_SECONDS = 60.0
+
+    # Upper bound on next_transition_monotonic() lookahead, so a DST
+    # change can delay a night-mode switch by at most this long
+    MAX_TRANSITION_WAIT_SECONDS = 3600.0
+
     def __init__(
         self,
         max_brightness: int = 200,          # Hardware cap (0-255)
@@ -39,10 +67,10 @@ class BrightnessController:
             night_mode_brightness: Brightness when night mode active (0-255)
             day_brightness: Explicit daytime brightness (None = use max_brightness)
         """
-        self.max_brightness = max(0, min(255, max_brightness))
-        self.night_mode_brightness = max(0, min(255, night_mode_brightness))
+        self.max_brightness = clamp_u8(max_brightness)
+        self.night_mode_brightness = clamp_u8(night_mode_brightness)
         self.day_brightness = (
-            max(0, min(255, day_brightness))
+            clamp_u8(day_brightness)
             if day_brightness is not None
             else self.max_brightness
         )
@@ -51,6 +79,26 @@ class BrightnessController:
         self.sensor_adapter = None
         self.last_sensor_value = None
 
+        # Night window bounds as seconds since midnight
+        self._night_start_s = self.NIGHT_MODE_START_HOUR * 3600
+        self._night_end_s = self.NIGHT_MODE_END_HOUR * 3600
+
+        # Sensor reads are memoized per poll-interval bucket of monotonic
+        # time, so every caller within a bucket shares one I2C transaction
+        self._sensor_cache_ttl = self.DEFAULT_SENSOR_POLL_SECONDS
+        self._sensor_last_read_mono = None
+        self._read_sensor_cached = functools.lru_cache(maxsize=1)(
+            self._read_sensor_now)
+        self._sensor_hysteresis = self.DEFAULT_SENSOR_HYSTERESIS
+
+        # Night-mode decision memoized per minute of wall-clock time
+        self._cached_minute = None
+        self._cached_night = False
+
+        # Mode seen by the last live calculate_brightness, for get_status
+        self._last_is_night = False
+        self._last_mode_ts = None
+
         logger.info(
             f"Brightness controller initialized: "
             f"day={self.day_brightness}, night={self.night_mode_brightness}, "
@@ -58,19 +106,67 @@ class BrightnessController:
         )
 
     def is_night_mode(self, dt: datetime = None) -> bool:
-        """Check if current time is within night mode window."""
-        dt = dt or datetime.now()
-        current_time = dt.time()
+        """
+        Check if current time is within night mode window.
+
+        When called without an explicit time, the result is cached for the
+        current minute so per-frame callers don't rebuild datetimes.
+        """
+        if dt is None:
+            now = time.time()
+            minute = int(now // 60)
+            if minute == self._cached_minute:
+                return self._cached_night
+            # localtime() rather than a fixed UTC offset so DST is honoured
+            local = time.localtime(now)
+            self._cached_night = self._in_night_window(
+                local.tm_hour * 3600 + local.tm_min * 60 + local.tm_sec)
+            self._cached_minute = minute
+            return self._cached_night
+
+        return self._in_night_window(
+            dt.hour * 3600 + dt.minute * 60 + dt.second)
+
+    def next_transition_monotonic(self) -> float:
+        """
+        Get the monotonic time when brightness may next need recomputing.
 
+        Without a sensor, brightness only changes at the start or end of
+        the night window (or when a setter is called), so callers can hold
+        current_brightness until this deadline instead of re-evaluating
+        every tick. With a sensor, the deadline is the next sensor poll.
+
+        Returns:
+            time.monotonic() value of the next possible transition
+        """
+        now_mono = time.monotonic()
+        local = time.localtime()
+        seconds_of_day = \
+            local.tm_hour * 3600 + local.tm_min * 60 + local.tm_sec
+
+        wait = self.MAX_TRANSITION_WAIT_SECONDS
+        for boundary in (self._night_start_s, self._night_end_s):
+            wait = min(wait, (boundary - seconds_of_day) % 86400 or 86400)
+        deadline = now_mono + wait
+
+        if self.sensor_adapter is not None:
+            ttl = self._sensor_cache_ttl
+            if self._sensor_last_read_mono is None or ttl <= 0:
+                return now_mono
+            next_poll = (self._sensor_last_read_mono // ttl + 1) * ttl
+            deadline = min(deadline, next_poll)
+        return deadline
+
+    def _in_night_window(self, seconds_of_day: int) -> bool:
+        """Check a seconds-since-midnight value against the night window."""
         # Handle overnight window (e.g., 22:00-06:00)
-        if self.NIGHT_MODE_START_HOUR > self.NIGHT_MODE_END_HOUR:
+        if self._night_start_s > self._night_end_s:
             # Window crosses midnight
-            return current_time >= time(self.NIGHT_MODE_START_HOUR) or \
-                current_time < time(self.NIGHT_MODE_END_HOUR)
+            return seconds_of_day >= self._night_start_s or \
+                seconds_of_day < self._night_end_s
         else:
             # Window within same day
-            return time(self.NIGHT_MODE_START_HOUR) <= current_time < \
-                time(self.NIGHT_MODE_END_HOUR)
+            return self._night_start_s <= seconds_of_day < self._night_end_s
 
     def calculate_brightness(self, dt: datetime = None) -> int:
         """
@@ -88,10 +184,12 @@ class BrightnessController:
         Returns:
             Brightness value (0-255)
         """
-        dt = dt or datetime.now()
-
         # Base brightness from time of day
-        if self.is_night_mode(dt):
+        is_night = self.is_night_mode(dt)
+        if dt is None:
+            self._last_is_night = is_night
+            self._last_mode_ts = time.monotonic()
+        if is_night:
             base_brightness = self.night_mode_brightness
             mode = "night"
         else:
@@ -99,32 +197,58 @@ class BrightnessController:
             mode = "day"
 
         # Apply sensor adjustment if available
-        brightness = base_brightness
-        if self.sensor_adapter:
+        debug = logger.isEnabledFor(logging.DEBUG)
+        max_brightness = self.max_brightness
+        final_brightness = None
+        if self.sensor_adapter is not None:
             try:
-                sensor_value = self.sensor_adapter.read_ambient_brightness()
+                sensor_value = self._read_sensor()
                 if sensor_value is not None:
+                    # Hold the last accepted reading while the sensor
+                    # jitters within the hysteresis band
+                    last = self.last_sensor_value
+                    if last is not None and abs(sensor_value - last) < \
+                            self._sensor_hysteresis:
+                        sensor_value = last
+
                     # Sensor value (0-255) can reduce brightness further
-                    # Use minimum of base and sensor value
-                    brightness = min(base_brightness, sensor_value)
+                    # Use minimum of base and sensor value (and the cap)
+                    final_brightness = _kernel.combine(
+                        base_brightness, sensor_value, max_brightness)
                     self.last_sensor_value = sensor_value
-                    logger.debug(
-                        f"Sensor adjusted brightness: {sensor_value} → {brightness}")
+                    if debug:
+                        logger.debug(
+                            "Sensor adjusted brightness: %d → %d",
+                            sensor_value, final_brightness)
             except Exception as e:
-                logger.warning(f"Sensor read error: {e}")
+                logger.warning("Sensor read error: %s", e)
 
-        # Apply hardware cap
-        final_brightness = min(brightness, self.max_brightness)
+        # Apply hardware cap (combine() already caps sensor-adjusted values)
+        if final_brightness is None:
+            final_brightness = min(base_brightness, max_brightness)
 
         if final_brightness != self.current_brightness:
             logger.info(
-                f"Brightness transition: {self.current_brightness} → {final_brightness} "
-                f"(mode={mode}, base={base_brightness}, max={self.max_brightness})"
+                "Brightness transition: %d → %d (mode=%s, base=%d, max=%d)",
+                self.current_brightness, final_brightness,
+                mode, base_brightness, max_brightness
             )
             self.current_brightness = final_brightness
 
         return final_brightness
 
+    def _read_sensor(self) -> Optional[int]:
+        """Read the ambient sensor, at most once per poll interval."""
+        ttl = self._sensor_cache_ttl
+        if ttl <= 0:
+            return self._read_sensor_now(None)
+        return self._read_sensor_cached(int(time.monotonic() // ttl))
+
+    def _read_sensor_now(self, bucket: Optional[int]) -> Optional[int]:
+        """Read the ambient sensor (bucket is only the memoization key)."""
+        self._sensor_last_read_mono = time.monotonic()
+        return self.sensor_adapter.read_ambient_brightness()
+
     def get_brightness(self, dt: datetime = None) -> int:
         """Get current appropriate brightness."""
         return self.calculate_brightness(dt)
@@ -137,8 +261,34 @@ class BrightnessController:
             adapter: Adapter with read_ambient_brightness() method
         """
         self.sensor_adapter = adapter
+        self.last_sensor_value = None
+        self._sensor_last_read_mono = None
+        self._read_sensor_cached.cache_clear()
         logger.info("Brightness sensor adapter installed")
 
+    def set_sensor_poll_interval(self, seconds: float) -> None:
+        """
+        Update minimum interval between ambient sensor reads.
+
+        Args:
+            seconds: Poll interval in seconds (0 = read on every call)
+        """
+        self._sensor_cache_ttl = max(0.0, float(seconds))
+        self._read_sensor_cached.cache_clear()
+        logger.info(
+            f"Sensor poll interval updated to {self._sensor_cache_ttl}s")
+
+    def set_sensor_hysteresis(self, threshold: int) -> None:
+        """
+        Update minimum sensor change that triggers a brightness change.
+
+        Args:
+            threshold: Hysteresis band in brightness units (0 = disabled)
+        """
+        self._sensor_hysteresis = clamp_u8(threshold)
+        logger.info(
+            f"Sensor hysteresis updated to {self._sensor_hysteresis}")
+
     def has_sensor(self) -> bool:
         """Check if sensor adapter is installed."""
         return self.sensor_adapter is not None
@@ -150,7 +300,7 @@ class BrightnessController:
         Args:
             max_brightness: New max brightness (0-255)
         """
-        self.max_brightness = max(0, min(255, max_brightness))
+        self.max_brightness = clamp_u8(max_brightness)
         logger.info(f"Max brightness updated to {self.max_brightness}")
 
     def set_night_mode_brightness(self, brightness: int) -> None:
@@ -160,7 +310,7 @@ class BrightnessController:
         Args:
             brightness: New night brightness (0-255)
         """
-        self.night_mode_brightness = max(0, min(255, brightness))
+        self.night_mode_brightness = clamp_u8(brightness)
         logger.info(
             f"Night mode brightness updated to {
                 self.night_mode_brightness}")
@@ -172,17 +322,23 @@ class BrightnessController:
         Args:
             brightness: New day brightness (0-255)
         """
-        self.day_brightness = max(0, min(255, brightness))
+        self.day_brightness = clamp_u8(brightness)
         logger.info(f"Day brightness updated to {self.day_brightness}")
 
     def get_status(self) -> dict:
         """Get current brightness controller status."""
+        if self._last_mode_ts is not None and \
+                time.monotonic() - self._last_mode_ts < \
+                self.STATUS_MODE_MAX_AGE_SECONDS:
+            is_night = self._last_is_night
+        else:
+            is_night = self.is_night_mode()
         return {
             'current_brightness': self.current_brightness,
             'day_brightness': self.day_brightness,
             'night_mode_brightness': self.night_mode_brightness,
             'max_brightness': self.max_brightness,
-            'is_night_mode': self.is_night_mode(),
-            'has_sensor': self.has_sensor(),
+            'is_night_mode': is_night,
+            'has_sensor': self.sensor_adapter is not None,
             'last_sensor_value': self.last_sensor_value,
         }
@@ -4,20 +4,24 @@ Allows optional light sensor integration for brightness auto-adjustment.
 """
 
 import logging
-from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Protocol
+
+from weatherbox.brightness import _kernel
+from weatherbox._util import clamp_u8
 
 logger = logging.getLogger(__name__)
 
 
-class SensorAdapter(ABC):
+class SensorAdapter(Protocol):
     """
-    Abstract interface for ambient brightness sensors.
+    Interface for ambient brightness sensors.
+
+    A structural protocol: adapters implement these methods without
+    inheriting from it.
 
     Implementations should provide light level readings (0-255 or normalized).
     """
 
-    @abstractmethod
     def initialize(self) -> bool:
         """
         Initialize sensor hardware/connection.
@@ -26,7 +30,6 @@ class SensorAdapter(ABC):
             True if successful, False if sensor unavailable
         """
 
-    @abstractmethod
     def read_ambient_brightness(self) -> Optional[int]:
         """
         Read current ambient brightness level.
@@ -35,22 +38,22 @@ class SensorAdapter(ABC):
             Brightness reading (0-255) or None if error
         """
 
-    @abstractmethod
     def shutdown(self) -> None:
         """Release sensor resources."""
 
-    @abstractmethod
     def is_available(self) -> bool:
         """Check if sensor is available and initialized."""
 
 
-class MockSensorAdapter(SensorAdapter):
+class MockSensorAdapter:
     """
     Mock sensor adapter for testing brightness controller.
 
     Always returns a configurable brightness value.
     """
 
+    __slots__ = ('brightness_value', '_available')
+
     def __init__(self, brightness_value: int = 128):
         """
         Initialize mock sensor.
@@ -58,7 +61,7 @@ class MockSensorAdapter(SensorAdapter):
         Args:
             brightness_value: Fixed brightness to return (0-255)
         """
-        self.brightness_value = max(0, min(255, brightness_value))
+        self.brightness_value = clamp_u8(brightness_value)
         self._available = False
 
     def initialize(self) -> bool:
@@ -86,10 +89,10 @@ class MockSensorAdapter(SensorAdapter):
 
     def set_brightness(self, brightness: int) -> None:
         """Update mock sensor brightness for testing."""
-        self.brightness_value = max(0, min(255, brightness))
+        self.brightness_value = clamp_u8(brightness)
 
 
-class ADCLuminositySensor(SensorAdapter):
+class ADCLuminositySensor:
     """
     ADC-based luminosity sensor adapter (e.g., via I2C ADC).
 
@@ -97,6 +100,11 @@ class ADCLuminositySensor(SensorAdapter):
     Common sensors: Adafruit ADS1115, MCP3008, etc.
     """
 
+    __slots__ = (
+        'i2c_address', 'channel', 'min_adc', 'max_adc', 'invert',
+        '_adc_range', '_scale_q16', 'adc', '_available',
+    )
+
     def __init__(
         self,
         i2c_address: int = 0x48,
@@ -121,6 +129,10 @@ class ADCLuminositySensor(SensorAdapter):
         self.max_adc = max_adc
         self.invert = invert
 
+        # Precomputed fixed-point ADC -> 0-255 scale for the read kernel
+        self._adc_range = self.max_adc - self.min_adc
+        self._scale_q16 = _kernel.adc_scale_q16(self._adc_range)
+
         self.adc = None
         self._available = False
 
@@ -153,22 +165,10 @@ class ADCLuminositySensor(SensorAdapter):
             # Read analog value (0-32767 for typical 16-bit ADC)
             raw_value = self.adc.read_adc(self.channel, gain=1)
 
-            # Normalize to 0-255 range
-            if raw_value < self.min_adc:
-                normalized = 0
-            elif raw_value > self.max_adc:
-                normalized = 255
-            else:
-                # Linear interpolation
-                normalized = int(
-                    255 * (raw_value - self.min_adc) / (self.max_adc - self.min_adc)
-                )
-
-            # Apply inversion if needed
-            if self.invert:
-                normalized = 255 - normalized
-
-            return normalized
+            # Normalize to 0-255 range (linear interpolation)
+            return _kernel.normalize_adc(
+                int(raw_value), self.min_adc, self.max_adc,
+                self._scale_q16, self.invert)
 
         except Exception as e:
             logger.warning(f"ADC read error: {e}")
@@ -185,7 +185,7 @@ class ADCLuminositySensor(SensorAdapter):
         return self._available
 
 
-class TSL2561LuminositySensor(SensorAdapter):
+class TSL2561LuminositySensor:
     """
     TSL2561 light sensor adapter via I2C.
 
@@ -193,6 +193,13 @@ class TSL2561LuminositySensor(SensorAdapter):
     different light spectra. Common Adafruit breakout board.
     """
 
+    __slots__ = ('i2c_address', 'sensor', '_available')
+
+    # Lux range mapped onto 0-255 brightness
+    LUX_MIN = 100
+    LUX_MAX = 5000
+    _LUX_SCALE = 255.0 / (LUX_MAX - LUX_MIN)
+
     def __init__(self, i2c_address: int = 0x39):
         """
         Initialize TSL2561 sensor.
@@ -239,14 +246,14 @@ class TSL2561LuminositySensor(SensorAdapter):
 
             # Normalize to 0-255 (typical room: 0-10000 lux)
             # Indoor: 50 lux = dark, 500 lux = normal, 10000 lux = very bright
-            if lux < 100:
+            if lux < self.LUX_MIN:
                 normalized = 0
-            elif lux > 5000:
+            elif lux > self.LUX_MAX:
                 normalized = 255
             else:
-                normalized = int(255 * (lux - 100) / (5000 - 100))
+                normalized = int((lux - self.LUX_MIN) * self._LUX_SCALE)
 
-            return max(0, min(255, normalized))
+            return normalized
 
         except Exception as e:
             logger.warning(f"TSL2561 read error: {e}")
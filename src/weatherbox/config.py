@@ -1,31 +1,100 @@
+import copy
 import os
+import tempfile
 import yaml
 
+try:
+    # libyaml-backed C implementations, ~10x faster than pure Python
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
 DEFAULT_CONFIG_PATH = os.path.join(
     os.path.dirname(__file__), '..', '..', 'config.yaml')
 
+# Parsed config per absolute path, keyed on (mtime_ns, size) of the file
+_cfg_cache: dict[str, tuple[tuple[int, int], dict]] = {}
 
-def load_config(path: str | None = None) -> dict:
+
+def _resolve_path(path: str | None) -> str:
     cfg_path = path or os.environ.get(
         'WEATHERBOX_CONFIG') or DEFAULT_CONFIG_PATH
-    cfg_path = os.path.abspath(os.path.expanduser(cfg_path))
-    if not os.path.exists(cfg_path):
+    return os.path.abspath(os.path.expanduser(cfg_path))
+
+
+def load_config(path: str | None = None) -> dict:
+    cfg_path = _resolve_path(path)
+    try:
+        st = os.stat(cfg_path)
+    except FileNotFoundError:
+        _cfg_cache.pop(cfg_path, None)
         return {}
-    with open(cfg_path, 'r', encoding='utf-8') as fh:
-        return yaml.safe_load(fh) or {}
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _cfg_cache.get(cfg_path)
+    if cached is None or cached[0] != stamp:
+        with open(cfg_path, 'r', encoding='utf-8') as fh:
+            cached = (stamp, yaml.load(fh, Loader=SafeLoader) or {})
+        _cfg_cache[cfg_path] = cached
+    # Callers mutate the result (see save_wifi_credentials)
+    return copy.deepcopy(cached[1])
+
+
+def _write_config(cfg: dict, cfg_path: str) -> None:
+    # Write to a sibling temp file and rename over the original so a power
+    # cut mid-write leaves either the old or the new config, never half
+    cfg_dir = os.path.dirname(cfg_path)
+    os.makedirs(cfg_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=cfg_dir, prefix='.config-', suffix='.tmp')
+    try:
+        # Own the fd first so it is closed however the write fails
+        with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+            # mkstemp creates 0o600; keep the existing file's mode if any
+            try:
+                os.fchmod(fh.fileno(), os.stat(cfg_path).st_mode & 0o7777)
+            except FileNotFoundError:
+                pass
+            yaml.dump(cfg, fh, Dumper=SafeDumper)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, cfg_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    st = os.stat(cfg_path)
+    _cfg_cache[cfg_path] = (
+        (st.st_mtime_ns, st.st_size), copy.deepcopy(cfg))
+
+
+def _merge(base: dict, patch: dict) -> None:
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _merge(base[key], value)
+        else:
+            base[key] = copy.deepcopy(value)
+
+
+def update_config(patch: dict, path: str | None = None) -> dict:
+    """Deep-merge patch into the config file in one read-modify-write."""
+    cfg_path = _resolve_path(path)
+    cfg = load_config(cfg_path)
+    _merge(cfg, patch)
+    _write_config(cfg, cfg_path)
+    return cfg
 
 
 def save_wifi_credentials(
         ssid: str,
         password: str,
-        path: str | None = None) -> None:
-    cfg = load_config(path)
+        path: str | None = None,
+        cfg: dict | None = None) -> None:
+    cfg_path = _resolve_path(path)
+    if cfg is None:
+        cfg = load_config(cfg_path)
     cfg.setdefault('wifi', {})
     cfg['wifi']['ssid'] = ssid
     cfg['wifi']['password'] = password
-    cfg_path = path or os.environ.get(
-        'WEATHERBOX_CONFIG') or DEFAULT_CONFIG_PATH
-    cfg_path = os.path.abspath(os.path.expanduser(cfg_path))
-    os.makedirs(os.path.dirname(cfg_path), exist_ok=True)
-    with open(cfg_path, 'w', encoding='utf-8') as fh:
-        yaml.safe_dump(cfg, fh)
+    _write_config(cfg, cfg_path)
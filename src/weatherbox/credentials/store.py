@@ -6,30 +6,83 @@ Provides secure storage for Wi-Fi provisioning credentials.
 import os
 import json
 import stat
+import struct
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 import logging
 
+try:
+    import orjson
+except ImportError:  # Optional: stdlib json is used as fallback
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Length prefix for each UTF-8 field in the encrypted credential blob
+_FIELD_LEN = struct.Struct('>H')
+
+
+def _pack_fields(*fields: str) -> bytes:
+    """Pack strings as length-prefixed UTF-8 into one buffer."""
+    encoded = [field.encode('utf-8') for field in fields]
+    blob = bytearray(sum(_FIELD_LEN.size + len(raw) for raw in encoded))
+    offset = 0
+    for raw in encoded:
+        _FIELD_LEN.pack_into(blob, offset, len(raw))
+        offset += _FIELD_LEN.size
+        blob[offset:offset + len(raw)] = raw
+        offset += len(raw)
+    return bytes(blob)
+
+
+def _unpack_fields(blob: bytes) -> List[str]:
+    """Inverse of _pack_fields."""
+    fields = []
+    offset = 0
+    while offset < len(blob):
+        (length,) = _FIELD_LEN.unpack_from(blob, offset)
+        offset += _FIELD_LEN.size
+        fields.append(blob[offset:offset + length].decode('utf-8'))
+        offset += length
+    return fields
+
 
 class CredentialStore:
     """Manages storage and retrieval of Wi-Fi credentials with security."""
 
+    __slots__ = (
+        'credential_file_path', 'enable_encryption', 'key_file_path',
+        '_box', '_cache_stamp', '_cached_credentials',
+    )
+
     # Default file mode: read/write for owner only (0o600)
     DEFAULT_FILE_MODE = stat.S_IRUSR | stat.S_IWUSR  # 0o600
 
+    # Encryption key file mode: read-only for owner (0o400)
+    KEY_FILE_MODE = stat.S_IRUSR  # 0o400
+
     def __init__(self, credential_file_path: str,
-                 enable_encryption: bool = False):
+                 enable_encryption: bool = False,
+                 key_file_path: Optional[str] = None):
         """
         Initialize credential store.
 
         Args:
             credential_file_path: Path to store credentials file
             enable_encryption: Enable symmetric encryption using libsodium (optional)
+            key_file_path: Encryption key file (default: credentials path
+                with a .key suffix); created on first encrypted save
         """
         self.credential_file_path = Path(credential_file_path)
         self.enable_encryption = enable_encryption
+        self.key_file_path = (
+            Path(key_file_path) if key_file_path
+            else self.credential_file_path.with_suffix('.key'))
+        self._box = None
+
+        # Last parsed credentials, keyed on (mtime_ns, size) of the file
+        self._cache_stamp: Optional[Tuple[int, int]] = None
+        self._cached_credentials: Optional[dict] = None
 
         # Ensure directory exists
         self.credential_file_path.parent.mkdir(parents=True, exist_ok=True)
@@ -51,15 +104,21 @@ class CredentialStore:
             True if save succeeded, False otherwise
         """
         try:
-            credentials = {
-                "ssid": ssid,
-                "password": password,
-                "security_type": security_type
-            }
+            if self.enable_encryption:
+                # SecretBox prepends a fresh random nonce to each message
+                data = self._get_box(create=True).encrypt(
+                    _pack_fields(ssid, password, security_type))
+            else:
+                credentials = {
+                    "ssid": ssid,
+                    "password": password,
+                    "security_type": security_type
+                }
+                data = json.dumps(credentials).encode('utf-8')
 
             # Write to file
-            with open(self.credential_file_path, "w") as f:
-                json.dump(credentials, f)
+            self._write_atomic(data)
+            self._cache_stamp = None
 
             # Set strict file permissions (read/write owner only)
             os.chmod(self.credential_file_path, self.DEFAULT_FILE_MODE)
@@ -81,12 +140,13 @@ class CredentialStore:
             Tuple of (ssid, password) if credentials exist, None otherwise
         """
         try:
-            if not self.credential_file_path.exists():
+            try:
+                file_stat = os.stat(self.credential_file_path)
+            except FileNotFoundError:
                 logger.debug("Credential file does not exist")
                 return None
 
             # Verify file permissions (should be 0o600)
-            file_stat = os.stat(self.credential_file_path)
             file_mode = stat.S_IMODE(file_stat.st_mode)
 
             if file_mode != self.DEFAULT_FILE_MODE:
@@ -95,8 +155,12 @@ class CredentialStore:
                         file_mode:o} " f"(expected 0o{
                         self.DEFAULT_FILE_MODE:o})")
 
-            with open(self.credential_file_path, "r") as f:
-                credentials = json.load(f)
+            stamp = (file_stat.st_mtime_ns, file_stat.st_size)
+            if stamp != self._cache_stamp:
+                self._cached_credentials = self._parse(
+                    self.credential_file_path.read_bytes())
+                self._cache_stamp = stamp
+            credentials = self._cached_credentials
 
             ssid = credentials.get("ssid")
             password = credentials.get("password")
@@ -111,6 +175,72 @@ class CredentialStore:
             logger.error(f"Failed to load credentials: {e}")
             return None
 
+    def _parse(self, raw: bytes) -> dict:
+        """Decrypt/parse credential file contents."""
+        if self.enable_encryption:
+            ssid, password, security_type = _unpack_fields(
+                self._get_box().decrypt(raw))
+            return {
+                "ssid": ssid,
+                "password": password,
+                "security_type": security_type
+            }
+        if orjson is not None:
+            return orjson.loads(raw)
+        return json.loads(raw)
+
+    def _get_box(self, create: bool = False):
+        """
+        Get the libsodium SecretBox for this store.
+
+        Args:
+            create: Generate the key file if it does not exist yet
+
+        Returns:
+            nacl.secret.SecretBox keyed from key_file_path
+        """
+        if self._box is None:
+            # Lazy import: PyNaCl is only needed when encryption is enabled
+            import nacl.secret
+            import nacl.utils
+
+            try:
+                key = self.key_file_path.read_bytes()
+            except FileNotFoundError:
+                if not create:
+                    raise
+                key = nacl.utils.random(nacl.secret.SecretBox.KEY_SIZE)
+                fd = os.open(
+                    self.key_file_path,
+                    os.O_WRONLY | os.O_CREAT | os.O_EXCL,
+                    self.KEY_FILE_MODE)
+                with os.fdopen(fd, "wb") as f:
+                    f.write(key)
+                logger.info(
+                    f"Generated credential key at {self.key_file_path}")
+            self._box = nacl.secret.SecretBox(key)
+        return self._box
+
+    def _write_atomic(self, data: bytes) -> None:
+        """Write data to the credential file via fsync + rename."""
+        path = self.credential_file_path
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        fd = os.open(
+            tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+            self.DEFAULT_FILE_MODE)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
     def clear_credentials(self) -> bool:
         """
         Delete stored credentials.
@@ -122,6 +252,7 @@ class CredentialStore:
             if self.credential_file_path.exists():
                 self.credential_file_path.unlink()
                 logger.info("Credentials cleared")
+            self._cache_stamp = None
             return True
         except Exception as e:
             logger.error(f"Failed to clear credentials: {e}")
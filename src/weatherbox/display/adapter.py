@@ -4,27 +4,120 @@ Allows test doubles to be injected in CI environments and enables
 support for multiple hardware types (rpi-gpio, frame-capture, etc).
 """
 
-from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Protocol, Tuple, Union
 from dataclasses import dataclass
 
+from weatherbox._util import clamp_u8
 
-@dataclass
+# Packed 1-bit-per-pixel frame: one byte per matrix row, bit x = column x
+PackedFrame = Union[bytes, bytearray, memoryview]
+PACKED_FRAME_TYPES = (bytes, bytearray, memoryview)
+
+# Row packing tables: map any lit pixel to 1, then gather the low bit of
+# each of 8 little-endian bytes into one byte with a single multiply
+_NONZERO_TO_ONE = bytes([0] + [1] * 255)
+_PACK_MULTIPLIER = 0x0102040810204080
+_ROW_UNPACK = [
+    bytes(255 if (row >> x) & 1 else 0 for x in range(8))
+    for row in range(256)
+]
+
+
+def _unpack_rows(packed: PackedFrame) -> bytes:
+    """Expand packed row bytes to one 0/255 byte per pixel."""
+    return b''.join([_ROW_UNPACK[r] for r in packed])
+
+
+@dataclass(slots=True)
 class Bitmap:
-    """Represents an 8x8 bitmap for LED display."""
+    """
+    Represents an 8x8 bitmap for LED display.
+
+    Pixels are stored row-major in a bytearray (one uint8 per pixel), so
+    clearing, comparing and counting run in C rather than per element.
+    """
     width: int = 8
     height: int = 8
-    data: List[int] = None  # List of pixel values (0-255 for brightness)
+    data: Optional[bytearray] = None  # Pixel values (0-255 for brightness)
 
     def __post_init__(self):
         """Initialize bitmap data if not provided."""
         if self.data is None:
-            self.data = [0] * (self.width * self.height)
+            self.data = bytearray(self.width * self.height)
+        elif not isinstance(self.data, bytearray):
+            self.data = bytearray(self.data)
+
+    @classmethod
+    def from_buffer(
+        cls,
+        buf: Union[bytes, bytearray, memoryview],
+        width: int = 8,
+        height: int = 8
+    ) -> 'Bitmap':
+        """
+        Create a bitmap from a row-major buffer of uint8 pixel values.
+
+        Args:
+            buf: Buffer of width * height bytes
+            width: Bitmap width in pixels
+            height: Bitmap height in pixels
+
+        Returns:
+            New Bitmap holding a copy of the buffer
+        """
+        if len(buf) != width * height:
+            raise ValueError(
+                f"Buffer length {len(buf)} does not match "
+                f"{width}x{height} bitmap")
+        return cls(width=width, height=height, data=bytearray(buf))
+
+    @classmethod
+    def unpack(cls, packed: PackedFrame) -> 'Bitmap':
+        """
+        Create an 8x8 bitmap from 8 packed row bytes.
+
+        Lit bits become full-intensity pixels (255); brightness is applied
+        globally by the display.
+
+        Args:
+            packed: 8 bytes, one per row, bit x = column x
+
+        Returns:
+            New Bitmap
+        """
+        if len(packed) != 8:
+            raise ValueError(
+                f"Packed bitmap must be 8 bytes, got {len(packed)}")
+        return cls(data=bytearray(_unpack_rows(packed)))
+
+    def tobytes(self) -> bytes:
+        """Return pixel data as an immutable row-major byte string."""
+        return bytes(self.data)
+
+    def pack(self, out: Optional[memoryview] = None) -> bytes:
+        """
+        Pack an 8-wide bitmap into one byte per row (1 bit per pixel).
+
+        Args:
+            out: Optional writable 8-byte buffer to pack into
+
+        Returns:
+            Packed row bytes (out, if provided)
+        """
+        if self.width != 8:
+            raise ValueError("Only 8-pixel-wide bitmaps can be packed")
+
+        bits = self.data.translate(_NONZERO_TO_ONE)
+        rows = out if out is not None else bytearray(self.height)
+        for y in range(self.height):
+            row = int.from_bytes(bits[y * 8:y * 8 + 8], 'little')
+            rows[y] = ((row * _PACK_MULTIPLIER) >> 56) & 0xFF
+        return rows
 
     def set_pixel(self, x: int, y: int, value: int) -> None:
         """Set pixel at (x, y) to value (0-255)."""
         if 0 <= x < self.width and 0 <= y < self.height:
-            self.data[y * self.width + x] = value
+            self.data[y * self.width + x] = clamp_u8(value)
 
     def get_pixel(self, x: int, y: int) -> int:
         """Get pixel value at (x, y)."""
@@ -34,16 +127,115 @@ class Bitmap:
 
     def clear(self) -> None:
         """Clear all pixels to 0."""
-        self.data = [0] * len(self.data)
+        self.data[:] = bytes(len(self.data))
+
+    def __repr__(self) -> str:
+        lit = len(self.data) - self.data.count(0)
+        return f"Bitmap({self.width}x{self.height}, {lit} pixels)"
+
+
+class MonoBitmap(Bitmap):
+    """
+    8x8 on/off bitmap packed into a single 64-bit integer.
+
+    Bit (y * 8 + x) holds pixel (x, y), matching the led8x8icons encoding.
+    Brightness is applied globally by the display, so lit pixels read back
+    as 255 and any non-zero value written turns a pixel on.
+    """
+
+    __slots__ = ('bits',)
+
+    def __init__(self, bits: int = 0):
+        """Initialize from a packed 64-bit value."""
+        self.width = 8
+        self.height = 8
+        self.bits = bits & 0xFFFFFFFFFFFFFFFF
+
+    @property
+    def data(self) -> bytearray:
+        """Expanded row-major pixel values (a copy; write via set_pixel)."""
+        return bytearray(_unpack_rows(self.bits.to_bytes(8, 'little')))
+
+    @data.setter
+    def data(self, value: Union[bytes, bytearray, memoryview]) -> None:
+        self.bits = int.from_bytes(
+            Bitmap(data=bytearray(value)).pack(), 'little')
+
+    def pack(self, out: Optional[memoryview] = None) -> bytes:
+        """Return the 8 packed row bytes (into out, if provided)."""
+        rows = self.bits.to_bytes(8, 'little')
+        if out is None:
+            return rows
+        out[:8] = rows
+        return out
+
+    def set_pixel(self, x: int, y: int, value: int) -> None:
+        """Turn pixel at (x, y) on (value > 0) or off."""
+        if 0 <= x < 8 and 0 <= y < 8:
+            mask = 1 << (y * 8 + x)
+            if value > 0:
+                self.bits |= mask
+            else:
+                self.bits &= ~mask
+
+    def get_pixel(self, x: int, y: int) -> int:
+        """Get pixel value at (x, y): 255 if lit, else 0."""
+        if 0 <= x < 8 and 0 <= y < 8:
+            return 255 if (self.bits >> (y * 8 + x)) & 1 else 0
+        return 0
+
+    def clear(self) -> None:
+        """Clear all pixels."""
+        self.bits = 0
 
     def __repr__(self) -> str:
-        return f"Bitmap(8x8, {sum(1 for v in self.data if v > 0)} pixels)"
+        lit = bin(self.bits).count('1')
+        return f"MonoBitmap(8x8, {lit} pixels)"
 
 
-class DisplayAdapter(ABC):
-    """Abstract base class for LED matrix display implementations."""
+def pack_frame(bitmaps: List[Bitmap], out: bytearray) -> bytearray:
+    """
+    Pack a list of 8x8 bitmaps into one contiguous frame buffer.
+
+    Args:
+        bitmaps: Bitmaps in matrix order
+        out: Buffer of len(bitmaps) * 8 bytes, reused between frames
+
+    Returns:
+        The filled buffer, ready for a single bus transfer
+    """
+    view = memoryview(out)
+    for i, bitmap in enumerate(bitmaps):
+        bitmap.pack(view[i * 8:i * 8 + 8])
+    return out
+
+
+def unpack_frame(packed: PackedFrame) -> List[Bitmap]:
+    """
+    Split a packed frame buffer back into per-matrix bitmaps.
+
+    Args:
+        packed: Buffer of matrix_count * 8 bytes
+
+    Returns:
+        List of Bitmap objects, one per matrix
+    """
+    if len(packed) % 8:
+        raise ValueError(
+            f"Packed frame length {len(packed)} is not a multiple of 8")
+    return [
+        Bitmap.unpack(packed[i:i + 8]) for i in range(0, len(packed), 8)
+    ]
+
+
+class DisplayAdapter(Protocol):
+    """
+    Interface for LED matrix display implementations.
+
+    A structural protocol: adapters implement these methods without
+    inheriting from it.
+    """
 
-    @abstractmethod
     def initialize(self) -> bool:
         """
         Initialize the display hardware.
@@ -52,7 +244,6 @@ class DisplayAdapter(ABC):
             True if initialization successful, False otherwise
         """
 
-    @abstractmethod
     def render_frame(self, matrix_index: int, bitmap: Bitmap) -> bool:
         """
         Render a single 8x8 bitmap to a specific matrix.
@@ -65,19 +256,23 @@ class DisplayAdapter(ABC):
             True if render successful, False otherwise
         """
 
-    @abstractmethod
-    def render_all(self, bitmaps: List[Bitmap]) -> bool:
+    def render_all(self, bitmaps: Union[List[Bitmap], PackedFrame]) -> bool:
         """
         Render multiple bitmaps to all matrices at once.
 
+        Implementations must also accept a preassembled packed frame:
+        matrix_count * 8 bytes, one byte per row with bit x = column x
+        (see pack_frame). Hardware adapters should push the whole frame in
+        a single bus transaction rather than one write per matrix.
+
         Args:
-            bitmaps: List of Bitmap objects (one per matrix)
+            bitmaps: List of Bitmap objects (one per matrix), or a packed
+                frame buffer
 
         Returns:
             True if render successful, False otherwise
         """
 
-    @abstractmethod
     def clear_all(self) -> bool:
         """
         Clear all matrices (turn off all pixels).
@@ -86,7 +281,6 @@ class DisplayAdapter(ABC):
             True if clear successful, False otherwise
         """
 
-    @abstractmethod
     def shutdown(self) -> bool:
         """
         Shutdown display and release hardware resources.
@@ -95,7 +289,6 @@ class DisplayAdapter(ABC):
             True if shutdown successful, False otherwise
         """
 
-    @abstractmethod
     def get_brightness(self) -> int:
         """
         Get current global brightness setting (0-255).
@@ -104,7 +297,6 @@ class DisplayAdapter(ABC):
             Brightness value
         """
 
-    @abstractmethod
     def set_brightness(self, brightness: int) -> bool:
         """
         Set global brightness for all matrices.
@@ -116,20 +308,28 @@ class DisplayAdapter(ABC):
             True if set successful, False otherwise
         """
 
-    @abstractmethod
     def is_initialized(self) -> bool:
         """Check if display is initialized and ready."""
 
 
-class MockDisplayAdapter(DisplayAdapter):
+class MockDisplayAdapter:
     """Mock adapter for testing without hardware."""
 
+    __slots__ = (
+        'matrix_count', 'matrices', '_initialized', '_brightness',
+        '_packed_buf',
+    )
+
     def __init__(self, matrix_count: int = 4):
         """Initialize mock adapter."""
         self.matrix_count = matrix_count
-        self.matrices: List[Bitmap] = [Bitmap() for _ in range(matrix_count)]
+        # Fixed for the adapter's lifetime; frames are updated in place
+        self.matrices: Tuple[Bitmap, ...] = tuple(
+            Bitmap() for _ in range(matrix_count))
         self._initialized = False
         self._brightness = 200
+        # Contiguous 1bpp frame, as a chained-matrix bus would receive it
+        self._packed_buf = bytearray(matrix_count * 8)
 
     def initialize(self) -> bool:
         """Initialize (no-op for mock)."""
@@ -137,22 +337,44 @@ class MockDisplayAdapter(DisplayAdapter):
         return True
 
     def render_frame(self, matrix_index: int, bitmap: Bitmap) -> bool:
-        """Store bitmap in memory."""
-        if 0 <= matrix_index < self.matrix_count:
-            self.matrices[matrix_index] = bitmap
+        """Copy bitmap into the stored frame buffer."""
+        matrices = self.matrices
+        if 0 <= matrix_index < len(matrices):
+            stored = matrices[matrix_index].data
+            data = bitmap.data
+            if stored == data:
+                return True
+            stored[:] = data
+            offset = matrix_index * 8
+            bitmap.pack(memoryview(self._packed_buf)[offset:offset + 8])
             return True
         return False
 
-    def render_all(self, bitmaps: List[Bitmap]) -> bool:
-        """Store all bitmaps."""
-        if len(bitmaps) == self.matrix_count:
-            self.matrices = bitmaps
+    def render_all(self, bitmaps: Union[List[Bitmap], PackedFrame]) -> bool:
+        """Copy all bitmaps (or a packed frame buffer) into stored frames."""
+        matrices = self.matrices
+        packed_buf = self._packed_buf
+        if isinstance(bitmaps, PACKED_FRAME_TYPES):
+            if len(bitmaps) != len(packed_buf):
+                return False
+            packed_buf[:] = bitmaps
+            for i, matrix in enumerate(matrices):
+                matrix.data[:] = _unpack_rows(packed_buf[i * 8:i * 8 + 8])
+            return True
+
+        if len(bitmaps) == len(matrices):
+            for matrix, bitmap in zip(matrices, bitmaps):
+                matrix.data[:] = bitmap.data
+            pack_frame(bitmaps, packed_buf)
             return True
         return False
 
     def clear_all(self) -> bool:
-        """Clear all matrices."""
-        self.matrices = [Bitmap() for _ in range(self.matrix_count)]
+        """Clear all matrices in place."""
+        for matrix in self.matrices:
+            matrix.clear()
+        packed_buf = self._packed_buf
+        packed_buf[:] = bytes(len(packed_buf))
         return True
 
     def shutdown(self) -> bool:
@@ -166,6 +388,8 @@ class MockDisplayAdapter(DisplayAdapter):
 
     def set_brightness(self, brightness: int) -> bool:
         """Set brightness."""
+        if brightness == self._brightness:
+            return True
         if 0 <= brightness <= 255:
             self._brightness = brightness
             return True
@@ -175,8 +399,13 @@ class MockDisplayAdapter(DisplayAdapter):
         """Check initialization status."""
         return self._initialized
 
+    def get_packed_frame(self) -> bytes:
+        """Get last rendered frame as packed bytes (for testing)."""
+        return bytes(self._packed_buf)
+
     def get_frame(self, matrix_index: int) -> Optional[Bitmap]:
         """Get currently rendered frame (for testing)."""
-        if 0 <= matrix_index < self.matrix_count:
-            return self.matrices[matrix_index]
+        matrices = self.matrices
+        if 0 <= matrix_index < len(matrices):
+            return matrices[matrix_index]
         return None
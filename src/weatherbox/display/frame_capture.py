@@ -4,33 +4,91 @@ Saves rendered frames to disk instead of displaying on hardware.
 Useful for: CI/CD testing, debugging, verification without LED matrices.
 """
 
-import json
+from __future__ import annotations
+
 import logging
+import queue
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
+
+from weatherbox.display.adapter import (
+    Bitmap, PackedFrame, PACKED_FRAME_TYPES, unpack_frame)
 
-from weatherbox.display.adapter import DisplayAdapter, Bitmap
+try:
+    import orjson
+except ImportError:  # Optional: stdlib json is used as fallback
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
-class FrameCaptureAdapter(DisplayAdapter):
+def _dumps(frame_data: dict) -> bytes:
+    """Serialize a frame compactly (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(frame_data)
+    import json
+    return json.dumps(frame_data, separators=(',', ':')).encode('utf-8')
+
+
+def _encode_sparse(bitmap: Bitmap) -> dict:
+    """
+    Encode a bitmap as a lit-pixel mask plus the lit values in order.
+
+    Bit i of mask is set when pixel i (row-major) is non-zero; mostly
+    dark frames shrink from 64 numbers to a handful.
+    """
+    return {
+        'mask': int.from_bytes(bitmap.pack(), 'little'),
+        'vals': list(bitmap.data.replace(b'\x00', b'')),
+    }
+
+
+def _decode_sparse(mask: int, vals: List[int], size: int = 64) -> List[int]:
+    """Expand a sparse mask/vals pair back to a full row-major pixel list."""
+    pixels = [0] * size
+    it = iter(vals)
+    for i in range(size):
+        if (mask >> i) & 1:
+            pixels[i] = next(it)
+    return pixels
+
+
+class FrameCaptureAdapter:
     """
     Display adapter that captures frames to disk for inspection.
     Each render operation saves current frame state to a timestamped file.
+
+    Frames are buffered in memory and handed in batches, through a
+    bounded queue, to a single background writer thread; call flush()
+    (or shutdown()) to force pending frames to disk.
     """
 
+    # Pending frames that trigger a background write
+    DEFAULT_FLUSH_THRESHOLD = 32
+
+    # Batches the writer may fall behind by before capture has to wait
+    DEFAULT_QUEUE_SIZE = 128
+
+    # Seconds to wait for queue space before writing a batch inline
+    QUEUE_PUT_TIMEOUT = 1.0
+
     def __init__(
             self,
             matrix_count: int = 4,
-            capture_dir: str = "/tmp/weatherbox_frames"):
+            capture_dir: str = "/tmp/weatherbox_frames",
+            flush_threshold: int = DEFAULT_FLUSH_THRESHOLD,
+            queue_size: int = DEFAULT_QUEUE_SIZE):
         """
         Initialize frame capture adapter.
 
         Args:
             matrix_count: Number of matrices
             capture_dir: Directory to save captured frames
+            flush_threshold: Buffered frames before a batch is written
+            queue_size: Maximum batches waiting for the writer thread
         """
         self.matrix_count = matrix_count
         self.capture_dir = Path(capture_dir)
@@ -39,6 +97,13 @@ class FrameCaptureAdapter(DisplayAdapter):
         self._brightness = 200
         self._render_count = 0
 
+        self._flush_threshold = max(1, flush_threshold)
+        self._pending: List[Tuple[Path, dict]] = []
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self._writer: Optional[threading.Thread] = None
+        # Files written this session, in order (appended by the writer)
+        self._captured: List[Path] = []
+
     def initialize(self) -> bool:
         """Initialize capture directory."""
         try:
@@ -62,24 +127,28 @@ class FrameCaptureAdapter(DisplayAdapter):
             True if capture successful
         """
         if 0 <= matrix_index < self.matrix_count:
-            self.matrices[matrix_index] = bitmap
+            self.matrices[matrix_index].data[:] = bitmap.data
             self._render_count += 1
             self._save_frame()
             return True
         return False
 
-    def render_all(self, bitmaps: List[Bitmap]) -> bool:
+    def render_all(self, bitmaps: Union[List[Bitmap], PackedFrame]) -> bool:
         """
         Render all matrices to disk.
 
         Args:
-            bitmaps: List of bitmaps
+            bitmaps: List of bitmaps, or a packed frame buffer
 
         Returns:
             True if capture successful
         """
+        if isinstance(bitmaps, PACKED_FRAME_TYPES):
+            bitmaps = unpack_frame(bitmaps)
+
         if len(bitmaps) == self.matrix_count:
-            self.matrices = bitmaps
+            for dst, src in zip(self.matrices, bitmaps):
+                dst.data[:] = src.data
             self._render_count += 1
             self._save_frame()
             return True
@@ -87,12 +156,19 @@ class FrameCaptureAdapter(DisplayAdapter):
 
     def clear_all(self) -> bool:
         """Clear all matrices."""
-        self.matrices = [Bitmap() for _ in range(self.matrix_count)]
+        for bm in self.matrices:
+            bm.clear()
         self._save_frame()
         return True
 
     def shutdown(self) -> bool:
-        """Shutdown capture."""
+        """Shutdown capture, writing any buffered frames."""
+        self.flush()
+        writer = self._writer
+        if writer is not None and writer.is_alive():
+            self._queue.put(None)  # Sentinel: stop the writer loop
+            writer.join()
+        self._writer = None
         self._initialized = False
         logger.info(
             f"Frame capture shutdown. Total renders: {
@@ -117,16 +193,15 @@ class FrameCaptureAdapter(DisplayAdapter):
     def _save_frame(self) -> None:
         """Save current frame state to JSON."""
         try:
-            timestamp = datetime.now().isoformat()
+            # Raw ns stamp; formatted to ISO by the writer thread
             frame_data = {
-                'timestamp': timestamp,
+                'timestamp': time.time_ns(),
                 'render_count': self._render_count,
                 'brightness': self._brightness,
                 'matrices': [
                     {
                         'index': i,
-                        'bitmap': bm.data,
-                        'pixel_count': sum(1 for v in bm.data if v > 0)
+                        **_encode_sparse(bm)
                     }
                     for i, bm in enumerate(self.matrices)
                 ]
@@ -134,22 +209,102 @@ class FrameCaptureAdapter(DisplayAdapter):
 
             filename = self.capture_dir / \
                 f"frame_{self._render_count:06d}.json"
-            with open(filename, 'w') as f:
-                json.dump(frame_data, f, indent=2)
+            self._pending.append((filename, frame_data))
+            if len(self._pending) >= self._flush_threshold:
+                self._start_flush()
 
-            logger.debug(f"Frame captured: {filename.name}")
+            logger.debug("Frame captured: %s", filename.name)
         except Exception as e:
             logger.error(f"Failed to save frame: {e}")
 
+    def _start_flush(self) -> None:
+        """
+        Queue pending frames for the background writer.
+
+        If the writer stays behind for QUEUE_PUT_TIMEOUT the batch is
+        written synchronously instead, so captured frames are never lost.
+        """
+        batch, self._pending = self._pending, []
+        writer = self._writer
+        if writer is None or not writer.is_alive():
+            writer = self._writer = threading.Thread(
+                target=self._writer_loop,
+                name="frame-capture-writer",
+                daemon=True)
+            writer.start()
+        try:
+            self._queue.put(batch, timeout=self.QUEUE_PUT_TIMEOUT)
+        except queue.Full:
+            logger.warning(
+                "Frame writer behind; writing %d captured frames inline",
+                len(batch))
+            self._write_batch(batch)
+
+    def _writer_loop(self) -> None:
+        """Write queued batches in order until the shutdown sentinel."""
+        q = self._queue
+        while True:
+            batch = q.get()
+            try:
+                if batch is None:
+                    return
+                self._write_batch(batch)
+            finally:
+                q.task_done()
+
+    def _write_batch(self, batch: List[Tuple[Path, dict]]) -> None:
+        """Write a batch of frames to disk."""
+        captured = self._captured
+        for filename, frame_data in batch:
+            try:
+                frame_data['timestamp'] = datetime.fromtimestamp(
+                    frame_data['timestamp'] / 1e9).isoformat()
+                filename.write_bytes(_dumps(frame_data))
+                # clear_all re-saves under the current render count
+                if not captured or captured[-1] != filename:
+                    captured.append(filename)
+            except Exception as e:
+                logger.error(f"Failed to write frame {filename.name}: {e}")
+
+    def flush(self) -> None:
+        """Write all buffered frames and wait for the writer to finish."""
+        if self._pending:
+            self._start_flush()
+        self._queue.join()
+
     def get_captured_frames(self) -> List[Path]:
-        """Get list of all captured frame files."""
+        """
+        Get list of all captured frame files.
+
+        Frames written by this adapter are tracked as they are written;
+        the directory is only scanned when nothing has been written yet
+        (e.g. inspecting captures from an earlier run).
+        """
+        self.flush()
+        if self._captured:
+            return list(self._captured)
         return sorted(self.capture_dir.glob("frame_*.json"))
 
     def load_frame(self, frame_file: Path) -> Optional[dict]:
-        """Load a captured frame for inspection."""
+        """
+        Load a captured frame for inspection.
+
+        Matrices are stored sparsely (mask + vals); the full 'bitmap'
+        pixel list and pixel_count are rebuilt here rather than stored,
+        keeping the capture path and files small.
+        """
+        self.flush()
+        import json
         try:
             with open(frame_file, 'r') as f:
-                return json.load(f)
+                frame_data = json.load(f)
         except Exception as e:
             logger.error(f"Failed to load frame {frame_file}: {e}")
             return None
+        for matrix in frame_data.get('matrices', ()):
+            if 'bitmap' not in matrix:
+                matrix['bitmap'] = _decode_sparse(
+                    matrix['mask'], matrix['vals'])
+            pixels = matrix['bitmap']
+            matrix.setdefault('pixel_count', len(pixels) - pixels.count(0))
+        return frame_data
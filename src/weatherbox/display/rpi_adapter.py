@@ -4,11 +4,27 @@ Provides hardware-specific implementation of DisplayAdapter for real LED matrice
 """
 
 import logging
-from typing import List
+from typing import List, Tuple, Union
 from dataclasses import dataclass
 
+from weatherbox.display.adapter import (
+    Bitmap, PackedFrame, PACKED_FRAME_TYPES, unpack_frame)
+
 logger = logging.getLogger(__name__)
 
+# Per-channel (R, G, B) gain, out of 255, applied to grayscale pixels
+TONES = {
+    'white': (255, 255, 255),
+    'amber': (255, 128, 0),
+    'red': (255, 0, 0),
+}
+
+
+def _tone_tables(gains: Tuple[int, int, int]) -> Tuple[bytes, bytes, bytes]:
+    """Build one 256-entry grayscale → channel lookup table per channel."""
+    return tuple(
+        bytes(v * gain // 255 for v in range(256)) for gain in gains)
+
 
 @dataclass
 class RGBMatrix:
@@ -29,6 +45,25 @@ class RGBMatrix:
         return cls._instance
 
 
+class PILImage:
+    """Wrapper for the optional Pillow Image module (lazy-loaded)."""
+    _module = None
+    _checked = False
+
+    @classmethod
+    def get_module(cls):
+        """Get PIL.Image, or None if Pillow is not installed."""
+        if not cls._checked:
+            cls._checked = True
+            try:
+                from PIL import Image
+                cls._module = Image
+            except ImportError:
+                logger.info(
+                    "Pillow not available; rendering with per-pixel SetPixel")
+        return cls._module
+
+
 class RpiAdapter:
     """
     Hardware adapter for Raspberry Pi GPIO-connected LED matrices.
@@ -56,6 +91,7 @@ class RpiAdapter:
         matrix_count: int = DEFAULT_MATRIX_COUNT,
         brightness: int = 100,
         gpio_slowdown: int = 4,
+        tone: str = 'white',
     ):
         """
         Initialize RPi matrix adapter.
@@ -66,6 +102,7 @@ class RpiAdapter:
             matrix_count: Number of chained matrices (typically 4)
             brightness: Initial brightness (0-255)
             gpio_slowdown: GPIO speed factor for timing (higher = slower, safer)
+            tone: Colour tone grayscale pixels are drawn in (see TONES)
         """
         self.rows = rows
         self.cols = cols
@@ -73,6 +110,14 @@ class RpiAdapter:
         self.brightness_value = brightness
         self.gpio_slowdown = gpio_slowdown
         self.matrix = None
+        self._canvas = None
+        # Shadow copy of what is on each matrix, redrawn on every swap
+        self._frame = tuple(Bitmap() for _ in range(matrix_count))
+        # Reused RGB buffer and PIL image for the whole-frame blit
+        self._rgb = None
+        self._rgb_image = None
+        self.tone = tone
+        self._tone_lut = _tone_tables(TONES[tone])
         self._initialized = False
         self._is_mock_mode = False
 
@@ -102,6 +147,8 @@ class RpiAdapter:
             options.drop_privileges = False  # For systemd service
 
             self.matrix = rgbmatrix_class(options)
+            # Off-screen canvas for tear-free updates via SwapOnVSync
+            self._canvas = self.matrix.CreateFrameCanvas()
 
             logger.info(
                 f"Initialized RPi LED matrix: {self.cols}x{self.rows} "
@@ -120,10 +167,13 @@ class RpiAdapter:
             self._initialized = False
             return False
 
-    def render_frame(self, matrix_index: int, bitmap: 'Bitmap') -> bool:
+    def render_frame(self, matrix_index: int, bitmap: Bitmap) -> bool:
         """
         Render single 8×8 bitmap to a specific matrix.
 
+        The other matrices keep their current content; the full frame is
+        redrawn off-screen and swapped in on the next vsync.
+
         Args:
             matrix_index: Matrix position (0-3 for 4-matrix display)
             bitmap: 8×8 bitmap with pixel values
@@ -137,7 +187,7 @@ class RpiAdapter:
 
         if self._is_mock_mode:
             logger.debug(
-                f"Mock mode: render_frame(matrix_index={matrix_index})")
+                "Mock mode: render_frame(matrix_index=%d)", matrix_index)
             return True
 
         try:
@@ -145,21 +195,9 @@ class RpiAdapter:
                 logger.error(f"Invalid matrix index: {matrix_index}")
                 return False
 
-            # Calculate column offset for this matrix
-            col_offset = matrix_index * 8
-
-            # Write bitmap pixels to matrix
-            for y in range(8):
-                for x in range(8):
-                    pixel_value = bitmap.get_pixel(x, y)
-                    col = col_offset + x
-
-                    # Convert grayscale to RGB (simple approach: all channels same)
-                    # For more control, modify this to use RGB values from
-                    # bitmap
-                    if self.matrix:
-                        self.matrix.SetPixel(
-                            col, y, pixel_value, pixel_value, pixel_value)
+            self._frame[matrix_index].data[:] = bitmap.data
+            if self.matrix:
+                self._present()
 
             return True
 
@@ -168,12 +206,81 @@ class RpiAdapter:
                 f"Error rendering frame to matrix {matrix_index}: {e}")
             return False
 
-    def render_all(self, bitmaps: List['Bitmap']) -> bool:
+    def _to_image(self):
+        """
+        Expand the shadow frame into the reusable RGB image for SetImage.
+
+        The RGB buffer and image are allocated once and refilled in place
+        on every frame.
+
+        Returns:
+            PIL.Image in RGB mode, or None if Pillow is unavailable
+        """
+        image = self._rgb_image
+        if image is None:
+            image_module = PILImage.get_module()
+            if image_module is None:
+                return None
+            width = len(self._frame) * 8
+            self._rgb = bytearray(width * 8 * 3)
+            image = self._rgb_image = image_module.new('RGB', (width, 8))
+
+        # Each channel is the grayscale strip through its tone table
+        strip = self._strip()
+        rgb = self._rgb
+        red, green, blue = self._tone_lut
+        rgb[0::3] = strip.translate(red)
+        rgb[1::3] = strip.translate(green)
+        rgb[2::3] = strip.translate(blue)
+        image.frombytes(rgb)
+        return image
+
+    def _strip(self) -> bytes:
+        """Tile the shadow frame into one row-major (8·N)×8 buffer."""
+        frame = self._frame
+        return b''.join(
+            bm.data[row:row + 8]
+            for row in range(0, 64, 8)
+            for bm in frame)
+
+    def _draw_pixels(self, canvas, matrix_index: int, bitmap: Bitmap) -> None:
+        """Draw one bitmap pixel by pixel at its matrix's column offset."""
+        # Calculate column offset for this matrix
+        col_offset = matrix_index * 8
+        red, green, blue = self._tone_lut
+
+        # Write bitmap pixels to canvas, toned through the lookup tables
+        for y in range(8):
+            for x in range(8):
+                pixel_value = bitmap.get_pixel(x, y)
+                canvas.SetPixel(
+                    col_offset + x, y,
+                    red[pixel_value], green[pixel_value], blue[pixel_value])
+
+    def _present(self) -> None:
+        """Draw the shadow frame off-screen and swap it in on vsync."""
+        canvas = self._canvas
+        # Blit every matrix in a single C call when Pillow is available
+        image = self._to_image()
+        if image is not None:
+            canvas.SetImage(image, 0, 0)
+        else:
+            canvas.Clear()
+            for i, bitmap in enumerate(self._frame):
+                self._draw_pixels(canvas, i, bitmap)
+        # SwapOnVSync hands back the previous canvas for reuse
+        self._canvas = self.matrix.SwapOnVSync(canvas)
+
+    def render_all(self, bitmaps: Union[List[Bitmap], PackedFrame]) -> bool:
         """
         Render all matrices atomically.
 
+        All bitmaps are drawn into an off-screen canvas which is swapped
+        in on the next vsync, so the display never shows a partial update.
+
         Args:
-            bitmaps: List of 8×8 bitmaps (one per matrix)
+            bitmaps: List of 8×8 bitmaps (one per matrix), or a packed
+                frame buffer
 
         Returns:
             True if successful
@@ -182,6 +289,9 @@ class RpiAdapter:
             logger.error("Matrix not initialized")
             return False
 
+        if isinstance(bitmaps, PACKED_FRAME_TYPES):
+            bitmaps = unpack_frame(bitmaps)
+
         if len(bitmaps) > self.matrix_count:
             logger.error(
                 f"Too many bitmaps: {
@@ -189,11 +299,15 @@ class RpiAdapter:
                     self.matrix_count}")
             return False
 
+        if self._is_mock_mode:
+            logger.debug("Mock mode: render_all()")
+            return True
+
         try:
-            for i, bitmap in enumerate(bitmaps):
-                if not self.render_frame(i, bitmap):
-                    logger.error(f"Failed to render matrix {i}")
-                    return False
+            for shadow, bitmap in zip(self._frame, bitmaps):
+                shadow.data[:] = bitmap.data
+            if self.matrix:
+                self._present()
 
             return True
 
@@ -217,8 +331,10 @@ class RpiAdapter:
                 logger.debug("Mock mode: clear_all()")
                 return True
 
+            for shadow in self._frame:
+                shadow.clear()
             if self.matrix:
-                self.matrix.Clear()
+                self._present()
 
             return True
 
@@ -255,23 +371,54 @@ class RpiAdapter:
             logger.error(f"Invalid brightness: {brightness}")
             return False
 
+        if brightness == self.brightness_value and self._initialized:
+            # Already applied (or passed in Options at initialize)
+            return True
+
         try:
             self.brightness_value = brightness
 
             if self._is_mock_mode:
-                logger.debug(f"Mock mode: set_brightness({brightness})")
+                logger.debug("Mock mode: set_brightness(%s)", brightness)
                 return True
 
             if self.matrix:
                 self.matrix.brightness = brightness
+                # Canvas pixels are scaled at draw time, so redraw
+                self._canvas.brightness = brightness
+                self._present()
 
-            logger.debug(f"Brightness set to {brightness}")
+            logger.debug("Brightness set to %s", brightness)
             return True
 
         except Exception as e:
             logger.error(f"Error setting brightness: {e}")
             return False
 
+    def set_tone(self, tone: str) -> bool:
+        """
+        Set the colour tone grayscale pixels are drawn in.
+
+        Args:
+            tone: Tone name from TONES (e.g. 'white', 'amber')
+
+        Returns:
+            True if successful
+        """
+        gains = TONES.get(tone)
+        if gains is None:
+            logger.error("Unknown tone: %s", tone)
+            return False
+
+        if tone == self.tone:
+            return True
+
+        self.tone = tone
+        self._tone_lut = _tone_tables(gains)
+        if self.matrix and self._canvas is not None:
+            self._present()
+        return True
+
     def get_brightness(self) -> int:
         """Get current brightness level."""
         return self.brightness_value
@@ -283,27 +430,3 @@ class RpiAdapter:
     def is_mock_mode(self) -> bool:
         """Check if running in mock mode (library not available)."""
         return self._is_mock_mode
-
-
-# For compatibility with DisplayAdapter interface
-class Bitmap:
-    """8×8 bitmap for use with RpiAdapter."""
-
-    def __init__(self):
-        """Initialize 8×8 bitmap with all pixels off."""
-        self.pixels = [[0] * 8 for _ in range(8)]
-
-    def set_pixel(self, x: int, y: int, value: int) -> None:
-        """Set pixel brightness."""
-        if 0 <= x < 8 and 0 <= y < 8:
-            self.pixels[y][x] = max(0, min(255, value))
-
-    def get_pixel(self, x: int, y: int) -> int:
-        """Get pixel brightness."""
-        if 0 <= x < 8 and 0 <= y < 8:
-            return self.pixels[y][x]
-        return 0
-
-    def clear(self) -> None:
-        """Clear all pixels."""
-        self.pixels = [[0] * 8 for _ in range(8)]
@@ -3,11 +3,11 @@ Main display service for weather forecast rendering.
 Coordinates weather API fetching, retry scheduling, and LED matrix rendering.
 """
 
+from __future__ import annotations
+
 import logging
-from datetime import datetime
+import time
 from typing import List, Optional, Dict, Any
-from pathlib import Path
-import json
 
 from .weather.retry_scheduler import RetryScheduler, UpdateWindowScheduler
 from .weather.metoffice_adapter import MetOfficeAdapter, DailySummary
@@ -15,9 +15,13 @@ from .weather.forecast_parser import ForecastParser
 from .icons.loader import IconLoader
 from .display.adapter import DisplayAdapter, Bitmap
 from .brightness.controller import BrightnessController
+from ._util import clamp_u8
 
 logger = logging.getLogger(__name__)
 
+# Flat offsets (mod 16, i.e. per pair of rows) of cells where x + y is even
+_CHECKER_OFFSETS = (0, 2, 4, 6, 9, 11, 13, 15)
+
 
 class WeatherDisplayService:
     """
@@ -30,6 +34,15 @@ class WeatherDisplayService:
     4. Cleanup: Shutdown display and save diagnostics
     """
 
+    __slots__ = (
+        'display', 'metoffice', 'icons', 'brightness', 'diagnostics_dir',
+        'forecast_parser', 'retry_scheduler', 'update_scheduler',
+        '_running', '_last_forecast', '_last_diag_time',
+        '_brightness_deadline', '_last_brightness', '_last_digest',
+        '_bitmap_pool', '_error_bitmap',
+        '_icon_cache', '_icon_cache_source', '_icon_tiles',
+    )
+
     # Default update window (daytime 06:00-23:00, nighttime 1h)
     DEFAULT_UPDATE_WINDOW = {
         'daytime_start': '06:00',
@@ -45,6 +58,9 @@ class WeatherDisplayService:
         'night_brightness': 50,
     }
 
+    # Minimum seconds between error diagnostics reports (error storms)
+    DIAGNOSTICS_MIN_INTERVAL_SECONDS = 30.0
+
     def __init__(
         self,
         display_adapter: DisplayAdapter,
@@ -70,11 +86,32 @@ class WeatherDisplayService:
         self.diagnostics_dir = diagnostics_dir
 
         self.forecast_parser = ForecastParser()
-        self.retry_scheduler = RetryScheduler()
+        self.retry_scheduler = RetryScheduler(jitter=True)
         self.update_scheduler = UpdateWindowScheduler()
 
         self._running = False
         self._last_forecast = None
+        self._last_diag_time = None
+
+        # Monotonic time before which brightness cannot change
+        self._brightness_deadline = None
+        self._last_brightness = None
+
+        # Digest of what is currently on the display (None = unknown)
+        self._last_digest = None
+
+        # Bitmaps reused every render cycle (adapters copy what they show)
+        self._bitmap_pool = [Bitmap() for _ in range(4)]
+        self._error_bitmap = Bitmap()
+        self._error_bitmap.data[::9] = b'\xff' * 8      # Diagonal \
+        self._error_bitmap.data[7:57:7] = b'\xff' * 8   # Diagonal /
+
+        # Weather type → icon ID, valid while icons.mappings is unchanged
+        self._icon_cache: Dict[str, int] = {}
+        self._icon_cache_source = None
+
+        # Icon ID → pre-rendered 8×8 tile, copied into bitmaps on render
+        self._icon_tiles: Dict[int, bytes] = {}
 
         logger.info("WeatherDisplayService initialized")
 
@@ -107,7 +144,9 @@ class WeatherDisplayService:
 
             # Set initial brightness
             brightness = self.brightness.get_brightness()
-            self.display.set_brightness(brightness)
+            self._set_display_brightness(brightness)
+            self._brightness_deadline = \
+                self.brightness.next_transition_monotonic()
             logger.info(f"Display brightness set to {brightness}")
 
             return True
@@ -160,34 +199,46 @@ class WeatherDisplayService:
                 logger.warning("Cannot render empty forecast")
                 return False
 
+            # Skip the redraw when the display already shows this forecast
+            is_afternoon = time.localtime().tm_hour < 18
+            digest = (is_afternoon,) + tuple(
+                (s.date, s.weather_type, s.max_temperature,
+                 s.min_temperature,
+                 getattr(s, 'day_weather_type', None),
+                 getattr(s, 'night_weather_type', None))
+                for s in forecast[:4])
+            if digest == self._last_digest:
+                logger.debug("Forecast unchanged; display left as-is")
+                return True
+
             # Prepare bitmaps for each matrix
-            bitmaps = []
+            bitmaps = self._bitmap_pool
 
             # Matrix 0: Current day
-            if len(forecast) > 0:
-                summary = forecast[0]
-                bitmap = self._render_day_summary(
-                    summary,
-                    is_current=True
-                )
-                bitmaps.append(bitmap)
+            self._render_day_summary(
+                forecast[0],
+                is_current=True,
+                bitmap=bitmaps[0],
+                is_afternoon=is_afternoon
+            )
 
             # Matrices 1-3: Next 3 days
             for i in range(1, 4):
                 if len(forecast) > i:
                     summary = forecast[i]
-                    bitmap = self._render_day_summary(summary)
-                    bitmaps.append(bitmap)
+                    self._render_day_summary(summary, bitmap=bitmaps[i])
                 else:
                     # No forecast data; fill with blank
-                    bitmaps.append(Bitmap())
+                    bitmaps[i].clear()
 
             # Render to display
             success = self.display.render_all(bitmaps)
 
             if success:
-                logger.info(f"Rendered {len(bitmaps)} matrices")
+                self._last_digest = digest
+                logger.info("Rendered %d matrices", len(bitmaps))
             else:
+                self._last_digest = None
                 logger.error("Display render failed")
 
             return success
@@ -199,7 +250,9 @@ class WeatherDisplayService:
     def _render_day_summary(
         self,
         summary: DailySummary,
-        is_current: bool = False
+        is_current: bool = False,
+        bitmap: Optional[Bitmap] = None,
+        is_afternoon: Optional[bool] = None
     ) -> Bitmap:
         """
         Render single day summary to 8×8 bitmap.
@@ -211,46 +264,72 @@ class WeatherDisplayService:
         Args:
             summary: Daily weather summary
             is_current: Whether this is current day
+            bitmap: Bitmap to render into (cleared first); new if None
+            is_afternoon: Whether it is before 18:00 (current day only);
+                read from the clock if None
 
         Returns:
             8×8 Bitmap
         """
-        bitmap = Bitmap()
+        if bitmap is None:
+            bitmap = Bitmap()
+        else:
+            bitmap.clear()
 
         try:
             if is_current:
                 # Current day: show max/min temps based on time of day
-                now = datetime.now()
-                if now.hour < 18:
+                if is_afternoon is None:
+                    is_afternoon = time.localtime().tm_hour < 18
+                if is_afternoon:
                     # Show max temp this afternoon
                     temp = summary.max_temperature or 0
-                    weather_type = summary.day_weather_type
+                    weather_type = getattr(
+                        summary, 'day_weather_type', summary.weather_type)
                 else:
                     # Show min temp tonight
                     temp = summary.min_temperature or 0
-                    weather_type = summary.night_weather_type
+                    weather_type = getattr(
+                        summary, 'night_weather_type', summary.weather_type)
             else:
                 # Future day: show max temp + day weather
                 temp = summary.max_temperature or 0
-                weather_type = summary.day_weather_type
+                weather_type = getattr(
+                    summary, 'day_weather_type', summary.weather_type)
 
             # Get icon ID for weather type
-            icon_id = self.icons.get_icon_id(weather_type)
+            icon_id = self._icon_id(weather_type)
 
             # Load icon bitmap (for now, using placeholder)
             # TODO: Load from led8x8icons.py
             self._render_icon_and_temp(bitmap, icon_id, temp)
 
-            logger.debug(
-                f"Rendered day {summary.date.date()}: "
-                f"weather={weather_type}, temp={temp}, icon={icon_id}"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Rendered day %s: weather=%s, temp=%s, icon=%s",
+                    summary.date.date(), weather_type, temp, icon_id
+                )
 
             return bitmap
 
         except Exception as e:
             logger.error(f"Error rendering day summary: {e}")
-            return Bitmap()  # Return blank bitmap on error
+            bitmap.clear()
+            return bitmap  # Return blank bitmap on error
+
+    def _icon_id(self, weather_type: str) -> int:
+        """Look up a weather type's icon ID, memoised per icon mapping."""
+        mappings = self.icons.mappings
+        if mappings is not self._icon_cache_source:
+            # Mapping was (re)loaded; drop IDs resolved against the old one
+            self._icon_cache.clear()
+            self._icon_cache_source = mappings
+
+        icon_id = self._icon_cache.get(weather_type)
+        if icon_id is None:
+            icon_id = self.icons.get_icon_id(weather_type)
+            self._icon_cache[weather_type] = icon_id
+        return icon_id
 
     def _render_icon_and_temp(
         self,
@@ -264,17 +343,28 @@ class WeatherDisplayService:
         Simple placeholder: Draw icon pattern based on icon_id.
         TODO: Integrate with actual led8x8icons loading.
 
+        The icon replaces the bitmap's contents; each tile is drawn once
+        and then copied in on every later render.
+
         Args:
             bitmap: 8×8 bitmap to render to
             icon_id: Weather icon ID
             temp: Temperature to display
         """
+        tile = self._icon_tiles.get(icon_id)
+        if tile is None:
+            tile = self._icon_tiles[icon_id] = self._draw_icon_tile(icon_id)
+        bitmap.data[:] = tile
+
+    @staticmethod
+    def _draw_icon_tile(icon_id: int) -> bytes:
+        """Draw the 8×8 grayscale tile for an icon ID."""
         # Simple placeholder: Fill bitmap with pattern based on icon_id
-        pattern_val = min(255, icon_id * 25)
-        for y in range(8):
-            for x in range(8):
-                if (x + y) % 2 == 0:
-                    bitmap.set_pixel(x, y, pattern_val)
+        fill = bytes((clamp_u8(icon_id * 25),)) * 4
+        data = bytearray(64)
+        for offset in _CHECKER_OFFSETS:
+            data[offset::16] = fill
+        return bytes(data)
 
     def display_error(self, error_msg: str = "API error") -> bool:
         """
@@ -289,14 +379,9 @@ class WeatherDisplayService:
         try:
             logger.error(f"Displaying error: {error_msg}")
 
-            # Create error bitmap (simple X pattern)
-            error_bitmap = Bitmap()
-            for i in range(8):
-                error_bitmap.set_pixel(i, i, 255)        # Diagonal \
-                error_bitmap.set_pixel(7 - i, i, 255)      # Diagonal /
-
-            # Render error bitmap to all matrices
-            bitmaps = [error_bitmap] * 4
+            # Render error bitmap (simple X pattern) to all matrices
+            self._last_digest = None
+            bitmaps = [self._error_bitmap] * 4
             success = self.display.render_all(bitmaps)
 
             if success:
@@ -315,18 +400,38 @@ class WeatherDisplayService:
 
         Includes: error message, last forecast, API response, stack traces
 
+        At most one report is written per DIAGNOSTICS_MIN_INTERVAL_SECONDS
+        so persistent failures cannot fill the disk.
+
         Args:
             error_msg: Error message
         """
         if not self.diagnostics_dir:
             return
 
+        now = time.monotonic()
+        last = self._last_diag_time
+        if last is not None and \
+                now - last < self.DIAGNOSTICS_MIN_INTERVAL_SECONDS:
+            logger.debug(
+                "Diagnostics written %.1fs ago; skipping: %s",
+                now - last, error_msg)
+            return
+        self._last_diag_time = now
+
+        # Only needed on this rare path; keep them off the boot import
+        from pathlib import Path
+        try:
+            import orjson
+        except ImportError:  # Optional: stdlib json is used as fallback
+            orjson = None
+
         try:
             diag_dir = Path(self.diagnostics_dir)
             diag_dir.mkdir(parents=True, exist_ok=True)
 
             # Timestamp for filename
-            timestamp = datetime.now().isoformat().replace(':', '-')
+            timestamp = time.strftime('%Y%m%dT%H%M%S')
 
             # Save error report
             report = {
@@ -342,24 +447,52 @@ class WeatherDisplayService:
                     s.to_dict() for s in self._last_forecast
                 ]
 
+            if orjson is not None:
+                payload = orjson.dumps(report)
+            else:
+                import json
+                payload = json.dumps(
+                    report, separators=(',', ':')).encode('utf-8')
+
             report_path = diag_dir / f"error_{timestamp}.json"
-            with open(report_path, 'w') as f:
-                json.dump(report, f, indent=2)
+            report_path.write_bytes(payload)
 
             logger.info(f"Error diagnostics saved to {report_path}")
 
         except Exception as e:
             logger.warning(f"Failed to save diagnostics: {e}")
 
-    def update_brightness(self) -> None:
-        """Update display brightness based on time of day."""
+    def update_brightness(self, force: bool = False) -> None:
+        """
+        Update display brightness based on time of day.
+
+        Brightness is only re-evaluated once the controller's next
+        transition is due; between transitions the display keeps its
+        current setting.
+
+        Args:
+            force: Re-evaluate now (e.g. after changing brightness config)
+        """
+        if not force and self._brightness_deadline is not None and \
+                time.monotonic() < self._brightness_deadline:
+            return
+
         try:
             brightness = self.brightness.get_brightness()
-            self.display.set_brightness(brightness)
-            logger.debug(f"Brightness updated to {brightness}")
+            self._set_display_brightness(brightness)
+            self._brightness_deadline = \
+                self.brightness.next_transition_monotonic()
+            logger.debug("Brightness updated to %s", brightness)
         except Exception as e:
             logger.warning(f"Brightness update error: {e}")
 
+    def _set_display_brightness(self, brightness: int) -> None:
+        """Apply a brightness level; a new level forces the next redraw."""
+        self.display.set_brightness(brightness)
+        if brightness != self._last_brightness:
+            self._last_brightness = brightness
+            self._last_digest = None
+
     def run_cycle(self) -> bool:
         """
         Execute single update cycle: fetch, parse, render, sleep.
@@ -372,7 +505,7 @@ class WeatherDisplayService:
             if not self.update_scheduler.should_update_now():
                 wait_minutes = self.update_scheduler.next_update_in_minutes()
                 logger.debug(
-                    f"Update window not ready; next in {wait_minutes}m")
+                    "Update window not ready; next in %sm", wait_minutes)
                 return True
 
             # Update brightness
@@ -411,6 +544,7 @@ class WeatherDisplayService:
             self._running = False
 
             # Clear display
+            self._last_digest = None
             self.display.clear_all()
 
             # Shutdown hardware
@@ -423,14 +557,17 @@ class WeatherDisplayService:
 
     def get_status(self) -> Dict[str, Any]:
         """Get service status for diagnostics."""
+        display = self.display
+        retry = self.retry_scheduler
+        last_forecast = self._last_forecast
         return {
             'running': self._running,
-            'display_initialized': self.display.is_initialized(),
-            'display_brightness': self.display.get_brightness(),
+            'display_initialized': display.is_initialized(),
+            'display_brightness': display.get_brightness(),
             'brightness_controller': self.brightness.get_status(),
-            'retry_state': self.retry_scheduler.state.value,
-            'retry_attempt': self.retry_scheduler.attempt_count,
-            'last_forecast_count': len(
-                self._last_forecast) if self._last_forecast else 0,
-            'next_update_minutes': self.update_scheduler.next_update_in_minutes(),
+            'retry_state': retry.state.value,
+            'retry_attempt': retry.attempt_count,
+            'last_forecast_count': len(last_forecast) if last_forecast else 0,
+            'next_update_minutes':
+                self.update_scheduler.next_update_in_minutes(),
         }
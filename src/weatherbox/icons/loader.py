@@ -2,13 +2,46 @@
 Icon manager for loading and mapping weather types to LED matrix icon IDs.
 """
 
+import functools
 import logging
 import yaml
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Tuple
+
+try:
+    # libyaml-backed C loader, ~10x faster than pure Python
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 logger = logging.getLogger(__name__)
 
+# Parsed YAML per absolute path, keyed on (mtime_ns, size) of the file
+_yaml_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+
+def _fast_lower(s: str) -> str:
+    """Lowercase s, reusing it as-is when already lowercase (no copy)."""
+    return s if s.islower() else s.lower()
+
+
+def _read_yaml(config_file: Path) -> Any:
+    """
+    Parse a YAML file, reusing the last parse while the file is unchanged.
+
+    The returned object is shared with the cache; callers must copy
+    anything they intend to mutate.
+    """
+    path = str(config_file.resolve())
+    st = config_file.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _yaml_cache.get(path)
+    if cached is None or cached[0] != stamp:
+        with open(config_file, 'r') as f:
+            cached = (stamp, yaml.load(f, Loader=SafeLoader))
+        _yaml_cache[path] = cached
+    return cached[1]
+
 
 @staticmethod
 def load_icon_mapping(
@@ -45,8 +78,7 @@ def load_icon_mapping(
         raise FileNotFoundError(f"Icon config not found: {config_path}")
 
     try:
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
+        config = _read_yaml(config_file)
 
         if not isinstance(config, dict):
             raise ValueError("Icon config must be YAML dict")
@@ -56,14 +88,15 @@ def load_icon_mapping(
         if not isinstance(mappings, dict):
             raise ValueError("Icon mappings must be dict")
 
-        logger.info(f"Loaded {len(mappings)} icon mappings from {config_path}")
-        return mappings
+        logger.info(
+            "Loaded %d icon mappings from %s", len(mappings), config_path)
+        return dict(mappings)
 
     except yaml.YAMLError as e:
-        logger.error(f"Failed to parse icon config: {e}")
+        logger.error("Failed to parse icon config: %s", e)
         raise
     except Exception as e:
-        logger.error(f"Error loading icon config: {e}")
+        logger.error("Error loading icon config: %s", e)
         raise
 
 
@@ -84,10 +117,48 @@ class IconLoader:
             config_path: Path to icons.yaml configuration
             fallback_icon_id: Icon ID to use for unmapped weather types
         """
+        # Per-instance memo of weather type → icon ID; cleared whenever the
+        # mapping or fallback changes
+        self._icon_id_cached = functools.lru_cache(maxsize=128)(
+            self._compute_icon_id)
         self.config_path = config_path
-        self.fallback_icon_id = fallback_icon_id
-        self.mappings = {}
-        self.load_mapping()
+        self._fallback_icon_id = fallback_icon_id
+        self._mappings = {}
+        self._lower_mappings = {}
+        # icons.yaml is read on first use rather than at construction
+        self._loaded = False
+
+    def _ensure_loaded(self) -> None:
+        """Load the mapping file if it hasn't been read yet."""
+        if not self._loaded:
+            self._loaded = True
+            self.load_mapping()
+
+    @property
+    def mappings(self) -> Dict[str, int]:
+        """Weather type → icon ID mapping (loaded on first access)."""
+        self._ensure_loaded()
+        return self._mappings
+
+    @mappings.setter
+    def mappings(self, mappings: Dict[str, int]) -> None:
+        # Lowercased keys built once so case-insensitive lookups are a
+        # single dict probe (replace the dict, don't mutate it in place)
+        self._loaded = True
+        self._mappings = mappings
+        self._lower_mappings = {k.lower(): v for k, v in mappings.items()}
+        self._icon_id_cached.cache_clear()
+
+    @property
+    def fallback_icon_id(self) -> int:
+        """Icon ID for unmapped weather types (may come from icons.yaml)."""
+        self._ensure_loaded()
+        return self._fallback_icon_id
+
+    @fallback_icon_id.setter
+    def fallback_icon_id(self, icon_id: int) -> None:
+        self._fallback_icon_id = icon_id
+        self._icon_id_cached.cache_clear()
 
     def load_mapping(self) -> None:
         """Load icon mapping from configuration file."""
@@ -96,12 +167,11 @@ class IconLoader:
 
             if not config_file.exists():
                 logger.warning(
-                    f"Icon config not found: {
-                        self.config_path}, using fallback")
+                    "Icon config not found: %s, using fallback",
+                    self.config_path)
                 return
 
-            with open(config_file, 'r') as f:
-                config = yaml.safe_load(f)
+            config = _read_yaml(config_file)
 
             if not isinstance(config, dict):
                 logger.warning("Icon config is not a dict, using fallback")
@@ -113,73 +183,69 @@ class IconLoader:
                     self.fallback_icon_id = int(config['fallback'])
                 except (ValueError, TypeError):
                     logger.warning(
-                        f"Invalid fallback icon ID: {
-                            config.get('fallback')}")
+                        "Invalid fallback icon ID: %s", config.get('fallback'))
 
             # Load mappings
             mappings = config.get('mappings', {})
             if isinstance(mappings, dict):
-                self.mappings = mappings
-                logger.info(f"Loaded {len(self.mappings)} icon mappings")
+                self.mappings = dict(mappings)
+                logger.info("Loaded %d icon mappings", len(self._mappings))
             else:
                 logger.warning("Icon mappings is not a dict")
 
         except Exception as e:
-            logger.error(f"Error loading icon config: {e}")
+            logger.error("Error loading icon config: %s", e)
 
     def get_icon_id(self, weather_type: str) -> int:
         """
         Map weather type to icon ID.
 
+        Results are memoised per loader until the mapping is replaced.
+
         Args:
             weather_type: Weather type string (e.g., "Partly cloudy", "Heavy rain")
 
         Returns:
             Icon bitmap ID (uses fallback if type not found)
         """
+        self._ensure_loaded()
+        return self._icon_id_cached(weather_type)
+
+    def _compute_icon_id(self, weather_type: str) -> int:
+        """Resolve a weather type's icon ID (uncached)."""
         # Exact match
-        if weather_type in self.mappings:
-            icon_id = self.mappings[weather_type]
+        icon_id = self._mappings.get(weather_type)
+        if icon_id is not None:
             logger.debug(
-                f"Mapped weather type '{weather_type}' to icon {icon_id}")
+                "Mapped weather type '%s' to icon %s", weather_type, icon_id)
             return icon_id
 
-        # Try substring match (case-insensitive)
-        weather_lower = weather_type.lower()
-        for mapped_type, icon_id in self.mappings.items():
-            if mapped_type.lower() == weather_lower:
-                logger.debug(
-                    f"Mapped weather type '{weather_type}' to icon {icon_id} (case-insensitive)")
-                return icon_id
+        # Case-insensitive match
+        icon_id = self._lower_mappings.get(_fast_lower(weather_type))
+        if icon_id is not None:
+            logger.debug(
+                "Mapped weather type '%s' to icon %s (case-insensitive)",
+                weather_type, icon_id)
+            return icon_id
 
         # Use fallback for unmapped type
         logger.warning(
-            f"Weather type '{weather_type}' not mapped; using fallback icon {
-                self.fallback_icon_id}")
-        return self.fallback_icon_id
+            "Weather type '%s' not mapped; using fallback icon %s",
+            weather_type, self._fallback_icon_id)
+        return self._fallback_icon_id
 
     def is_mapped(self, weather_type: str) -> bool:
         """Check if weather type has a mapping."""
-        if weather_type in self.mappings:
-            return True
-
-        weather_lower = weather_type.lower()
-        for mapped_type in self.mappings.keys():
-            if mapped_type.lower() == weather_lower:
-                return True
-
-        return False
+        self._ensure_loaded()
+        return (weather_type in self._mappings
+                or _fast_lower(weather_type) in self._lower_mappings)
 
     def get_unmapped_types(self, weather_types: list) -> list:
         """Get list of weather types that are not mapped."""
-        unmapped = []
-        for wtype in weather_types:
-            if not self.is_mapped(wtype):
-                unmapped.append(wtype)
-        return unmapped
+        return [wtype for wtype in weather_types if not self.is_mapped(wtype)]
 
     def reload_mapping(self) -> None:
         """Reload icon mapping from configuration file."""
-        logger.info(f"Reloading icon mapping from {self.config_path}")
+        logger.info("Reloading icon mapping from %s", self.config_path)
         self.mappings = {}
-        self.load_mapping()
+        self._loaded = False
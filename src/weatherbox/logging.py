@@ -3,11 +3,44 @@ Logging configuration for Weatherbox provisioning service.
 Provides structured logging for connection attempts, provisioning events, and diagnostics.
 """
 
+import atexit
 import logging
 import logging.handlers
+import queue
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+
+
+def _stop_queue_listener(logger: logging.Logger) -> None:
+    """Stop a background listener left by a previous configure call."""
+    listener = getattr(logger, "_queue_listener", None)
+    if listener is not None:
+        atexit.unregister(listener.stop)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        logger._queue_listener = None
+
+
+def _attach_queue_handler(
+    logger: logging.Logger,
+    handlers: List[logging.Handler]
+) -> None:
+    """
+    Route records to handlers through a background QueueListener.
+
+    Callers only enqueue records; formatting and disk writes happen on the
+    listener thread. The listener is kept on logger._queue_listener.
+    """
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    # Drain queued records before the interpreter exits
+    atexit.register(listener.stop)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger._queue_listener = listener
 
 
 def configure_logging(
@@ -27,27 +60,35 @@ def configure_logging(
         Configured logger instance
     """
     logger = logging.getLogger("weatherbox.provisioning")
-    logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
+    level = getattr(logging, log_level.upper(), logging.INFO)
+    logger.setLevel(level)
 
     # Clear any existing handlers
+    _stop_queue_listener(logger)
     logger.handlers.clear()
 
+    # Nowhere to write: a NullHandler keeps records from reaching the root
+    # logger without building formatters or touching the filesystem
+    if not console_output and not log_file:
+        logger.addHandler(logging.NullHandler())
+        logger.propagate = False
+        return logger
+    logger.propagate = True
+
     # Formatter with timestamp and level
     formatter = logging.Formatter(
         fmt="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S"
     )
 
+    handlers = []
+
     # Console handler (stderr)
     if console_output:
         console_handler = logging.StreamHandler(sys.stderr)
-        console_handler.setLevel(
-            getattr(
-                logging,
-                log_level.upper(),
-                logging.INFO))
+        console_handler.setLevel(level)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
 
     # File handler
     if log_file:
@@ -59,14 +100,11 @@ def configure_logging(
             maxBytes=10 * 1024 * 1024,  # 10MB
             backupCount=5
         )
-        file_handler.setLevel(
-            getattr(
-                logging,
-                log_level.upper(),
-                logging.INFO))
+        file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
 
+    _attach_queue_handler(logger, handlers)
     return logger
 
 
@@ -107,27 +145,35 @@ def configure_display_logging(
         Configured logger instance
     """
     logger = logging.getLogger("weatherbox.display")
-    logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
+    level = getattr(logging, log_level.upper(), logging.INFO)
+    logger.setLevel(level)
 
     # Clear any existing handlers
+    _stop_queue_listener(logger)
     logger.handlers.clear()
 
+    # Nowhere to write: a NullHandler keeps records from reaching the root
+    # logger without building formatters or touching the filesystem
+    if not console_output and not log_file:
+        logger.addHandler(logging.NullHandler())
+        logger.propagate = False
+        return logger
+    logger.propagate = True
+
     # Formatter with timestamp, level, and logger name
     formatter = logging.Formatter(
         fmt="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S"
     )
 
+    handlers = []
+
     # Console handler (stderr)
     if console_output:
         console_handler = logging.StreamHandler(sys.stderr)
-        console_handler.setLevel(
-            getattr(
-                logging,
-                log_level.upper(),
-                logging.INFO))
+        console_handler.setLevel(level)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
 
     # File handler with rotation
     if log_file:
@@ -139,14 +185,11 @@ def configure_display_logging(
             maxBytes=10 * 1024 * 1024,  # 10MB
             backupCount=5
         )
-        file_handler.setLevel(
-            getattr(
-                logging,
-                log_level.upper(),
-                logging.INFO))
+        file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
 
+    _attach_queue_handler(logger, handlers)
     return logger
 
 
@@ -3,7 +3,11 @@ Access Point (AP) management for provisioning.
 Brings up a Wi-Fi access point using NetworkManager or hostapd.
 """
 
+import errno
+import hashlib
 import logging
+import os
+import signal
 import subprocess
 from typing import Optional
 
@@ -13,6 +17,36 @@ logger = logging.getLogger(__name__)
 class AccessPointManager:
     """Manages Wi-Fi access point for provisioning."""
 
+    # hostapd configuration file (tmpfs on the Pi)
+    HOSTAPD_CONFIG_PATH = '/tmp/hostapd.conf'
+
+    # PID files written by the daemons we spawn, so stop() can signal them
+    HOSTAPD_PID_PATH = '/tmp/hostapd.pid'
+    DNSMASQ_PID_PATH = '/tmp/dnsmasq.pid'
+
+    # hostapd configuration templates (%-formatted with interface/ssid/psk)
+    _HOSTAPD_BASE = (
+        "interface=%(interface)s\n"
+        "driver=nl80211\n"
+        "ssid=%(ssid)s\n"
+        "hw_mode=g\n"
+        "channel=6\n"
+        "beacon_int=100\n"
+        "dtim_period=2\n"
+        "max_num_sta=32\n"
+        "rts_threshold=2347\n"
+        "fragm_threshold=2346\n"
+        "macaddr_acl=0\n"
+        "auth_algs=1\n"
+        "ignore_broadcast_ssid=0\n"
+    )
+    _HOSTAPD_WPA2 = (
+        "wpa=2\n"
+        "wpa_pairwise=CCMP\n"
+        "wpa_passphrase=%(psk)s\n"
+    )
+    _HOSTAPD_OPEN = "wpa=0\n"
+
     def __init__(
         self,
         ssid: str = "weatherbox-setup",
@@ -37,6 +71,10 @@ class AccessPointManager:
         self.interface = interface
         self.ip_address = ip_address
         self.running = False
+        # NetworkManager availability, probed once per manager
+        self._nm_available: Optional[bool] = None
+        # Digest of the last hostapd config written by this manager
+        self._hostapd_digest: Optional[bytes] = None
 
     def start(self) -> bool:
         """
@@ -57,16 +95,18 @@ class AccessPointManager:
             return False
 
     def _use_networkmanager(self) -> bool:
-        """Check if NetworkManager is available."""
-        try:
-            result = subprocess.run(
-                ['systemctl', 'is-active', 'NetworkManager'],
-                capture_output=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except Exception:
-            return False
+        """Check if NetworkManager is available (cached after first call)."""
+        if self._nm_available is None:
+            try:
+                result = subprocess.run(
+                    ['systemctl', 'is-active', 'NetworkManager'],
+                    capture_output=True,
+                    timeout=5
+                )
+                self._nm_available = result.returncode == 0
+            except Exception:
+                self._nm_available = False
+        return self._nm_available
 
     def _start_with_networkmanager(self) -> bool:
         """Start AP using NetworkManager.
@@ -81,31 +121,10 @@ class AccessPointManager:
     def _start_with_hostapd(self) -> bool:
         """Start AP using hostapd and dnsmasq."""
         try:
-            # Step 1: Bring interface up
-            logger.debug(f"Bringing up interface {self.interface}")
-            result = subprocess.run(
-                ['ip', 'link', 'set', self.interface, 'up'],
-                capture_output=True,
-                timeout=5
-            )
-            if result.returncode != 0:
-                logger.error(
-                    f"Failed to bring up interface: {
-                        result.stderr.decode()}")
+            # Steps 1-2: Bring interface up and configure IP address
+            if not self._configure_interface():
                 return False
 
-            # Step 2: Configure IP address
-            logger.debug(f"Configuring IP address {self.ip_address}")
-            result = subprocess.run(
-                ['ip', 'addr', 'add', f'{self.ip_address}/24', 'dev', self.interface],
-                capture_output=True,
-                timeout=5
-            )
-            if result.returncode != 0 and 'RTNETLINK answers: File exists' not in result.stderr.decode():
-                logger.warning(
-                    f"Could not add IP address: {
-                        result.stderr.decode()}")
-
             # Step 3: Create hostapd configuration
             logger.debug("Creating hostapd configuration")
             hostapd_conf = self._create_hostapd_config()
@@ -117,7 +136,8 @@ class AccessPointManager:
             # Step 4: Start hostapd
             logger.debug("Starting hostapd")
             result = subprocess.run(
-                ['hostapd', '-B', '/tmp/hostapd.conf'],
+                ['hostapd', '-B', '-P', self.HOSTAPD_PID_PATH,
+                 self.HOSTAPD_CONFIG_PATH],
                 capture_output=True,
                 timeout=10
             )
@@ -133,7 +153,8 @@ class AccessPointManager:
                                      '--interface',
                                      self.interface,
                                      '--dhcp-range',
-                                     '192.168.4.2,192.168.4.20,24h'],
+                                     '192.168.4.2,192.168.4.20,24h',
+                                     f'--pid-file={self.DNSMASQ_PID_PATH}'],
                                     capture_output=True,
                                     timeout=5)
             if result.returncode != 0:
@@ -152,39 +173,103 @@ class AccessPointManager:
             logger.error(f"Error starting hostapd AP: {e}")
             return False
 
-    def _create_hostapd_config(self) -> str:
-        """Create hostapd configuration string."""
-        config = f"""interface={self.interface}
-driver=nl80211
-ssid={self.ssid}
-hw_mode=g
-channel=6
-beacon_int=100
-dtim_period=2
-max_num_sta=32
-rts_threshold=2347
-fragm_threshold=2346
-macaddr_acl=0
-auth_algs=1
-ignore_broadcast_ssid=0
-"""
+    def _configure_interface(self) -> bool:
+        """
+        Bring the interface up and assign the AP address.
 
-        if self.mode == "wpa2":
-            config += f"""wpa=2
-wpa_pairwise=CCMP
-wpa_passphrase={self.psk}
-"""
-        else:
-            # Open AP - no WPA
-            config += "wpa=0\n"
+        Uses netlink directly via pyroute2 when installed, saving an
+        ``ip`` fork/exec per step; otherwise falls back to the ``ip`` tool.
 
-        return config
+        Returns:
+            True if the interface is up
+        """
+        try:
+            from pyroute2 import IPRoute
+            from pyroute2.netlink.exceptions import NetlinkError
+        except ImportError:
+            return self._configure_interface_with_ip()
+
+        with IPRoute() as ipr:
+            links = ipr.link_lookup(ifname=self.interface)
+            if not links:
+                logger.error("Interface %s not found", self.interface)
+                return False
+            index = links[0]
+
+            logger.debug("Bringing up interface %s", self.interface)
+            try:
+                ipr.link('set', index=index, state='up')
+            except NetlinkError as e:
+                logger.error("Failed to bring up interface: %s", e)
+                return False
+
+            logger.debug("Configuring IP address %s", self.ip_address)
+            try:
+                ipr.addr('add', index=index, address=self.ip_address,
+                         prefixlen=24)
+            except NetlinkError as e:
+                if e.code != errno.EEXIST:
+                    logger.warning("Could not add IP address: %s", e)
+        return True
+
+    def _configure_interface_with_ip(self) -> bool:
+        """Bring the interface up and assign the AP address with ``ip``."""
+        # Step 1: Bring interface up
+        logger.debug(f"Bringing up interface {self.interface}")
+        result = subprocess.run(
+            ['ip', 'link', 'set', self.interface, 'up'],
+            capture_output=True,
+            timeout=5
+        )
+        if result.returncode != 0:
+            logger.error(
+                f"Failed to bring up interface: {
+                    result.stderr.decode()}")
+            return False
+
+        # Step 2: Configure IP address
+        logger.debug(f"Configuring IP address {self.ip_address}")
+        result = subprocess.run(
+            ['ip', 'addr', 'add', f'{self.ip_address}/24', 'dev',
+             self.interface],
+            capture_output=True,
+            timeout=5
+        )
+        if result.returncode != 0 and 'RTNETLINK answers: File exists' \
+                not in result.stderr.decode():
+            logger.warning(
+                f"Could not add IP address: {
+                    result.stderr.decode()}")
+        return True
+
+    def _create_hostapd_config(self) -> str:
+        """Create hostapd configuration string."""
+        security = (self._HOSTAPD_WPA2 if self.mode == "wpa2"
+                    else self._HOSTAPD_OPEN)  # Open AP - no WPA
+        return (self._HOSTAPD_BASE + security) % {
+            'interface': self.interface,
+            'ssid': self.ssid,
+            'psk': self.psk,
+        }
 
     def _write_hostapd_config(self, config: str) -> bool:
-        """Write hostapd configuration to file."""
+        """Write hostapd configuration to file, skipping unchanged rewrites."""
+        path = self.HOSTAPD_CONFIG_PATH
+        data = config.encode()
+        digest = hashlib.blake2b(data, digest_size=8).digest()
+        if digest == self._hostapd_digest and os.path.exists(path):
+            logger.debug("hostapd config unchanged; not rewriting")
+            return True
+
         try:
-            with open('/tmp/hostapd.conf', 'w') as f:
-                f.write(config)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                written = os.write(fd, data)
+            finally:
+                os.close(fd)
+            if written != len(data):
+                raise OSError(f"short write ({written}/{len(data)} bytes)")
+            self._hostapd_digest = digest
             return True
         except Exception as e:
             logger.error(f"Failed to write hostapd config: {e}")
@@ -200,13 +285,9 @@ wpa_passphrase={self.psk}
         try:
             logger.info(f"Stopping access point: {self.ssid}")
 
-            # Kill hostapd
-            subprocess.run(['killall', 'hostapd'],
-                           capture_output=True, timeout=5)
-
-            # Kill dnsmasq
-            subprocess.run(['killall', 'dnsmasq'],
-                           capture_output=True, timeout=5)
+            # Stop hostapd and dnsmasq via their PID files
+            self._terminate(self.HOSTAPD_PID_PATH)
+            self._terminate(self.DNSMASQ_PID_PATH)
 
             # Bring interface down
             subprocess.run(['ip', 'link', 'set', self.interface,
@@ -220,6 +301,34 @@ wpa_passphrase={self.psk}
             logger.error(f"Error stopping AP: {e}")
             return False
 
+    @staticmethod
+    def _terminate(pid_path: str) -> None:
+        """
+        Send SIGTERM to the daemon recorded in a PID file, if running.
+
+        Errors are logged rather than raised so that one daemon's failure
+        doesn't stop stop() from shutting down the rest.
+        """
+        try:
+            with open(pid_path) as f:
+                pid = int(f.read().strip())
+        except FileNotFoundError:
+            return  # Never started; nothing to stop
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cannot read PID file {pid_path}: {e}")
+            return
+
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass  # Already exited
+        except OSError as e:
+            logger.warning(f"Cannot signal PID {pid} from {pid_path}: {e}")
+        try:
+            os.unlink(pid_path)
+        except OSError:
+            pass
+
     def status(self) -> bool:
         """
         Get AP status.
@@ -4,13 +4,66 @@ Provides web UI for scanning and configuring Wi-Fi credentials.
 Includes CSRF protections and server-side validation.
 """
 
+import hmac
 import logging
 import os
-from flask import Flask, render_template, request, jsonify
-from itsdangerous import URLSafeTimedSerializer
+from dataclasses import dataclass
+from typing import Optional
+from flask import Flask, render_template, request, jsonify, session
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Optional: Flask's stdlib json provider is used
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+_HERE = os.path.dirname(__file__)
+_TEMPLATE_DIR = os.path.join(_HERE, 'templates')
+_STATIC_DIR = os.path.join(_HERE, 'static')
+
+# Stand-in token used to pre-render index.html once; split out per request
+_CSRF_PLACEHOLDER = '__WEATHERBOX_CSRF_TOKEN__'
+
+# Credential checks for /api/provision as (predicate(ssid, password), error),
+# cheapest first; the first failing check is reported with a 400
+_PROVISION_CHECKS = (
+    (lambda ssid, password: not ssid, 'SSID is required'),
+    (lambda ssid, password: not password, 'Password is required'),
+    (lambda ssid, password: len(ssid) > 32,
+     'SSID must be 32 characters or less'),
+    (lambda ssid, password: len(password) > 63,
+     'Password must be 63 characters or less'),
+    (lambda ssid, password: len(password) < 8,
+     'Password must be at least 8 characters'),
+)
+
+
+@dataclass(slots=True)
+class ScanRow:
+    """One network in a /api/scan response (serialized natively by orjson)."""
+    ssid: str
+    strength: int
+    security: Optional[str]
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that encodes API responses with orjson."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response, skipping the
+        # str round trip dumps() needs for the provider interface
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default), mimetype=self.mimetype)
+
 
 def create_app(credential_store=None, wifi_adapter=None) -> Flask:
     """
@@ -25,10 +78,13 @@ def create_app(credential_store=None, wifi_adapter=None) -> Flask:
     """
     app = Flask(
         __name__,
-        template_folder=os.path.join(os.path.dirname(__file__), 'templates'),
-        static_folder=os.path.join(os.path.dirname(__file__), 'static')
+        template_folder=_TEMPLATE_DIR,
+        static_folder=_STATIC_DIR
     )
 
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+
     # Security configuration
     app.config['SECRET_KEY'] = os.environ.get(
         'SECRET_KEY', 'weatherbox-provisioning-dev-key')
@@ -37,40 +93,56 @@ def create_app(credential_store=None, wifi_adapter=None) -> Flask:
     app.config['SESSION_COOKIE_HTTPONLY'] = True
     app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 
-    # CSRF token serializer
-    serializer = URLSafeTimedSerializer(app.config['SECRET_KEY'])
-
     # Dependency injection
     app.credential_store = credential_store
     app.wifi_adapter = wifi_adapter
 
     @app.before_request
     def initialize_session():
-        """Initialize CSRF token in session."""
-        from flask import session
+        """Initialize CSRF token in session (once per session)."""
         if 'csrf_token' not in session:
-            session['csrf_token'] = serializer.dumps(
-                {'nonce': os.urandom(16).hex()})
+            # The session cookie is already signed with SECRET_KEY, so a
+            # random nonce is enough; no per-token signing needed
+            session['csrf_token'] = os.urandom(24).hex()
 
     @app.context_processor
     def inject_csrf_token():
         """Inject CSRF token into template context."""
-        from flask import session
         return {'csrf_token': session.get('csrf_token', '')}
 
     def verify_csrf_token(token: str) -> bool:
-        """Verify CSRF token."""
-        try:
-            serializer.loads(token, max_age=3600)  # Valid for 1 hour
-            return True
-        except Exception:
+        """Verify CSRF token matches this session's token."""
+        expected = session.get('csrf_token')
+        if not isinstance(token, str) or not token or not expected:
             return False
+        # Constant-time compare of bytes (str requires ASCII-only input)
+        return hmac.compare_digest(token.encode(), expected.encode())
+
+    # index.html is static apart from the CSRF token, so render it once and
+    # splice each session's token between the cached halves. Published as a
+    # single tuple so concurrent first requests can't leave it half-built;
+    # () records that the template can't be split
+    index_parts = None
+
+    def render_index() -> str:
+        """Render the provisioning UI with this session's CSRF token."""
+        nonlocal index_parts
+        parts = index_parts
+        if parts is None:
+            html = render_template('index.html', csrf_token=_CSRF_PLACEHOLDER)
+            pieces = html.split(_CSRF_PLACEHOLDER)
+            parts = index_parts = tuple(pieces) if len(pieces) == 2 else ()
+        if not parts:
+            # Unexpected template shape; render normally
+            return render_template('index.html')
+        head, tail = parts
+        return head + session.get('csrf_token', '') + tail
 
     @app.route('/', methods=['GET'])
     def index():
         """Serve provisioning UI."""
         logger.info("Provisioning UI requested")
-        return render_template('index.html')
+        return render_index()
 
     @app.route('/api/scan', methods=['POST'])
     def scan():
@@ -84,7 +156,7 @@ def create_app(credential_store=None, wifi_adapter=None) -> Flask:
         data = request.get_json() or {}
         csrf_token = data.get('csrf_token')
 
-        if not csrf_token or not verify_csrf_token(csrf_token):
+        if not verify_csrf_token(csrf_token):
             logger.warning("CSRF token verification failed for /scan")
             return jsonify({'error': 'Invalid CSRF token'}), 403
 
@@ -96,22 +168,18 @@ def create_app(credential_store=None, wifi_adapter=None) -> Flask:
             logger.info("Starting Wi-Fi scan")
             networks = app.wifi_adapter.scan(timeout_seconds=10)
 
-            # Convert to JSON-serializable format
+            # Convert to JSON-serializable rows
             network_list = [
-                {
-                    'ssid': net.ssid,
-                    'strength': net.signal_strength,
-                    'security': net.security
-                }
+                ScanRow(net.ssid, net.signal_strength, net.security)
                 for net in networks
                 if net.ssid  # Filter out hidden networks
             ]
 
-            logger.info(f"Scan complete: found {len(network_list)} networks")
+            logger.info("Scan complete: found %d networks", len(network_list))
             return jsonify({'networks': network_list})
 
         except Exception as e:
-            logger.error(f"Scan failed: {e}")
+            logger.error("Scan failed: %s", e)
             return jsonify({'error': 'Scan failed'}), 500
 
     @app.route('/api/provision', methods=['POST'])
@@ -133,36 +201,20 @@ def create_app(credential_store=None, wifi_adapter=None) -> Flask:
 
         # Verify CSRF token
         csrf_token = data.get('csrf_token')
-        if not csrf_token or not verify_csrf_token(csrf_token):
+        if not verify_csrf_token(csrf_token):
             logger.warning("CSRF token verification failed for /provision")
             return jsonify({'error': 'Invalid CSRF token'}), 403
 
         # Server-side validation
-        ssid = data.get('ssid', '').strip()
-        password = data.get('password', '').strip()
-
-        if not ssid:
-            logger.warning("Provision attempt with empty SSID")
-            return jsonify({'error': 'SSID is required'}), 400
-
-        if not password:
-            logger.warning(f"Provision attempt for {ssid} with empty password")
-            return jsonify({'error': 'Password is required'}), 400
-
-        if len(ssid) > 32:
-            logger.warning(f"SSID too long: {len(ssid)} characters")
-            return jsonify(
-                {'error': 'SSID must be 32 characters or less'}), 400
-
-        if len(password) > 63:
-            logger.warning(f"Password too long: {len(password)} characters")
-            return jsonify(
-                {'error': 'Password must be 63 characters or less'}), 400
+        ssid = (data.get('ssid') or '').strip()
+        password = (data.get('password') or '').strip()
 
-        if len(password) < 8:
-            logger.warning(f"Password too short: {len(password)} characters")
-            return jsonify(
-                {'error': 'Password must be at least 8 characters'}), 400
+        for check, message in _PROVISION_CHECKS:
+            if check(ssid, password):
+                logger.warning(
+                    "Provision rejected: %s (SSID %d, password %d chars)",
+                    message, len(ssid), len(password))
+                return jsonify({'error': message}), 400
 
         # Save credentials
         try:
@@ -171,11 +223,11 @@ def create_app(credential_store=None, wifi_adapter=None) -> Flask:
                 return jsonify(
                     {'error': 'Credential storage not available'}), 500
 
-            logger.info(f"Saving credentials for SSID: {ssid}")
+            logger.info("Saving credentials for SSID: %s", ssid)
             success = app.credential_store.save_credentials(ssid, password)
 
             if success:
-                logger.info(f"Credentials saved successfully for {ssid}")
+                logger.info("Credentials saved successfully for %s", ssid)
                 return jsonify({
                     'success': True,
                     'message': 'Wi-Fi credentials saved. Device will reconnect at next boot.'
@@ -185,7 +237,7 @@ def create_app(credential_store=None, wifi_adapter=None) -> Flask:
                 return jsonify({'error': 'Failed to save credentials'}), 500
 
         except Exception as e:
-            logger.error(f"Error saving credentials: {e}")
+            logger.error("Error saving credentials: %s", e)
             return jsonify({'error': 'Error saving credentials'}), 500
 
     @app.route('/health', methods=['GET'])
@@ -196,7 +248,7 @@ def create_app(credential_store=None, wifi_adapter=None) -> Flask:
     @app.errorhandler(404)
     def not_found(error):
         """Handle 404 errors by serving the main UI."""
-        return render_template('index.html')
+        return render_index()
 
     return app
 
@@ -206,4 +258,10 @@ if __name__ == '__main__':
     logging.basicConfig(level=logging.INFO)
 
     app = create_app()
-    app.run(host='0.0.0.0', port=8080, debug=False)
+    try:
+        from waitress import serve
+    except ImportError:
+        # Werkzeug fallback; threaded so concurrent portal probes don't queue
+        app.run(host='0.0.0.0', port=8080, debug=False, threaded=True)
+    else:
+        serve(app, host='0.0.0.0', port=8080, threads=4)
@@ -1,39 +1,60 @@
 """
 Boot-time Wi-Fi provisioning orchestration.
 Attempts to connect to stored credentials, falls back to AP mode if connection fails.
+
+Run from the repository root as a module:
+    python -m src.weatherbox.provisioning.boot
 """
 
 from src.weatherbox.logging import configure_logging, get_logger
 from src.weatherbox.credentials.store import CredentialStore
 from src.weatherbox.wifi.wpa_adapter import WpaSupplicantAdapter
 from src.weatherbox.wifi.nm_adapter import NetworkManagerAdapter
-from src.weatherbox.wifi.adapter import WifiAdapter
-import time
+from src.weatherbox.wifi.adapter import WifiAdapter, WifiAuthError
+from enum import Enum
+from typing import Callable, Optional
+import asyncio
+import contextlib
+import functools
+import importlib
+import random
 import sys
-from pathlib import Path
-
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 
 logger = get_logger("provisioning.boot")
 
+_AP_MANAGER_MODULE = "src.weatherbox.provisioning.ap_manager"
+
+
+class ConnectionResult(Enum):
+    """Outcome of connecting with stored credentials."""
+    CONNECTED = "connected"
+    FAILED = "failed"              # Retries exhausted; network may be down
+    AUTH_FAILED = "auth_failed"    # Password rejected; retrying won't help
+
 
 class BootProvisioner:
     """Orchestrates Wi-Fi provisioning at boot time."""
 
     def __init__(
             self,
-            credential_file: str = "/etc/weatherbox/credentials.yaml"):
+            credential_file: str = "/etc/weatherbox/credentials.yaml",
+            base_backoff: float = 1.0,
+            max_backoff: float = 30.0):
         """
         Initialize boot provisioner.
 
         Args:
             credential_file: Path to stored credentials
+            base_backoff: Delay in seconds before the first retry
+            max_backoff: Upper bound on the delay between retries
         """
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
         self.credential_store = CredentialStore(credential_file)
         self.wifi_adapter = self._select_wifi_adapter()
         self.logged_in = False
+        self.connection_result = None
 
     def _select_wifi_adapter(self) -> WifiAdapter:
         """
@@ -53,7 +74,7 @@ class BootProvisioner:
             logger.info("Falling back to wpa_supplicant adapter")
             return WpaSupplicantAdapter()
 
-    def provision(self) -> bool:
+    async def provision(self) -> bool:
         """
         Perform boot-time provisioning flow:
         1. Load stored credentials
@@ -67,14 +88,31 @@ class BootProvisioner:
 
         # Step 1: Try to connect to stored credentials
         credentials = self.credential_store.load_credentials()
+        prefetch = None
         if credentials:
             ssid, password = credentials
             logger.info(f"Found stored credentials for SSID: {ssid}")
 
-            if self._attempt_connection(ssid, password):
+            def start_prefetch():
+                # Once an attempt has failed, import the AP manager during
+                # the backoff so the fallback doesn't pay for it afterwards;
+                # a first-time connect never touches it
+                nonlocal prefetch
+                if prefetch is None:
+                    prefetch = asyncio.create_task(asyncio.to_thread(
+                        importlib.import_module, _AP_MANAGER_MODULE))
+
+            result = await self._attempt_connection(
+                ssid, password, on_retry=start_prefetch)
+            self.connection_result = result
+            if result is ConnectionResult.CONNECTED:
                 logger.info("Successfully connected to stored network")
                 self.logged_in = True
                 return True
+            elif result is ConnectionResult.AUTH_FAILED:
+                logger.error(
+                    f"Stored password for {ssid} was rejected; starting AP "
+                    "so new credentials can be entered")
             else:
                 logger.warning(
                     "Failed to connect to stored network; falling back to AP mode")
@@ -83,53 +121,78 @@ class BootProvisioner:
                 "No stored credentials found; starting AP for provisioning")
 
         # Step 2: Start AP for provisioning
-        if self._start_ap():
+        if prefetch is not None:
+            # _start_ap reports import failures itself
+            with contextlib.suppress(Exception):
+                await prefetch
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(None, self._start_ap):
             logger.info("Access point started successfully")
             return True
         else:
             logger.error("Failed to start access point")
             return False
 
-    def _attempt_connection(
+    async def _attempt_connection(
             self,
             ssid: str,
             password: str,
-            max_attempts: int = 3) -> bool:
+            max_attempts: int = 3,
+            on_retry: Optional[Callable[[], None]] = None
+    ) -> ConnectionResult:
         """
-        Attempt to connect to a network with retries and backoff.
+        Attempt to connect to a network with retries and exponential backoff.
+
+        The blocking adapter call runs in the default executor and the
+        backoff is an asyncio sleep, so the event loop stays free. A
+        rejected password ends the retries immediately.
 
         Args:
             ssid: Network SSID
             password: Network password
             max_attempts: Maximum connection attempts
+            on_retry: Called after each failed attempt that will be retried
 
         Returns:
-            True if connection succeeded, False otherwise
+            CONNECTED, AUTH_FAILED, or FAILED once attempts are exhausted
         """
-        backoff_seconds = 5
+        loop = asyncio.get_running_loop()
 
         for attempt in range(1, max_attempts + 1):
             logger.info(
                 f"Connection attempt {attempt}/{max_attempts} to {ssid}")
 
             try:
-                if self.wifi_adapter.connect(
-                        ssid, password, timeout_seconds=30):
+                connect = functools.partial(
+                    self.wifi_adapter.connect,
+                    ssid, password, timeout_seconds=30)
+                if await loop.run_in_executor(None, connect):
                     logger.info(f"Connected to {ssid} on attempt {attempt}")
-                    return True
+                    return ConnectionResult.CONNECTED
                 else:
                     logger.warning(f"Connection attempt {attempt} failed")
+            except WifiAuthError as e:
+                logger.error(f"Connection attempt {attempt} rejected: {e}")
+                return ConnectionResult.AUTH_FAILED
             except Exception as e:
                 logger.error(
                     f"Connection attempt {attempt} raised exception: {e}")
 
             # Backoff between attempts (except after last attempt)
             if attempt < max_attempts:
-                logger.debug(f"Waiting {backoff_seconds}s before retry")
-                time.sleep(backoff_seconds)
+                if on_retry is not None:
+                    on_retry()
+                delay = self._backoff_delay(attempt)
+                logger.debug(f"Waiting {delay:.1f}s before retry")
+                await asyncio.sleep(delay)
 
         logger.warning(f"All {max_attempts} connection attempts failed")
-        return False
+        return ConnectionResult.FAILED
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential delay after a failed attempt, with up to 10% jitter."""
+        delay = min(self.max_backoff, self.base_backoff * 2 ** (attempt - 1))
+        return delay + random.uniform(0, delay * 0.1)
 
     def _start_ap(self) -> bool:
         """
@@ -173,7 +236,7 @@ def main():
 
     try:
         provisioner = BootProvisioner()
-        success = provisioner.provision()
+        success = asyncio.run(provisioner.provision())
 
         if success:
             logger.info("Boot provisioning completed successfully")
@@ -3,8 +3,10 @@ Forecast aggregator for computing daily summaries from 3-hourly weather periods.
 """
 
 import logging
+from collections import Counter, defaultdict
 from datetime import datetime
-from typing import List, Dict, Tuple
+from itertools import islice
+from typing import Iterator, List, Dict, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
@@ -29,11 +31,28 @@ class ForecastParser:
     def __init__(self):
         """Initialize forecast parser."""
         self.last_parsed_count = 0
+        # Daily summaries by date, valid while the same periods list with the
+        # same fingerprint (length, first and last timestamp) is passed in
+        self._summary_cache: Dict[datetime, Dict] = {}
+        self._summary_cache_source = None
+        self._summary_cache_fingerprint = None
+
+    def _summaries_for(self, periods: List[Dict]) -> Dict[datetime, Dict]:
+        """Get the summary cache for periods, resetting it on a new list."""
+        fingerprint = (len(periods),
+                       periods[0].get('timestamp') if periods else None,
+                       periods[-1].get('timestamp') if periods else None)
+        if (periods is not self._summary_cache_source
+                or fingerprint != self._summary_cache_fingerprint):
+            self._summary_cache.clear()
+            self._summary_cache_source = periods
+            self._summary_cache_fingerprint = fingerprint
+        return self._summary_cache
 
     @staticmethod
     def is_daytime(hour: int) -> bool:
         """Check if hour is within daytime window."""
-        return ForecastParser.DAY_START_HOUR <= hour < ForecastParser.DAY_END_HOUR
+        return hour in _DAY_HOURS
 
     def aggregate_daily_summary(
         self,
@@ -61,14 +80,40 @@ class ForecastParser:
                 - min_temperature: Optional[int]
                 - period_count: int (how many 3-hourly periods)
         """
-        # Filter periods for this date
+        cache = self._summaries_for(periods)
+        summary = cache.get(date)
+        if summary is None:
+            summary = cache[date] = self._aggregate_daily_summary(
+                periods, date)
+        elif summary['period_count']:
+            self.last_parsed_count = summary['period_count']
+        return dict(summary)
+
+    def _aggregate_daily_summary(
+        self,
+        periods: List[Dict],
+        date: datetime
+    ) -> Dict:
+        """Compute aggregate_daily_summary() without the cache."""
+        # Filter periods for this date, split into day and night and
+        # collect temperatures, reading each key once per period
         date_only = date.date()
-        day_periods = [
-            p for p in periods
-            if p.get('timestamp') and p['timestamp'].date() == date_only
-        ]
-
-        if not day_periods:
+        day_periods_list = []
+        night_periods_list = []
+        temps = []
+        for p in periods:
+            ts = p.get('timestamp')
+            if not ts or ts.date() != date_only:
+                continue
+            if ts.hour in _DAY_HOURS:
+                day_periods_list.append(p)
+            else:
+                night_periods_list.append(p)
+            t = p.get('temperature')
+            if t is not None:
+                temps.append(t)
+
+        if not day_periods_list and not night_periods_list:
             logger.debug(f"No periods found for {date_only}")
             return {
                 'date': date.replace(hour=12, minute=0, second=0),
@@ -80,16 +125,17 @@ class ForecastParser:
                 'period_count': 0,
             }
 
-        # Separate day and night periods
-        day_periods_list = [
-            p for p in day_periods
-            if self.is_daytime(p.get('timestamp').hour)
-        ]
-        night_periods_list = [
-            p for p in day_periods
-            if not self.is_daytime(p.get('timestamp').hour)
-        ]
+        return self._summarize_buckets(
+            date, day_periods_list, night_periods_list, temps)
 
+    def _summarize_buckets(
+        self,
+        date: datetime,
+        day_periods_list: List[Dict],
+        night_periods_list: List[Dict],
+        temps: List[int]
+    ) -> Dict:
+        """Build a daily summary from one date's bucketed periods."""
         # Extract weather types
         day_weather_type = self._select_weather_type(day_periods_list)
         night_weather_type = self._select_weather_type(night_periods_list)
@@ -100,17 +146,11 @@ class ForecastParser:
             else night_weather_type
         )
 
-        # Extract temperatures
-        all_temps = [
-            p.get('temperature')
-            for p in day_periods
-            if p.get('temperature') is not None
-        ]
+        max_temp = max(temps, default=None)
+        min_temp = min(temps, default=None)
 
-        max_temp = max(all_temps) if all_temps else None
-        min_temp = min(all_temps) if all_temps else None
-
-        self.last_parsed_count = len(day_periods)
+        period_count = len(day_periods_list) + len(night_periods_list)
+        self.last_parsed_count = period_count
 
         return {
             'date': date.replace(hour=12, minute=0, second=0),
@@ -119,7 +159,7 @@ class ForecastParser:
             'night_weather_type': night_weather_type,
             'max_temperature': max_temp,
             'min_temperature': min_temp,
-            'period_count': len(day_periods),
+            'period_count': period_count,
         }
 
     def aggregate_multi_day(self, periods: List[Dict]) -> List[Dict]:
@@ -134,20 +174,31 @@ class ForecastParser:
         """
         if not periods:
             return []
+        # A new forecast invalidates summaries cached for the previous one
+        self._summaries_for(periods)
 
-        # Group periods by date
-        dates_seen = set()
+        # Bucket periods (and temperatures) by date and day/night in a
+        # single pass
+        buckets = defaultdict(lambda: ([], [], []))
         for period in periods:
             ts = period.get('timestamp')
-            if ts:
-                dates_seen.add(ts.date())
+            if not ts:
+                continue
+            day_list, night_list, temps = buckets[ts.date()]
+            if ts.hour in _DAY_HOURS:
+                day_list.append(period)
+            else:
+                night_list.append(period)
+            t = period.get('temperature')
+            if t is not None:
+                temps.append(t)
 
         # Generate summaries for each date
         summaries = []
-        for date_only in sorted(dates_seen):
+        for date_only in sorted(buckets):
             # Create datetime for that date
             dt = datetime.combine(date_only, datetime.min.time())
-            summary = self.aggregate_daily_summary(periods, dt)
+            summary = self._summarize_buckets(dt, *buckets[date_only])
             summaries.append(summary)
 
         logger.info(
@@ -166,21 +217,11 @@ class ForecastParser:
         Returns:
             Most common weather type string, or 'Unknown' if no periods
         """
-        if not periods:
-            return 'Unknown'
-
-        # Count weather types
-        type_counts = {}
-        for period in periods:
-            wtype = period.get('weather_type', 'Unknown')
-            type_counts[wtype] = type_counts.get(wtype, 0) + 1
-
-        # Return most common
-        if type_counts:
-            most_common = max(type_counts.items(), key=lambda x: x[1])
-            return most_common[0]
-
-        return 'Unknown'
+        # Most common type; ties go to the first type seen
+        type_counts = Counter(
+            period.get('weather_type', 'Unknown') for period in periods)
+        return max(
+            type_counts, key=type_counts.__getitem__, default='Unknown')
 
     def get_weather_type_distribution(
         self,
@@ -195,10 +236,8 @@ class ForecastParser:
         Returns:
             Dictionary mapping weather type to (count, percentage)
         """
-        type_counts = {}
-        for period in periods:
-            wtype = period.get('weather_type', 'Unknown')
-            type_counts[wtype] = type_counts.get(wtype, 0) + 1
+        type_counts = Counter(
+            period.get('weather_type', 'Unknown') for period in periods)
 
         total = len(periods)
         distribution = {
@@ -209,43 +248,67 @@ class ForecastParser:
         logger.debug(f"Weather distribution: {distribution}")
         return distribution
 
-    def validate_periods(self, periods: List[Dict]) -> Tuple[bool, List[str]]:
+    def validate_periods(
+        self,
+        periods: List[Dict],
+        max_errors: int = 50
+    ) -> Tuple[bool, List[str]]:
         """
         Validate period list structure.
 
         Args:
             periods: List of period dicts
+            max_errors: Stop after collecting this many errors
 
         Returns:
             Tuple of (is_valid, list_of_errors)
         """
-        errors = []
+        errors = list(islice(
+            self.iter_validation_errors(periods), max_errors))
+        return len(errors) == 0, errors
 
-        if not isinstance(periods, list):
-            errors.append("Periods must be a list")
-            return False, errors
+    def iter_validation_errors(self, periods: List[Dict]) -> Iterator[str]:
+        """
+        Yield validation errors for a period list, lazily.
+
+        Callers that only need a yes/no answer can stop at the first error.
 
-        required_keys = {'timestamp', 'weather_type'}
+        Args:
+            periods: List of period dicts
+
+        Yields:
+            Error description strings
+        """
+        if not isinstance(periods, list):
+            yield "Periods must be a list"
+            return
 
         for i, period in enumerate(periods):
             if not isinstance(period, dict):
-                errors.append(f"Period {i} is not a dict")
+                yield f"Period {i} is not a dict"
                 continue
 
-            missing = required_keys - set(period.keys())
-            if missing:
-                errors.append(f"Period {i} missing keys: {missing}")
+            if 'timestamp' not in period or 'weather_type' not in period:
+                missing = {
+                    k for k in ('timestamp', 'weather_type')
+                    if k not in period
+                }
+                yield f"Period {i} missing keys: {missing}"
 
             if not isinstance(period.get('timestamp'), datetime):
-                errors.append(
+                yield (
                     f"Period {i} timestamp is not datetime: "
                     f"{type(period.get('timestamp'))}"
                 )
 
             if not isinstance(period.get('weather_type'), str):
-                errors.append(
+                yield (
                     f"Period {i} weather_type is not string: "
                     f"{type(period.get('weather_type'))}"
                 )
 
-        return len(errors) == 0, errors
+
+# Daytime hours as a set, so the hot loops test membership instead of
+# calling is_daytime() per period
+_DAY_HOURS = frozenset(
+    range(ForecastParser.DAY_START_HOUR, ForecastParser.DAY_END_HOUR))
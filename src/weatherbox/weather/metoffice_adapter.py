@@ -3,17 +3,73 @@ Met Office DataPoint API adapter for weather forecast fetching.
 Handles 3-hourly forecast periods and daily aggregation.
 """
 
+import json
 import logging
+import os
+import time
+from collections import Counter
+from functools import lru_cache
+from operator import attrgetter
+from types import MappingProxyType
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Mapping, Tuple
 from dataclasses import dataclass, field
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3Error
+
+try:
+    import ijson
+except ImportError:  # Optional: response.json() is used as fallback
+    ijson = None
 
 logger = logging.getLogger(__name__)
 
+# The only parts of a DataPoint response _parse_forecast reads
+_PARAM_PREFIX = "SiteRep.Wx.Param.item"
+_PERIOD_PREFIX = "SiteRep.DV.Location.period.item"
+_STREAM_ERRORS = (ijson.JSONError,) if ijson is not None else ()
+
+
+@lru_cache(maxsize=512)
+def _parse_iso(date_str: str) -> datetime:
+    """Parse a DataPoint ISO date, e.g. "2024-01-15Z" (memoised)."""
+    # Handle formats like "2024-01-15Z" or "2024-01-15T12:00:00Z"
+    return datetime.fromisoformat(date_str.removesuffix('Z'))
+
+
+def _stream_forecast(raw) -> Dict[str, Any]:
+    """
+    Parse a DataPoint response stream, keeping only the fields we read.
+
+    Builds Wx.Param and DV.Location.period items with ijson in a single
+    pass and skips every other subtree.
+    """
+    sections = {_PARAM_PREFIX: [], _PERIOD_PREFIX: []}
+    builder = None
+    target = None
+    for prefix, event, value in ijson.parse(raw, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == target and event in ("end_map", "end_array"):
+                sections[target].append(builder.value)
+                builder = None
+        elif prefix in sections:
+            if event in ("start_map", "start_array"):
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                target = prefix
+            else:
+                sections[prefix].append(value)
+
+    return {"SiteRep": {
+        "Wx": {"Param": sections[_PARAM_PREFIX]},
+        "DV": {"Location": {"period": sections[_PERIOD_PREFIX]}},
+    }}
 
-@dataclass
+
+@dataclass(slots=True)
 class WeatherPeriod:
     """Single 3-hourly weather period from Met Office."""
     timestamp: datetime
@@ -23,14 +79,45 @@ class WeatherPeriod:
     period_type: str = "unspecified"  # "day" or "night"
 
 
-@dataclass
+@dataclass(slots=True)
 class DailySummary:
-    """Aggregated daily weather data."""
+    """
+    Aggregated daily weather data.
+
+    The day's 3-hourly periods are held column-wise (one list per field)
+    rather than as WeatherPeriod objects; `periods` rebuilds them on demand.
+    """
     date: datetime
     weather_type: str          # Most common weather type for the day
     max_temperature: Optional[int] = None
     min_temperature: Optional[int] = None
-    periods: List[WeatherPeriod] = field(default_factory=list)
+    timestamps: List[datetime] = field(default_factory=list)
+    weather_types: List[str] = field(default_factory=list)
+    temperatures: List[Optional[int]] = field(default_factory=list)
+    period_types: List[str] = field(default_factory=list)
+
+    def add_period(
+            self,
+            timestamp: datetime,
+            weather_type: str,
+            temperature: Optional[int],
+            period_type: str) -> None:
+        """Append one 3-hourly period to the columns."""
+        self.timestamps.append(timestamp)
+        self.weather_types.append(weather_type)
+        self.temperatures.append(temperature)
+        self.period_types.append(period_type)
+
+    @property
+    def periods(self) -> List[WeatherPeriod]:
+        """The day's periods as WeatherPeriod objects (built per call)."""
+        return [
+            WeatherPeriod(timestamp=ts, weather_type=wtype,
+                          temperature=temp, period_type=kind)
+            for ts, wtype, temp, kind in zip(
+                self.timestamps, self.weather_types,
+                self.temperatures, self.period_types)
+        ]
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -39,9 +126,19 @@ class DailySummary:
             "weather_type": self.weather_type,
             "max_temperature": self.max_temperature,
             "min_temperature": self.min_temperature,
-            "period_count": len(self.periods),
+            "period_count": len(self.timestamps),
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DailySummary":
+        """Rebuild a summary written by to_dict() (periods are not kept)."""
+        return cls(
+            date=datetime.fromisoformat(data["date"]),
+            weather_type=data["weather_type"],
+            max_temperature=data.get("max_temperature"),
+            min_temperature=data.get("min_temperature"),
+        )
+
 
 class MetOfficeAdapter:
     """
@@ -53,6 +150,31 @@ class MetOfficeAdapter:
     # Default endpoint (UK Met Office free tier, point forecast)
     DEFAULT_BASE_URL = "https://www.metoffice.gov.uk/services/data/datapoint"
     DEFAULT_RESOURCE = "forecast_3hourly"  # Available forecasting resource
+    DEFAULT_CACHE_FILE = "/var/cache/weatherbox/forecast.json"
+
+    # Common weather codes, used when a response carries no WeatherType params
+    _FALLBACK_WX_MAP: Mapping[int, str] = MappingProxyType({
+        0: "Clear",
+        1: "Partly cloudy",
+        2: "Partly cloudy",
+        3: "Mostly cloudy",
+        4: "Overcast",
+        5: "Overcast",
+        6: "Mist",
+        7: "Fog",
+        8: "Drizzle",
+        9: "Light rain",
+        10: "Rain",
+        11: "Heavy rain",
+        12: "Hail",
+        13: "Sleet",
+        14: "Snow",
+        15: "Heavy snow",
+        16: "Thunderstorm",
+        17: "Thunderstorm with hail",
+        18: "Thunderstorm with snow",
+        19: "Hail",
+    })
 
     def __init__(
         self,
@@ -61,6 +183,8 @@ class MetOfficeAdapter:
         longitude: float,
         base_url: str = DEFAULT_BASE_URL,
         timeout_seconds: int = 10,
+        cache_ttl_seconds: int = 900,
+        cache_file: Optional[str] = DEFAULT_CACHE_FILE,
     ):
         """
         Initialize Met Office adapter.
@@ -71,22 +195,116 @@ class MetOfficeAdapter:
             longitude: Site longitude
             base_url: API base URL
             timeout_seconds: HTTP request timeout
+            cache_ttl_seconds: Reuse a fetched forecast for this long
+            cache_file: Where to persist the forecast across restarts
+                (None disables persistence)
         """
         self.api_key = api_key
         self.latitude = latitude
         self.longitude = longitude
         self.base_url = base_url.rstrip('/')
         self.timeout_seconds = timeout_seconds
+        # One pooled keep-alive connection, so repeat fetches skip the
+        # TCP + TLS handshake
+        self._session = requests.Session()
+        self._session.headers.update({
+            "Accept": "application/json",
+            "User-Agent": "weatherbox/1.0",
+        })
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=1, pool_maxsize=2, max_retries=0))
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.cache_file = cache_file
         self.last_fetch_at = None
+        # monotonic() at the last fetch; the TTL is measured on this clock
+        self._fetched_mono = None
         self.last_forecast = None
+        # Validators from the last 200 response, for conditional GETs
+        self._etag = None
+        self._last_modified = None
+        # Weather code map parsed from the first response that carried one
+        self._wx_map_cache = None
+        self._load_cache()
+
+    @property
+    def _cache_key(self) -> List[Any]:
+        """Identifies the forecast a cached copy belongs to."""
+        return [self.latitude, self.longitude, self.DEFAULT_RESOURCE]
+
+    def _cache_fresh(self, age_seconds: Optional[float]) -> bool:
+        """Check whether a forecast of the given age is within the TTL."""
+        # A negative age means the clock is behind the fetch (e.g. a Pi
+        # before NTP sync); treat it as stale rather than fresh forever
+        return (age_seconds is not None
+                and 0 <= age_seconds < self.cache_ttl_seconds)
+
+    def _mark_fetched(self) -> None:
+        """Record a completed fetch for the TTL and the persisted cache."""
+        self.last_fetch_at = datetime.now()
+        self._fetched_mono = time.monotonic()
+
+    def _load_cache(self) -> None:
+        """Restore a persisted forecast that is still within the TTL."""
+        if not self.cache_file:
+            return
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                cached = json.load(f)
+            fetched_at = datetime.fromisoformat(cached["fetched_at"])
+            age = (datetime.now() - fetched_at).total_seconds()
+            if (cached.get("key") != self._cache_key
+                    or not self._cache_fresh(age)):
+                return
+            self.last_forecast = [
+                DailySummary.from_dict(d) for d in cached["days"]]
+            self.last_fetch_at = fetched_at
+            self._fetched_mono = time.monotonic() - age
+            self._etag = cached.get("etag")
+            self._last_modified = cached.get("last_modified")
+            logger.info(
+                "Loaded cached forecast from %s", fetched_at.isoformat())
+        except FileNotFoundError:
+            pass
+        except (OSError, KeyError, ValueError, TypeError) as e:
+            logger.warning("Ignoring unreadable forecast cache: %s", e)
+
+    def _save_cache(self) -> None:
+        """Persist the last forecast so a restart can skip the fetch."""
+        if not self.cache_file:
+            return
+        cached = {
+            "key": self._cache_key,
+            "fetched_at": self.last_fetch_at.isoformat(),
+            "days": [s.to_dict() for s in self.last_forecast],
+            "etag": self._etag,
+            "last_modified": self._last_modified,
+        }
+        tmp_path = f"{self.cache_file}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(cached, f)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            logger.warning("Could not write forecast cache: %s", e)
 
     def fetch_forecast(self) -> Optional[List[DailySummary]]:
         """
         Fetch and parse forecast from Met Office.
 
+        A forecast fetched within cache_ttl_seconds is returned without
+        issuing a request. After that the request is conditional, and a 304
+        reply keeps the previous forecast without re-parsing.
+
         Returns:
             List of DailySummary objects, or None on error
         """
+        if (self.last_forecast and self._fetched_mono is not None
+                and self._cache_fresh(
+                    time.monotonic() - self._fetched_mono)):
+            logger.debug("Using cached forecast")
+            return self.last_forecast
+
         try:
             url = f"{self.base_url}/{self.DEFAULT_RESOURCE}/point/{self.latitude},{self.longitude}"
             params = {
@@ -94,27 +312,59 @@ class MetOfficeAdapter:
                 "res": "daily",  # Request daily aggregation if available
             }
 
+            headers = {}
+            if self.last_forecast:
+                if self._etag:
+                    headers["If-None-Match"] = self._etag
+                if self._last_modified:
+                    headers["If-Modified-Since"] = self._last_modified
+
             logger.info(f"Fetching forecast from {url}")
-            response = requests.get(
+            response = self._session.get(
                 url,
                 params=params,
-                timeout=self.timeout_seconds
+                headers=headers,
+                timeout=self.timeout_seconds,
+                stream=ijson is not None
             )
-            response.raise_for_status()
-
-            data = response.json()
-            self.last_fetch_at = datetime.now()
+            try:
+                response.raise_for_status()
+
+                if response.status_code == 304 and self.last_forecast:
+                    logger.info("Forecast not modified; keeping cached copy")
+                    self._mark_fetched()
+                    self._save_cache()
+                    return self.last_forecast
+
+                if ijson is not None:
+                    # Undo gzip etc. while ijson reads the raw stream
+                    response.raw.decode_content = True
+                    try:
+                        data = _stream_forecast(response.raw)
+                    except Urllib3Error as e:
+                        # Reading response.raw directly bypasses requests'
+                        # wrapping of timeouts and dropped connections
+                        raise requests.exceptions.ConnectionError(e) from e
+                else:
+                    data = response.json()
+            finally:
+                response.close()
+            self._mark_fetched()
+            self._etag = response.headers.get("ETag")
+            self._last_modified = response.headers.get("Last-Modified")
 
             summaries = self._parse_forecast(data)
             self.last_forecast = summaries
             logger.info(f"Fetched {len(summaries)} days of forecast")
+            if summaries:
+                self._save_cache()
 
             return summaries
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Met Office API error: {e}")
             return None
-        except (KeyError, ValueError, TypeError) as e:
+        except (KeyError, ValueError, TypeError, *_STREAM_ERRORS) as e:
             logger.error(f"Failed to parse Met Office response: {e}")
             return None
 
@@ -173,34 +423,32 @@ class MetOfficeAdapter:
                 # Get date-only key
                 date_key = period_date.date()
 
-                if date_key not in summaries:
-                    summaries[date_key] = DailySummary(
+                summary = summaries.get(date_key)
+                if summary is None:
+                    summary = summaries[date_key] = DailySummary(
                         date=period_date.replace(hour=12, minute=0, second=0),
                         weather_type="Unknown"
                     )
 
                 # Parse reports (each rep is a time period within the day)
-                rep_values = period_data.get("Rep", "").split(',')
                 period = self._parse_rep_values(
-                    rep_values,
+                    period_data.get("Rep", ""),
                     period_date,
                     wx_type_map
                 )
 
                 if period:
-                    summaries[date_key].periods.append(period)
+                    summary.add_period(period_date, *period)
 
-            # Aggregate daily summaries
-            result = []
-            for date_key in sorted(summaries.keys()):
-                summary = summaries[date_key]
+            # Aggregate daily summaries (periods normally arrive in date
+            # order, so this sort is a single linear pass)
+            result = sorted(summaries.values(), key=attrgetter("date"))
+            for summary in result:
                 summary.weather_type = self._select_weather_type(
-                    summary.periods)
-                summary.max_temperature = self._get_max_temperature(
-                    summary.periods)
-                summary.min_temperature = self._get_min_temperature(
-                    summary.periods)
-                result.append(summary)
+                    summary.weather_types, summary.period_types)
+                (summary.min_temperature,
+                 summary.max_temperature) = self._temp_range(
+                    summary.temperatures)
 
             return result
 
@@ -211,21 +459,17 @@ class MetOfficeAdapter:
     def _parse_date(self, date_str: str) -> Optional[datetime]:
         """Parse ISO date string from Met Office."""
         try:
-            # Handle formats like "2024-01-15Z" or "2024-01-15T12:00:00Z"
-            if date_str.endswith('Z'):
-                date_str = date_str[:-1]
-
-            if 'T' in date_str:
-                return datetime.fromisoformat(date_str)
-            else:
-                return datetime.fromisoformat(date_str)
+            return _parse_iso(date_str)
         except ValueError:
             logger.warning(f"Could not parse date: {date_str}")
             return None
 
     def _get_weather_type_map(
-            self, site_rep: Dict[str, Any]) -> Dict[int, str]:
-        """Build map of weather code to readable type."""
+            self, site_rep: Dict[str, Any]) -> Mapping[int, str]:
+        """Build map of weather code to readable type (parsed once)."""
+        if self._wx_map_cache is not None:
+            return self._wx_map_cache
+
         wx_map = {}
 
         try:
@@ -245,115 +489,92 @@ class MetOfficeAdapter:
 
         # Fallback mappings for common codes if parsing fails
         if not wx_map:
-            wx_map = {
-                0: "Clear",
-                1: "Partly cloudy",
-                2: "Partly cloudy",
-                3: "Mostly cloudy",
-                4: "Overcast",
-                5: "Overcast",
-                6: "Mist",
-                7: "Fog",
-                8: "Drizzle",
-                9: "Light rain",
-                10: "Rain",
-                11: "Heavy rain",
-                12: "Hail",
-                13: "Sleet",
-                14: "Snow",
-                15: "Heavy snow",
-                16: "Thunderstorm",
-                17: "Thunderstorm with hail",
-                18: "Thunderstorm with snow",
-                19: "Hail",
-            }
+            return self._FALLBACK_WX_MAP
 
-        return wx_map
+        self._wx_map_cache = MappingProxyType(wx_map)
+        return self._wx_map_cache
 
     def _parse_rep_values(
         self,
-        rep_values: List[str],
+        rep: str,
         period_date: datetime,
-        wx_type_map: Dict[int, str]
-    ) -> Optional[WeatherPeriod]:
+        wx_type_map: Mapping[int, str]
+    ) -> Optional[Tuple[str, Optional[int], str]]:
         """
-        Parse report values (comma-separated parameter values).
+        Parse a report string (comma-separated parameter values) into
+        (weather_type, temperature, period_type).
+
+        Only the temperature and the last value are read, so the string is
+        never split in full.
         Format: "0,10,2.5,270,5,1008,15,2"
         Indices: [wind_direction°, wind_speed, temp, wind_direction, ?, pressure, ?, weather_type]
         """
         try:
             # Weather type is typically index 7, but varies by API version
             # For now, use index -1 (last value) or assume index varies
-            if len(rep_values) >= 1:
-                weather_code = int(rep_values[-1].strip())
-                weather_type = wx_type_map.get(
-                    weather_code, f"WeatherCode({weather_code})")
-            else:
-                weather_type = "Unknown"
+            # int() and float() skip surrounding whitespace themselves
+            weather_code = int(rep.rpartition(',')[2])
+            weather_type = wx_type_map.get(
+                weather_code, f"WeatherCode({weather_code})")
 
             # Temperature typically at index 2
             temperature = None
-            if len(rep_values) >= 3:
+            parts = rep.split(',', 3)
+            if len(parts) >= 3:
                 try:
-                    temperature = int(float(rep_values[2].strip()))
-                except (ValueError, IndexError):
+                    temperature = int(float(parts[2]))
+                except ValueError:
                     pass
 
             # Determine day/night based on hour
             hour = period_date.hour
             period_type = "day" if 6 <= hour < 22 else "night"
 
-            return WeatherPeriod(
-                timestamp=period_date,
-                weather_type=weather_type,
-                temperature=temperature,
-                period_type=period_type
-            )
+            return weather_type, temperature, period_type
 
         except Exception as e:
             logger.debug(f"Rep parse error: {e}")
             return None
 
-    def _select_weather_type(self, periods: List[WeatherPeriod]) -> str:
+    def _select_weather_type(
+            self,
+            weather_types: List[str],
+            period_types: List[str]) -> str:
         """
         Select most common weather type for the day.
         Prioritize day periods over night periods.
         """
-        if not periods:
+        if not weather_types:
             return "Unknown"
 
-        # Count weather types by frequency
-        day_types = {}
-        night_types = {}
-
-        for period in periods:
-            type_map = day_types if period.period_type == "day" else night_types
-            type_map[period.weather_type] = type_map.get(
-                period.weather_type, 0) + 1
+        # Count weather types by frequency; ties go to the first type seen
+        day_types = Counter(
+            wtype for wtype, kind in zip(weather_types, period_types)
+            if kind == "day")
 
         # Prefer day period weather type
         if day_types:
-            most_common = max(day_types.items(), key=lambda x: x[1])
-            return most_common[0]
-        elif night_types:
-            most_common = max(night_types.items(), key=lambda x: x[1])
-            return most_common[0]
-
-        return periods[0].weather_type
-
-    def _get_max_temperature(
-            self,
-            periods: List[WeatherPeriod]) -> Optional[int]:
-        """Get maximum temperature from periods."""
-        temps = [p.temperature for p in periods if p.temperature is not None]
-        return max(temps) if temps else None
-
-    def _get_min_temperature(
-            self,
-            periods: List[WeatherPeriod]) -> Optional[int]:
-        """Get minimum temperature from periods."""
-        temps = [p.temperature for p in periods if p.temperature is not None]
-        return min(temps) if temps else None
+            return day_types.most_common(1)[0][0]
+        return Counter(weather_types).most_common(1)[0][0]
+
+    @staticmethod
+    def _temp_range(
+            temperatures: List[Optional[int]]
+    ) -> Tuple[Optional[int], Optional[int]]:
+        """Get (minimum, maximum) of the known temperatures in one pass."""
+        lo = hi = None
+        for t in temperatures:
+            if t is None:
+                continue
+            if lo is None or t < lo:
+                lo = t
+            if hi is None or t > hi:
+                hi = t
+        return lo, hi
+
+    def close(self) -> None:
+        """Close the pooled HTTP connection."""
+        self._session.close()
 
     def get_last_forecast(self) -> Optional[List[DailySummary]]:
         """Get cached forecast from last fetch."""
@@ -4,11 +4,18 @@ Implements exponential backoff and update window management for weather forecast
 """
 
 import logging
+import random
 from datetime import datetime, time, timedelta
 from enum import Enum
+from time import monotonic
 
 logger = logging.getLogger(__name__)
 
+# Backoff intervals, shared across schedulers
+_ONE_MIN = timedelta(minutes=1)
+_FIVE_MIN = timedelta(minutes=5)
+_TEN_MIN = timedelta(minutes=10)
+
 
 class RetryState(Enum):
     """Retry state machine states."""
@@ -28,22 +35,38 @@ class RetryScheduler:
     - Phase 2: 5 minutes × 12 attempts (60 minutes total)
     - Phase 3: 10 minutes until 24 hours exceeded
     - Give up after 24 hours
+
+    With jitter enabled each interval is stretched up to 3x its phase base
+    so that devices failing together do not retry in lockstep.
     """
 
-    def __init__(self, max_retry_hours: int = 24):
+    def __init__(self, max_retry_hours: int = 24, jitter: bool = False):
         """
         Initialize retry scheduler.
 
         Args:
             max_retry_hours: Maximum hours to retry before giving up (default: 24)
+            jitter: Randomise each interval between 1x and 3x its base
+                (default: False)
         """
         self.max_retry_hours = max_retry_hours
+        self.jitter = jitter
+        self._rng = random.Random()
+        self._max_retry_seconds = max_retry_hours * 3600
+        self._exhausted_td = timedelta(hours=max_retry_hours)
         self.state = RetryState.IDLE
         self.attempt_count = 0
         self.phase_1_attempts = 5
         self.phase_2_attempts = 12
+        # (last attempt in phase, state, interval), checked in order
+        self._phase_table = (
+            (self.phase_1_attempts, RetryState.BACKOFF_1_MIN, _ONE_MIN),
+            (self.phase_1_attempts + self.phase_2_attempts,
+             RetryState.BACKOFF_5_MIN, _FIVE_MIN),
+        )
         self.started_at = None
         self.last_retry_at = None
+        self._started_mono = None
 
     def reset(self) -> None:
         """Reset retry state."""
@@ -51,6 +74,7 @@ class RetryScheduler:
         self.attempt_count = 0
         self.started_at = None
         self.last_retry_at = None
+        self._started_mono = None
         logger.info("Retry scheduler reset")
 
     def record_failure(self) -> timedelta:
@@ -60,32 +84,39 @@ class RetryScheduler:
         Returns:
             timedelta until next retry
         """
+        now = datetime.now()
+        now_mono = monotonic()
         if self.started_at is None:
-            self.started_at = datetime.now()
+            self.started_at = now
+        if self._started_mono is None:
+            # Anchor to started_at so a restored start time still counts
+            self._started_mono = (
+                now_mono - (now - self.started_at).total_seconds())
 
         self.attempt_count += 1
-        self.last_retry_at = datetime.now()
+        self.last_retry_at = now
 
-        # Check if exceeded max time
-        elapsed = datetime.now() - self.started_at
-        if elapsed.total_seconds() > self.max_retry_hours * 3600:
+        # Check if exceeded max time (monotonic, immune to clock steps)
+        elapsed = now_mono - self._started_mono
+        if elapsed > self._max_retry_seconds:
             self.state = RetryState.BACKOFF_EXHAUSTED
             logger.warning(
-                f"Retry exhausted after {elapsed} and {
-                    self.attempt_count} attempts")
+                f"Retry exhausted after {timedelta(seconds=int(elapsed))} "
+                f"and {self.attempt_count} attempts")
             # Large value to signal stop
-            return timedelta(hours=self.max_retry_hours)
+            return self._exhausted_td
 
         # Determine next backoff interval
-        if self.attempt_count <= self.phase_1_attempts:
-            self.state = RetryState.BACKOFF_1_MIN
-            interval = timedelta(minutes=1)
-        elif self.attempt_count <= self.phase_1_attempts + self.phase_2_attempts:
-            self.state = RetryState.BACKOFF_5_MIN
-            interval = timedelta(minutes=5)
+        for threshold, state, interval in self._phase_table:
+            if self.attempt_count <= threshold:
+                break
         else:
-            self.state = RetryState.BACKOFF_10_MIN
-            interval = timedelta(minutes=10)
+            state, interval = RetryState.BACKOFF_10_MIN, _TEN_MIN
+        self.state = state
+        if self.jitter:
+            base = interval.total_seconds()
+            interval = timedelta(seconds=self._rng.uniform(
+                base, min(base * 3, self._max_retry_seconds)))
 
         logger.info(
             f"Retry scheduled: attempt {self.attempt_count}, "
@@ -133,6 +164,8 @@ class UpdateWindowScheduler:
         self.daytime_end = self._parse_time(daytime_end)
         self.night_interval_minutes = night_interval_minutes
         self.daytime_interval_minutes = daytime_interval_minutes
+        self._daytime_td = timedelta(minutes=daytime_interval_minutes)
+        self._night_td = timedelta(minutes=night_interval_minutes)
         self.next_update_at = next_update_at or datetime.now()
 
     @staticmethod
@@ -171,10 +204,10 @@ class UpdateWindowScheduler:
         dt = dt or datetime.now()
 
         if self.is_daytime(dt):
-            interval = timedelta(minutes=self.daytime_interval_minutes)
+            interval = self._daytime_td
             window = "daytime"
         else:
-            interval = timedelta(minutes=self.night_interval_minutes)
+            interval = self._night_td
             window = "night"
 
         self.next_update_at = dt + interval
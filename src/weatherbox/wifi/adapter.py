@@ -3,10 +3,22 @@ Wi-Fi adapter interface for abstraction over NetworkManager / wpa_supplicant.
 Allows test doubles to be injected in CI environments.
 """
 
+import shutil
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import List, Optional
 
 
+@lru_cache(maxsize=8)
+def _binary_available(name: str) -> bool:
+    """Check whether an executable is on PATH (memoised per name)."""
+    return shutil.which(name) is not None
+
+
+class WifiAuthError(RuntimeError):
+    """The network rejected the credentials; retrying them cannot succeed."""
+
+
 class WifiNetwork:
     """Represents a discovered Wi-Fi network."""
 
@@ -85,6 +97,7 @@ class WifiAdapter(ABC):
             True if connection succeeded, False otherwise
 
         Raises:
+            WifiAuthError: If the password was rejected by the network
             RuntimeError: If connection operation fails
         """
 
@@ -1,21 +1,51 @@
 """
 NetworkManager-based Wi-Fi adapter implementation.
-Uses python-networkmanager or nmcli fallback for Wi-Fi operations.
+Talks to NetworkManager over D-Bus (jeepney) when available, otherwise
+uses python-networkmanager or nmcli fallback for Wi-Fi operations.
 """
 
 import logging
 import subprocess
+import threading
+import time
 from typing import List
-from src.weatherbox.wifi.adapter import WifiAdapter, WifiNetwork, WifiStatus
+from src.weatherbox.wifi.adapter import (
+    WifiAdapter, WifiAuthError, WifiNetwork, WifiStatus, _binary_available)
 
 logger = logging.getLogger(__name__)
 
+# nmcli error fragments that mean the password itself was refused
+_AUTH_FAILURE_MARKERS = ('secrets were required', 'psk: property is invalid')
+
+# Fields requested from 'nmcli -t device show' for status()
+_STATUS_FIELDS = 'GENERAL.STATE,GENERAL.CONNECTION,IP4.ADDRESS'
+
+# NetworkManager D-Bus names and enum values
+_NM_BUS = 'org.freedesktop.NetworkManager'
+_NM_PATH = '/org/freedesktop/NetworkManager'
+_NM_DEVICE = _NM_BUS + '.Device'
+_NM_WIRELESS = _NM_DEVICE + '.Wireless'
+_NM_ACCESS_POINT = _NM_BUS + '.AccessPoint'
+_NM_DEVICE_TYPE_WIFI = 2
+_NM_DEVICE_STATE_ACTIVATED = 100
+_NM_AP_FLAGS_PRIVACY = 0x1
+_NM_AP_SEC_KEY_MGMT_SAE = 0x400
+# How long scan() waits for a requested rescan to land in LastScan
+_RESCAN_WAIT_SECONDS = 3.0
+_RESCAN_POLL_SECONDS = 0.25
+
 
 class NetworkManagerAdapter(WifiAdapter):
     """Wi-Fi adapter implementation using NetworkManager."""
 
     def __init__(self):
         """Initialize NetworkManager adapter."""
+        self._dbus = None
+        # jeepney's blocking connection is not thread-safe; the portal and
+        # boot executor may call in from several threads
+        self._dbus_lock = threading.Lock()
+        self._wifi_device = None
+        self._open_dbus()
         self.use_nmcli = self._check_nmcli()
         if not self.use_nmcli:
             try:
@@ -34,12 +64,69 @@ class NetworkManagerAdapter(WifiAdapter):
 
     def _check_nmcli(self) -> bool:
         """Check if nmcli command is available."""
+        return _binary_available('nmcli')
+
+    def _open_dbus(self) -> None:
+        """
+        Open a long-lived system bus connection and find the Wi-Fi device.
+
+        Leaves ``_wifi_device`` as None when jeepney is missing or
+        NetworkManager is unreachable, so callers fall back to nmcli.
+        """
         try:
-            result = subprocess.run(
-                ['which', 'nmcli'], capture_output=True, timeout=5)
-            return result.returncode == 0
-        except Exception:
-            return False
+            from jeepney import DBusAddress, Properties, new_method_call
+            from jeepney.io.blocking import open_dbus_connection
+        except ImportError:
+            return
+
+        try:
+            conn = open_dbus_connection(bus='SYSTEM')
+        except Exception as e:
+            logger.debug(f"System D-Bus unavailable: {e}")
+            return
+
+        try:
+            nm = DBusAddress(_NM_PATH, bus_name=_NM_BUS, interface=_NM_BUS)
+            devices, = conn.send_and_get_reply(
+                new_method_call(nm, 'GetDevices'), timeout=5, unwrap=True)
+            for path in devices:
+                device = DBusAddress(
+                    path, bus_name=_NM_BUS, interface=_NM_DEVICE)
+                (_, device_type), = conn.send_and_get_reply(
+                    Properties(device).get('DeviceType'),
+                    timeout=5, unwrap=True)
+                if device_type == _NM_DEVICE_TYPE_WIFI:
+                    self._wifi_device = path
+                    break
+        except Exception as e:
+            logger.debug(f"NetworkManager D-Bus query failed: {e}")
+
+        if self._wifi_device is None:
+            conn.close()
+            return
+
+        self._dbus = conn
+        logger.info("Using NetworkManager over D-Bus")
+
+    def _dbus_call(self, path: str, interface: str, method: str,
+                   timeout: float = 10, signature: str = None,
+                   body: tuple = ()) -> tuple:
+        """Call a NetworkManager method and return the reply body."""
+        from jeepney import DBusAddress, new_method_call
+
+        address = DBusAddress(path, bus_name=_NM_BUS, interface=interface)
+        message = new_method_call(address, method, signature, body)
+        with self._dbus_lock:
+            return self._dbus.send_and_get_reply(
+                message, timeout=timeout, unwrap=True)
+
+    def _dbus_properties(self, path: str, interface: str,
+                         timeout: float = 10) -> dict:
+        """Fetch all properties of an object with variants unwrapped."""
+        props, = self._dbus_call(
+            path, 'org.freedesktop.DBus.Properties', 'GetAll',
+            timeout, 's', (interface,))
+        return {name: value for name, (_, value) in props.items()}
 
     def scan(self, timeout_seconds: int = 10) -> List[WifiNetwork]:
         """
@@ -51,6 +138,12 @@ class NetworkManagerAdapter(WifiAdapter):
         Returns:
             List of discovered WifiNetwork objects
         """
+        if self._wifi_device is not None:
+            try:
+                return self._scan_dbus(timeout_seconds)
+            except Exception as e:
+                logger.warning(f"D-Bus scan failed, falling back: {e}")
+
         try:
             if self.use_nmcli:
                 return self._scan_nmcli(timeout_seconds)
@@ -63,6 +156,88 @@ class NetworkManagerAdapter(WifiAdapter):
             logger.error(f"Scan failed: {e}")
             return []
 
+    def _scan_dbus(self, timeout_seconds: int) -> List[WifiNetwork]:
+        """
+        Scan by reading the device's access points over D-Bus.
+
+        Requests a fresh scan first (as 'nmcli device wifi list' does) and
+        waits briefly for it. timeout_seconds bounds the whole scan; access
+        points not read by the deadline are left out.
+        """
+        deadline = time.monotonic() + timeout_seconds
+        self._request_rescan(deadline)
+
+        ap_paths, = self._dbus_call(
+            self._wifi_device, _NM_WIRELESS, 'GetAllAccessPoints',
+            max(deadline - time.monotonic(), 0.1))
+
+        networks = []
+        for path in ap_paths:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(
+                    f"Scan deadline reached after {len(networks)} of "
+                    f"{len(ap_paths)} access points")
+                break
+            ap = self._dbus_properties(path, _NM_ACCESS_POINT, remaining)
+            ssid_bytes = ap.get('Ssid')
+            if not ssid_bytes:
+                continue
+
+            networks.append(WifiNetwork(
+                bytes(ssid_bytes).decode('utf-8', errors='replace'),
+                ap.get('Strength', 0),
+                self._security_from_flags(
+                    ap.get('Flags', 0), ap.get('WpaFlags', 0),
+                    ap.get('RsnFlags', 0))))
+
+        logger.info(f"Scan found {len(networks)} networks")
+        return networks
+
+    def _request_rescan(self, deadline: float) -> None:
+        """Ask NetworkManager to rescan and wait briefly for the results."""
+        wait_until = min(deadline, time.monotonic() + _RESCAN_WAIT_SECONDS)
+        if wait_until <= time.monotonic():
+            return
+        try:
+            last_scan = self._dbus_properties(
+                self._wifi_device, _NM_WIRELESS,
+                wait_until - time.monotonic()).get('LastScan')
+            self._dbus_call(
+                self._wifi_device, _NM_WIRELESS, 'RequestScan',
+                wait_until - time.monotonic(), 'a{sv}', ({},))
+        except Exception as e:
+            # Typically a scan already in progress or one requested too
+            # recently; the current list is still worth returning
+            logger.debug(f"Rescan not started: {e}")
+            return
+
+        while time.monotonic() + _RESCAN_POLL_SECONDS < wait_until:
+            time.sleep(_RESCAN_POLL_SECONDS)
+            try:
+                if self._dbus_properties(
+                        self._wifi_device, _NM_WIRELESS,
+                        wait_until - time.monotonic()
+                ).get('LastScan') != last_scan:
+                    return
+            except Exception as e:
+                logger.debug(f"Rescan poll failed: {e}")
+                return
+
+    @staticmethod
+    def _security_from_flags(flags: int, wpa_flags: int,
+                             rsn_flags: int) -> str:
+        """Map NetworkManager access point flags to a security label."""
+        if rsn_flags & _NM_AP_SEC_KEY_MGMT_SAE:
+            return "WPA3"
+        if rsn_flags:
+            return "WPA2"
+        if wpa_flags:
+            return "WPA"
+        if flags & _NM_AP_FLAGS_PRIVACY:
+            return "WEP"
+        return "Open"
+
     def _scan_nmcli(self, timeout_seconds: int) -> List[WifiNetwork]:
         """Scan using nmcli command-line interface."""
         try:
@@ -144,6 +319,8 @@ class NetworkManagerAdapter(WifiAdapter):
             else:
                 logger.error("No NetworkManager interface available")
                 return False
+        except WifiAuthError:
+            raise
         except Exception as e:
             logger.error(f"Connect failed: {e}")
             return False
@@ -167,7 +344,12 @@ class NetworkManagerAdapter(WifiAdapter):
                 return True
             else:
                 logger.warning(f"Failed to connect to {ssid}: {result.stderr}")
+                stderr = (result.stderr or '').lower()
+                if any(m in stderr for m in _AUTH_FAILURE_MARKERS):
+                    raise WifiAuthError(f"Credentials rejected for {ssid}")
                 return False
+        except WifiAuthError:
+            raise
         except Exception as e:
             logger.error(f"nmcli connect failed: {e}")
             return False
@@ -208,6 +390,12 @@ class NetworkManagerAdapter(WifiAdapter):
 
     def status(self) -> WifiStatus:
         """Get current Wi-Fi connection status."""
+        if self._wifi_device is not None:
+            try:
+                return self._status_dbus()
+            except Exception as e:
+                logger.warning(f"D-Bus status failed, falling back: {e}")
+
         try:
             if self.use_nmcli:
                 return self._status_nmcli()
@@ -219,33 +407,52 @@ class NetworkManagerAdapter(WifiAdapter):
             logger.error(f"Status check failed: {e}")
             return WifiStatus(False)
 
+    def _status_dbus(self) -> WifiStatus:
+        """Get status from the Wi-Fi device's D-Bus properties."""
+        device = self._dbus_properties(self._wifi_device, _NM_DEVICE)
+        if device.get('State') != _NM_DEVICE_STATE_ACTIVATED:
+            return WifiStatus(False)
+
+        ssid = None
+        active = device.get('ActiveConnection', '/')
+        if active != '/':
+            ssid = self._dbus_properties(
+                active, _NM_BUS + '.Connection.Active').get('Id')
+
+        ip_address = None
+        ip4_config = device.get('Ip4Config', '/')
+        if ip4_config != '/':
+            addresses = self._dbus_properties(
+                ip4_config, _NM_BUS + '.IP4Config').get('AddressData', [])
+            if addresses:
+                ip_address = addresses[0]['address'][1]
+
+        return WifiStatus(True, ssid, ip_address)
+
     def _status_nmcli(self) -> WifiStatus:
         """Get status using nmcli."""
         try:
             result = subprocess.run(
-                ['nmcli', 'device', 'show', 'wlan0'],
+                ['nmcli', '-t', '-f', _STATUS_FIELDS,
+                 'device', 'show', 'wlan0'],
                 capture_output=True,
                 text=True,
                 timeout=10
             )
 
-            connected = False
-            ssid = None
-            ip_address = None
-
-            for line in result.stdout.split('\n'):
-                if 'IP4.ADDRESS' in line and line.strip():
-                    # Extract IP
-                    parts = line.split(':')
-                    if len(parts) > 1:
-                        ip_address = parts[1].strip().split('/')[0]
-                        connected = True
-                elif 'GENERAL.CON-PATH' in line and 'none' not in line:
-                    connected = True
-                elif 'GENERAL.SSID' in line:
-                    parts = line.split(':')
-                    if len(parts) > 1:
-                        ssid = parts[1].strip()
+            # Terse output is "KEY:value" per line; multi-valued keys carry
+            # an index (IP4.ADDRESS[1]) and colons in values are escaped
+            fields = {}
+            for line in result.stdout.splitlines():
+                key, sep, value = line.partition(':')
+                if sep:
+                    fields.setdefault(
+                        key.partition('[')[0], value.replace('\\:', ':'))
+
+            connected = fields.get('GENERAL.STATE', '').startswith('100')
+            ssid = fields.get('GENERAL.CONNECTION') or None
+            ip_address = (
+                fields.get('IP4.ADDRESS', '').partition('/')[0] or None)
 
             return WifiStatus(connected, ssid, ip_address)
         except Exception as e:
@@ -7,7 +7,8 @@ Shells out to wpa_cli and wpa_supplicant for Wi-Fi operations.
 import logging
 import subprocess
 from typing import List
-from src.weatherbox.wifi.adapter import WifiAdapter, WifiNetwork, WifiStatus
+from src.weatherbox.wifi.adapter import (
+    WifiAdapter, WifiAuthError, WifiNetwork, WifiStatus, _binary_available)
 
 logger = logging.getLogger(__name__)
 
@@ -27,16 +28,11 @@ class WpaSupplicantAdapter(WifiAdapter):
 
     def _check_available(self) -> bool:
         """Check if wpa_cli is available."""
-        try:
-            result = subprocess.run(
-                ['which', 'wpa_cli'], capture_output=True, timeout=5)
-            if result.returncode != 0:
-                logger.warning(
-                    "wpa_cli not found; wpa_supplicant adapter will not function")
-            return result.returncode == 0
-        except Exception as e:
-            logger.error(f"Failed to check wpa_cli availability: {e}")
-            return False
+        available = _binary_available('wpa_cli')
+        if not available:
+            logger.warning(
+                "wpa_cli not found; wpa_supplicant adapter will not function")
+        return available
 
     def scan(self, timeout_seconds: int = 10) -> List[WifiNetwork]:
         """
@@ -151,16 +147,20 @@ class WpaSupplicantAdapter(WifiAdapter):
                            capture_output=True,
                            timeout=5)
 
-            # Set password
-            subprocess.run(['wpa_cli',
-                            '-i',
-                            self.interface,
-                            'set_network',
-                            network_id,
-                            'psk',
-                            f'"{password}"'],
-                           capture_output=True,
-                           timeout=5)
+            # Set password (wpa_cli refuses malformed passphrases)
+            result = subprocess.run(['wpa_cli',
+                                     '-i',
+                                     self.interface,
+                                     'set_network',
+                                     network_id,
+                                     'psk',
+                                     f'"{password}"'],
+                                    capture_output=True,
+                                    text=True,
+                                    timeout=5)
+
+            if 'FAIL' in result.stdout:
+                raise WifiAuthError(f"Passphrase rejected for {ssid}")
 
             # Enable network
             result = subprocess.run(
@@ -187,6 +187,8 @@ class WpaSupplicantAdapter(WifiAdapter):
             logger.warning(
                 f"Connection to {ssid} timed out after {timeout_seconds}s")
             return False
+        except WifiAuthError:
+            raise
         except Exception as e:
             logger.error(f"wpa_cli connect failed: {e}")
             return False
@@ -3,12 +3,14 @@ Integration tests for weather forecast fetch and display rendering.
 Tests full cycle: API fetch → parse → render with stubbed API and mock display.
 """
 
+import json
+
 import pytest
 from datetime import datetime
 
 from weatherbox.display_service import WeatherDisplayService
 from weatherbox.weather.retry_scheduler import RetryState
-from weatherbox.display.adapter import DisplayAdapter
+from weatherbox.display.adapter import Bitmap, DisplayAdapter
 from weatherbox.icons.loader import IconLoader
 
 
@@ -211,6 +213,101 @@ class TestForecastFetchAndRender:
         # At least 4 matrices rendered
         assert len(mock_display.rendered_frames) >= 4
 
+    def test_render_forecast_reuses_bitmaps(self, service, mock_display):
+        """Test repeated renders draw into the same bitmap pool."""
+        forecast = service.fetch_forecast()
+        service.render_forecast(forecast)
+        first = [bm for _, bm in mock_display.rendered_frames[-4:]]
+
+        service.render_forecast(forecast)
+        second = [bm for _, bm in mock_display.rendered_frames[-4:]]
+
+        assert all(a is b for a, b in zip(first, second))
+
+    def test_unchanged_forecast_not_redrawn(self, service, mock_display):
+        """Test an identical forecast skips the display until invalidated."""
+        forecast = service.fetch_forecast()
+        assert service.render_forecast(forecast) is True
+        rendered = len(mock_display.rendered_frames)
+
+        assert service.render_forecast(forecast) is True
+        assert len(mock_display.rendered_frames) == rendered
+
+        service.display_error()
+        rendered = len(mock_display.rendered_frames)
+        assert service.render_forecast(forecast) is True
+        assert len(mock_display.rendered_frames) == rendered + 4
+
+    def test_brightness_change_forces_redraw(self, service, mock_display):
+        """Test a new brightness level redraws an unchanged forecast."""
+        forecast = service.fetch_forecast()
+        service.update_brightness(force=True)
+        assert service.render_forecast(forecast) is True
+        rendered = len(mock_display.rendered_frames)
+
+        service.update_brightness(force=True)
+        assert service.render_forecast(forecast) is True
+        assert len(mock_display.rendered_frames) == rendered
+
+        service.brightness.set_max_brightness(
+            service.brightness.get_brightness() - 10)
+        service.update_brightness(force=True)
+        assert service.render_forecast(forecast) is True
+        assert len(mock_display.rendered_frames) == rendered + 4
+
+    def test_render_adapter_daily_summary(self, service, mock_display):
+        """Test summaries without day/night types still render."""
+        from weatherbox.weather.metoffice_adapter import DailySummary
+
+        forecast = [DailySummary(
+            date=datetime(2024, 1, 15), weather_type='Clear',
+            max_temperature=9, min_temperature=1)]
+
+        assert service.render_forecast(forecast) is True
+        _, bitmap = mock_display.rendered_frames[0]
+        assert bytes(bitmap.data) == service._draw_icon_tile(1)
+        assert any(bitmap.data)
+
+    def test_icon_tiles_drawn_once(self, service):
+        """Test each icon tile is drawn once and copied thereafter."""
+        first, second = Bitmap(), Bitmap()
+        service._render_icon_and_temp(first, 2, 10)
+        tile = service._icon_tiles[2]
+        service._render_icon_and_temp(second, 2, 12)
+
+        assert service._icon_tiles[2] is tile
+        assert first.data == second.data == tile
+        assert first.get_pixel(0, 0) == 50 and first.get_pixel(1, 0) == 0
+
+    def test_icon_lookup_cached_until_remap(
+            self, service, icon_loader, monkeypatch):
+        """Test icon IDs are resolved once per mapping."""
+        calls = []
+        lookup = icon_loader.get_icon_id
+        monkeypatch.setattr(icon_loader, 'get_icon_id',
+                            lambda t: calls.append(t) or lookup(t))
+
+        assert service._icon_id('Clear') == 1
+        assert service._icon_id('Clear') == 1
+        assert calls == ['Clear']
+
+        icon_loader.mappings = {'Clear': 9}
+        assert service._icon_id('Clear') == 9
+
+    def test_current_day_uses_passed_time_of_day(self, service, monkeypatch):
+        """Test the precomputed afternoon flag picks day or night weather."""
+        summary = service.fetch_forecast()[0]
+        seen = []
+        monkeypatch.setattr(WeatherDisplayService, '_icon_id',
+                            lambda self, t: seen.append(t) or 1)
+
+        service._render_day_summary(summary, is_current=True,
+                                    is_afternoon=True)
+        service._render_day_summary(summary, is_current=True,
+                                    is_afternoon=False)
+
+        assert seen == [summary.day_weather_type, summary.night_weather_type]
+
     def test_render_empty_forecast(self, service):
         """Test rendering empty forecast."""
         result = service.render_forecast([])
@@ -291,6 +388,16 @@ class TestForecastFetchAndRender:
         assert service.display_error() is True
         assert mock_display.cleared is False  # Error display rendered, not cleared
 
+    def test_error_display_draws_x(self, service, mock_display):
+        """Test the error symbol lights both diagonals only."""
+        assert service.display_error() is True
+
+        _, bitmap = mock_display.rendered_frames[-1]
+        lit = {(x, y) for y in range(8) for x in range(8)
+               if bitmap.get_pixel(x, y)}
+        diagonals = {(i, i) for i in range(8)} | {(7 - i, i) for i in range(8)}
+        assert lit == diagonals
+
     def test_display_shutdown_clears_display(self, service, mock_display):
         """Test shutdown clears display."""
         service.initialize()
@@ -299,6 +406,29 @@ class TestForecastFetchAndRender:
 
         assert mock_display.cleared is True
 
+    def test_error_diagnostics_rate_limited(
+            self, mock_display, stub_api, icon_loader, tmp_path):
+        """Test repeated errors write one compact diagnostics report."""
+        service = WeatherDisplayService(
+            display_adapter=mock_display,
+            metoffice_adapter=stub_api,
+            icon_loader=icon_loader,
+            diagnostics_dir=str(tmp_path),
+        )
+
+        service._save_error_diagnostics("first")
+        service._save_error_diagnostics("second")
+
+        reports = list(tmp_path.glob("error_*.json"))
+        assert len(reports) == 1
+        report = reports[0].read_bytes()
+        assert b'\n' not in report
+        assert json.loads(report)['error'] == "first"
+
+    def test_service_uses_slots(self, service):
+        """Test the service keeps no per-instance __dict__."""
+        assert not hasattr(service, '__dict__')
+
     def test_get_service_status(self, service):
         """Test status reporting."""
         service.initialize()
@@ -391,3 +521,276 @@ class TestApiFailureAndRecovery:
             forecast = service.fetch_forecast()
             assert forecast is not None
             assert service.retry_scheduler.attempt_count == 0
+
+
+class TestMetOfficeAggregation:
+    """Test daily aggregation helpers on the real Met Office adapter."""
+
+    def test_temp_range_single_pass(self):
+        """Test min and max come back together, skipping missing values."""
+        from weatherbox.weather.metoffice_adapter import MetOfficeAdapter
+
+        assert MetOfficeAdapter._temp_range([7, None, -2]) == (-2, 7)
+        assert MetOfficeAdapter._temp_range([None]) == (None, None)
+
+    def test_periods_stored_as_columns(self):
+        """Test summaries keep per-field columns and rebuild periods."""
+        from weatherbox.weather.metoffice_adapter import (
+            DailySummary, MetOfficeAdapter, WeatherPeriod)
+        summary = DailySummary(date=datetime(2024, 1, 15, 12),
+                               weather_type="Unknown")
+        summary.add_period(datetime(2024, 1, 15, 3), "Fog", 1, "night")
+        summary.add_period(datetime(2024, 1, 15, 12), "Clear", 6, "day")
+
+        assert summary.temperatures == [1, 6]
+        assert summary.to_dict()["period_count"] == 2
+        assert summary.periods[1] == WeatherPeriod(
+            timestamp=datetime(2024, 1, 15, 12), weather_type="Clear",
+            temperature=6, period_type="day")
+        adapter = MetOfficeAdapter("key", 51.5, -0.1, cache_file=None)
+        assert adapter._select_weather_type(
+            summary.weather_types, summary.period_types) == "Clear"
+
+    def test_parse_forecast_orders_days(self):
+        """Test summaries come back in date order whatever the input order."""
+        from weatherbox.weather.metoffice_adapter import MetOfficeAdapter
+        adapter = MetOfficeAdapter("key", 51.5, -0.1, cache_file=None)
+        data = {"SiteRep": {"DV": {"Location": {"period": [
+            {"$": "2024-01-17Z", "Rep": "0,0,4"},
+            {"$": "2024-01-15Z", "Rep": "0,0,9"},
+            {"$": "2024-01-16Z", "Rep": "0,0,2"},
+        ]}}}}
+
+        summaries = adapter._parse_forecast(data)
+
+        assert [s.date.day for s in summaries] == [15, 16, 17]
+        assert [s.max_temperature for s in summaries] == [9, 2, 4]
+
+    @pytest.mark.parametrize("rep,expected", [
+        ("0,10,2.5,270,5,1008,15,7", ("Fog", 2, "day")),
+        ("1,0,7", ("Fog", 7, "day")),
+        ("3", ("Mostly cloudy", None, "day")),
+        ("1,0,n/a,99", ("WeatherCode(99)", None, "day")),
+        ("", None),
+    ])
+    def test_parse_rep_values(self, rep, expected):
+        """Test the weather code and temperature are read from the string."""
+        from weatherbox.weather.metoffice_adapter import MetOfficeAdapter
+        adapter = MetOfficeAdapter("key", 51.5, -0.1, cache_file=None)
+
+        assert adapter._parse_rep_values(
+            rep, datetime(2024, 1, 15, 12),
+            MetOfficeAdapter._FALLBACK_WX_MAP) == expected
+
+    def test_parse_date_memoised(self):
+        """Test repeated dates reuse the parsed datetime."""
+        from weatherbox.weather.metoffice_adapter import MetOfficeAdapter
+        adapter = MetOfficeAdapter("key", 51.5, -0.1, cache_file=None)
+
+        first = adapter._parse_date("2024-01-15Z")
+
+        assert first == datetime(2024, 1, 15)
+        assert adapter._parse_date("2024-01-15Z") is first
+        assert adapter._parse_date("2024-01-15T12:00:00Z") == \
+            datetime(2024, 1, 15, 12)
+        assert adapter._parse_date("not a date") is None
+
+    def test_weather_type_map_parsed_once(self):
+        """Test the parsed code map is reused and the fallback is shared."""
+        from weatherbox.weather.metoffice_adapter import MetOfficeAdapter
+        adapter = MetOfficeAdapter("key", 51.5, -0.1, cache_file=None)
+
+        assert adapter._get_weather_type_map({}) is \
+            MetOfficeAdapter._FALLBACK_WX_MAP
+        site_rep = {"Wx": {"Param": [
+            {"name": "WeatherType", "$": "7", "desc": "Cloudy"}]}}
+        wx_map = adapter._get_weather_type_map(site_rep)
+
+        assert dict(wx_map) == {7: "Cloudy"}
+        assert adapter._get_weather_type_map({}) is wx_map
+
+
+class TestMetOfficeCache:
+    """Test the Met Office adapter reuses fresh forecasts."""
+
+    RESPONSE = {
+        "SiteRep": {
+            "Wx": {"Param": []},
+            "DV": {"Location": {"period": [
+                {"$": "2024-01-15Z", "Rep": "1,0,7"},
+            ]}},
+        }
+    }
+
+    @pytest.fixture
+    def requests_get(self, monkeypatch):
+        """Count HTTP requests and answer with a canned forecast."""
+        from unittest.mock import MagicMock
+        from weatherbox.weather import metoffice_adapter
+        get = MagicMock()
+        get.return_value.status_code = 200
+        get.return_value.headers = {"ETag": '"v1"'}
+        get.return_value.json.return_value = self.RESPONSE
+        monkeypatch.setattr(metoffice_adapter.requests.Session, "get", get)
+        # Canned responses have no raw stream; exercise the json() path
+        monkeypatch.setattr(metoffice_adapter, "ijson", None)
+        return get
+
+    @staticmethod
+    def _adapter(cache_file, **kwargs):
+        from weatherbox.weather.metoffice_adapter import MetOfficeAdapter
+        return MetOfficeAdapter(
+            "key", 51.5, -0.1, cache_file=str(cache_file), **kwargs)
+
+    def test_fetch_within_ttl_skips_request(self, requests_get, tmp_path):
+        """Test a second fetch inside the TTL reuses the forecast."""
+        adapter = self._adapter(tmp_path / "forecast.json")
+
+        first = adapter.fetch_forecast()
+        second = adapter.fetch_forecast()
+
+        assert first and second is first
+        assert requests_get.call_count == 1
+
+    def test_expired_cache_refetches(self, requests_get, tmp_path):
+        """Test a zero TTL always goes to the network."""
+        adapter = self._adapter(tmp_path / "forecast.json",
+                                cache_ttl_seconds=0)
+
+        adapter.fetch_forecast()
+        adapter.fetch_forecast()
+
+        assert requests_get.call_count == 2
+
+    def test_cache_survives_restart(self, requests_get, tmp_path):
+        """Test a new adapter loads the persisted forecast."""
+        cache_file = tmp_path / "cache" / "forecast.json"
+        fetched = self._adapter(cache_file).fetch_forecast()
+
+        restarted = self._adapter(cache_file)
+        forecast = restarted.fetch_forecast()
+
+        assert requests_get.call_count == 1
+        assert [s.to_dict() for s in forecast] == [
+            {**s.to_dict(), "period_count": 0} for s in fetched]
+
+    def test_cache_from_the_future_ignored(self, requests_get, tmp_path):
+        """Test a cache stamped ahead of the clock is not served as fresh."""
+        cache_file = tmp_path / "forecast.json"
+        self._adapter(cache_file).fetch_forecast()
+        cached = json.loads(cache_file.read_text())
+        cached["fetched_at"] = "2099-01-01T00:00:00"
+        cache_file.write_text(json.dumps(cached))
+
+        restarted = self._adapter(cache_file)
+
+        assert restarted.last_forecast is None
+
+    def test_ttl_measured_on_monotonic_clock(self, requests_get, tmp_path):
+        """Test the in-process TTL expires by monotonic age."""
+        adapter = self._adapter(tmp_path / "forecast.json")
+        adapter.fetch_forecast()
+
+        adapter._fetched_mono -= adapter.cache_ttl_seconds + 1
+        adapter.fetch_forecast()
+
+        assert requests_get.call_count == 2
+
+    def test_cache_for_other_site_ignored(self, requests_get, tmp_path):
+        """Test a cached forecast for different coordinates is not used."""
+        from weatherbox.weather.metoffice_adapter import MetOfficeAdapter
+        cache_file = tmp_path / "forecast.json"
+        self._adapter(cache_file).fetch_forecast()
+
+        other = MetOfficeAdapter(
+            "key", 55.9, -3.2, cache_file=str(cache_file))
+
+        assert other.last_forecast is None
+
+    def test_revalidates_with_etag(self, requests_get, tmp_path):
+        """Test an expired forecast is revalidated and kept on 304."""
+        adapter = self._adapter(tmp_path / "forecast.json",
+                                cache_ttl_seconds=0)
+        first = adapter.fetch_forecast()
+        requests_get.return_value.status_code = 304
+        requests_get.return_value.json.side_effect = AssertionError("parsed")
+
+        assert adapter.fetch_forecast() is first
+        headers = requests_get.call_args.kwargs["headers"]
+        assert headers == {"If-None-Match": '"v1"'}
+
+    def test_fetches_share_one_session(self, requests_get, tmp_path):
+        """Test requests go through the adapter's pooled session."""
+        adapter = self._adapter(tmp_path / "forecast.json",
+                                cache_ttl_seconds=0)
+        adapter.fetch_forecast()
+        adapter.fetch_forecast()
+
+        assert requests_get.call_count == 2
+        pool = adapter._session.get_adapter("https://example.invalid")
+        assert pool._pool_maxsize == 2
+        assert adapter._session.headers["Accept"] == "application/json"
+        adapter.close()
+
+    def test_stream_parse_keeps_needed_sections(self):
+        """Test the ijson path matches a full json parse of the response."""
+        pytest.importorskip("ijson")
+        import io
+        from weatherbox.weather.metoffice_adapter import (
+            MetOfficeAdapter, _stream_forecast)
+        response = {
+            "SiteRep": {
+                "Wx": {"Param": [
+                    {"name": "WeatherType", "$": "7", "desc": "Cloudy"}]},
+                "DV": {
+                    "dataDate": "2024-01-15T09:00:00Z",
+                    "Location": {"name": "Test", "period": [
+                        {"$": "2024-01-15Z", "Rep": "7,0,5"},
+                        {"$": "2024-01-16Z", "Rep": "7,0,3"},
+                    ]},
+                },
+            }
+        }
+        adapter = MetOfficeAdapter("key", 51.5, -0.1, cache_file=None)
+
+        data = _stream_forecast(io.BytesIO(json.dumps(response).encode()))
+
+        assert "dataDate" not in data["SiteRep"]["DV"]
+        assert [s.to_dict() for s in adapter._parse_forecast(data)] == [
+            s.to_dict() for s in adapter._parse_forecast(response)]
+
+    def test_stream_read_error_returns_none(self, monkeypatch, tmp_path):
+        """Test a connection dropped mid-stream is reported as None."""
+        pytest.importorskip("ijson")
+        from unittest.mock import MagicMock
+        from urllib3.exceptions import ReadTimeoutError
+        from weatherbox.weather import metoffice_adapter
+        body = json.dumps(self.RESPONSE).encode()
+
+        class DroppedStream:
+            """Serves the first bytes of the body, then times out."""
+            decode_content = False
+
+            def __init__(self):
+                self.sent = False
+
+            def read(self, size=-1):
+                if self.sent:
+                    raise ReadTimeoutError(None, None, "Read timed out.")
+                self.sent = True
+                return body[:20]
+
+        get = MagicMock()
+        get.return_value.status_code = 200
+        get.return_value.raw = DroppedStream()
+        monkeypatch.setattr(metoffice_adapter.requests.Session, "get", get)
+        adapter = self._adapter(tmp_path / "forecast.json")
+
+        assert adapter.fetch_forecast() is None
+        assert get.return_value.raw.sent
+
+    def test_first_fetch_is_unconditional(self, requests_get, tmp_path):
+        """Test no validators are sent before a forecast is held."""
+        self._adapter(tmp_path / "forecast.json").fetch_forecast()
+
+        assert requests_get.call_args.kwargs["headers"] == {}
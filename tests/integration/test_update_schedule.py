@@ -128,6 +128,27 @@ class TestUpdateSchedule:
         assert interval == timedelta(minutes=60)
         assert scheduler.next_update_at == datetime(2024, 1, 16, 0, 30)
 
+    def test_brightness_held_until_night_transition(self, service):
+        """Test brightness is only re-evaluated at the night boundary."""
+        with freeze_time("2024-01-15 21:50:00") as frozen:
+            service.update_brightness()
+            assert service.display.get_brightness() == 200
+
+            # Out-of-band change is not picked up before the boundary...
+            service.brightness.set_day_brightness(120)
+            frozen.tick(5 * 60)
+            service.update_brightness()
+            assert service.display.get_brightness() == 200
+
+            # ...unless forced
+            service.update_brightness(force=True)
+            assert service.display.get_brightness() == 120
+
+            # Crossing 22:00 triggers night brightness
+            frozen.tick(5 * 60)
+            service.update_brightness()
+            assert service.display.get_brightness() == 50
+
     @freeze_time("2024-01-15 06:00:00")
     def test_dawn_transition_day_to_day(self, service):
         """Test transition at dawn stays daytime."""
@@ -0,0 +1,256 @@
+"""
+Unit tests for access point manager.
+Uses a fake subprocess.run to record the commands issued.
+"""
+
+import errno
+import os
+import signal
+import subprocess
+import sys
+import types
+
+import pytest
+
+from weatherbox.provisioning.ap_manager import AccessPointManager
+
+
+@pytest.fixture
+def commands(monkeypatch):
+    """Record subprocess.run calls and report success."""
+    calls = []
+
+    def fake_run(args, **kwargs):
+        calls.append(args)
+        return subprocess.CompletedProcess(args, 0, b"", b"")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    return calls
+
+
+class TestNetworkManagerProbe:
+    """Test NetworkManager availability detection."""
+
+    def test_probe_runs_once(self, commands):
+        """Test systemctl is only queried on the first check."""
+        manager = AccessPointManager()
+
+        assert manager._use_networkmanager() is True
+        assert manager._use_networkmanager() is True
+
+        assert commands == [['systemctl', 'is-active', 'NetworkManager']]
+
+    def test_probe_failure_cached(self, monkeypatch):
+        """Test a failed probe is remembered as unavailable."""
+        calls = []
+
+        def failing_run(args, **kwargs):
+            calls.append(args)
+            raise FileNotFoundError(args[0])
+
+        monkeypatch.setattr(subprocess, "run", failing_run)
+        manager = AccessPointManager()
+
+        assert manager._use_networkmanager() is False
+        assert manager._use_networkmanager() is False
+        assert len(calls) == 1
+
+
+class FakeNetlinkError(Exception):
+    """Stand-in for pyroute2's NetlinkError."""
+
+    def __init__(self, code):
+        super().__init__(code)
+        self.code = code
+
+
+class FakeIPRoute:
+    """Records netlink link/addr requests."""
+
+    calls = []
+    addr_error = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def link_lookup(self, ifname):
+        return [3] if ifname == "wlan0" else []
+
+    def link(self, cmd, **kwargs):
+        self.calls.append(('link', cmd, kwargs))
+
+    def addr(self, cmd, **kwargs):
+        self.calls.append(('addr', cmd, kwargs))
+        if self.addr_error is not None:
+            raise FakeNetlinkError(self.addr_error)
+
+
+@pytest.fixture
+def fake_pyroute2(monkeypatch):
+    """Install a fake pyroute2 exposing IPRoute and NetlinkError."""
+    root = types.ModuleType("pyroute2")
+    root.IPRoute = FakeIPRoute
+    exceptions = types.ModuleType("pyroute2.netlink.exceptions")
+    exceptions.NetlinkError = FakeNetlinkError
+    monkeypatch.setitem(sys.modules, "pyroute2", root)
+    monkeypatch.setitem(sys.modules, "pyroute2.netlink", types.ModuleType(
+        "pyroute2.netlink"))
+    monkeypatch.setitem(sys.modules, "pyroute2.netlink.exceptions",
+                        exceptions)
+    monkeypatch.setattr(FakeIPRoute, "calls", [])
+    monkeypatch.setattr(FakeIPRoute, "addr_error", None)
+    return FakeIPRoute
+
+
+class TestConfigureInterface:
+    """Test interface bring-up and addressing."""
+
+    def test_ip_fallback_without_pyroute2(self, commands, monkeypatch):
+        """Test the ip tool is used when pyroute2 is missing."""
+        monkeypatch.setitem(sys.modules, "pyroute2", None)
+
+        assert AccessPointManager()._configure_interface() is True
+
+        assert commands == [
+            ['ip', 'link', 'set', 'wlan0', 'up'],
+            ['ip', 'addr', 'add', '192.168.4.1/24', 'dev', 'wlan0'],
+        ]
+
+    def test_netlink_with_pyroute2(self, commands, fake_pyroute2):
+        """Test netlink requests replace the ip subprocesses."""
+        assert AccessPointManager()._configure_interface() is True
+
+        assert commands == []
+        assert fake_pyroute2.calls == [
+            ('link', 'set', {'index': 3, 'state': 'up'}),
+            ('addr', 'add', {'index': 3, 'address': '192.168.4.1',
+                             'prefixlen': 24}),
+        ]
+
+    def test_existing_address_is_not_an_error(self, fake_pyroute2):
+        """Test EEXIST when adding the address is tolerated."""
+        fake_pyroute2.addr_error = errno.EEXIST
+
+        assert AccessPointManager()._configure_interface() is True
+
+    def test_missing_interface(self, fake_pyroute2):
+        """Test an unknown interface fails bring-up."""
+        manager = AccessPointManager(interface="wlan9")
+
+        assert manager._configure_interface() is False
+
+
+class TestHostapdConfig:
+    """Test hostapd configuration writes."""
+
+    @pytest.fixture
+    def manager(self, tmp_path, monkeypatch):
+        """Create manager writing its hostapd config to a temp file."""
+        monkeypatch.setattr(AccessPointManager, "HOSTAPD_CONFIG_PATH",
+                            str(tmp_path / "hostapd.conf"))
+        return AccessPointManager(ssid="test-ap")
+
+    def test_config_templates(self):
+        """Test open and WPA2 configs are filled from the templates."""
+        open_conf = AccessPointManager(ssid="50%-off")._create_hostapd_config()
+        wpa_conf = AccessPointManager(
+            mode="wpa2", psk="secret")._create_hostapd_config()
+
+        assert "ssid=50%-off\n" in open_conf
+        assert open_conf.endswith("ignore_broadcast_ssid=0\nwpa=0\n")
+        assert wpa_conf.startswith("interface=wlan0\ndriver=nl80211\n")
+        assert wpa_conf.endswith("wpa_passphrase=secret\n")
+
+    def test_config_written(self, manager):
+        """Test the config is written with owner-only permissions."""
+        config = manager._create_hostapd_config()
+
+        assert manager._write_hostapd_config(config) is True
+
+        path = manager.HOSTAPD_CONFIG_PATH
+        with open(path) as f:
+            assert f.read() == config
+        assert os.stat(path).st_mode & 0o777 == 0o600
+
+    def test_unchanged_config_not_rewritten(self, manager, monkeypatch):
+        """Test writing an identical config skips the file write."""
+        config = manager._create_hostapd_config()
+        manager._write_hostapd_config(config)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("config rewritten")
+        monkeypatch.setattr(os, "open", fail)
+
+        assert manager._write_hostapd_config(config) is True
+
+    def test_changed_config_rewritten(self, manager):
+        """Test a changed config replaces the file contents."""
+        manager._write_hostapd_config(manager._create_hostapd_config())
+        manager.mode = "wpa2"
+        config = manager._create_hostapd_config()
+
+        assert manager._write_hostapd_config(config) is True
+
+        with open(manager.HOSTAPD_CONFIG_PATH) as f:
+            assert "wpa=2" in f.read()
+
+
+class TestStop:
+    """Test stopping the AP daemons."""
+
+    @pytest.fixture
+    def manager(self, tmp_path, monkeypatch):
+        """Create manager with PID files in a temp dir."""
+        monkeypatch.setattr(AccessPointManager, "HOSTAPD_PID_PATH",
+                            str(tmp_path / "hostapd.pid"))
+        monkeypatch.setattr(AccessPointManager, "DNSMASQ_PID_PATH",
+                            str(tmp_path / "dnsmasq.pid"))
+        return AccessPointManager()
+
+    def test_stop_signals_recorded_pids(
+            self, manager, commands, monkeypatch):
+        """Test daemons are sent SIGTERM instead of running killall."""
+        killed = []
+        monkeypatch.setattr(os, "kill", lambda pid, sig: killed.append(
+            (pid, sig)))
+        with open(manager.HOSTAPD_PID_PATH, "w") as f:
+            f.write("1234\n")
+
+        assert manager.stop() is True
+
+        assert killed == [(1234, signal.SIGTERM)]
+        assert not os.path.exists(manager.HOSTAPD_PID_PATH)
+        assert commands == [['ip', 'link', 'set', 'wlan0', 'down']]
+
+    def test_stop_ignores_exited_daemon(self, manager, commands, monkeypatch):
+        """Test a stale PID file is cleaned up without error."""
+        def gone(pid, sig):
+            raise ProcessLookupError(pid)
+        monkeypatch.setattr(os, "kill", gone)
+        with open(manager.DNSMASQ_PID_PATH, "w") as f:
+            f.write("99999\n")
+
+        assert manager.stop() is True
+        assert not os.path.exists(manager.DNSMASQ_PID_PATH)
+
+    def test_stop_continues_after_permission_error(
+            self, manager, commands, monkeypatch):
+        """Test a daemon we may not signal doesn't block the others."""
+        killed = []
+
+        def kill(pid, sig):
+            if pid == 1234:
+                raise PermissionError(1, "Operation not permitted")
+            killed.append(pid)
+        monkeypatch.setattr(os, "kill", kill)
+        for path, pid in ((manager.HOSTAPD_PID_PATH, 1234),
+                          (manager.DNSMASQ_PID_PATH, 5678)):
+            with open(path, "w") as f:
+                f.write(f"{pid}\n")
+
+        assert manager.stop() is True
+        assert killed == [5678]
+        assert commands == [['ip', 'link', 'set', 'wlan0', 'down']]
@@ -0,0 +1,127 @@
+"""
+Unit tests for boot-time provisioning.
+Tests connection retries, backoff and auth failure handling.
+"""
+
+import asyncio
+import sys
+
+import pytest
+
+from weatherbox.provisioning import boot
+from weatherbox.provisioning.boot import BootProvisioner, ConnectionResult
+
+
+class ScriptedAdapter:
+    """Adapter whose connect() plays back a list of outcomes."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def connect(self, ssid, password, timeout_seconds=30):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff delays instead of sleeping."""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+    monkeypatch.setattr(boot.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+def make_provisioner(outcomes):
+    """Create a provisioner without touching real adapters or files."""
+    provisioner = BootProvisioner.__new__(BootProvisioner)
+    provisioner.base_backoff = 1.0
+    provisioner.max_backoff = 30.0
+    provisioner.wifi_adapter = ScriptedAdapter(outcomes)
+    return provisioner
+
+
+def attempt(provisioner, max_attempts=3):
+    return asyncio.run(provisioner._attempt_connection(
+        "HomeNet", "password123", max_attempts=max_attempts))
+
+
+class TestAttemptConnection:
+    """Test the retry loop around adapter.connect()."""
+
+    def test_connects_after_retry(self, sleeps):
+        """Test a transient failure is retried after a backoff."""
+        provisioner = make_provisioner([False, True])
+
+        assert attempt(provisioner) is ConnectionResult.CONNECTED
+        assert len(sleeps) == 1
+
+    def test_no_sleep_after_final_attempt(self, sleeps):
+        """Test giving up does not wait out one more backoff."""
+        provisioner = make_provisioner([False, RuntimeError("timeout"), False])
+
+        assert attempt(provisioner) is ConnectionResult.FAILED
+        assert provisioner.wifi_adapter.calls == 3
+        assert len(sleeps) == 2
+
+    def test_auth_failure_stops_retries(self, sleeps):
+        """Test a rejected password is not retried."""
+        provisioner = make_provisioner(
+            [boot.WifiAuthError("bad psk"), True, True])
+
+        assert attempt(provisioner) is ConnectionResult.AUTH_FAILED
+        assert provisioner.wifi_adapter.calls == 1
+        assert sleeps == []
+
+    def test_backoff_grows_exponentially(self, sleeps):
+        """Test retry delays double, with at most 10% jitter."""
+        provisioner = make_provisioner([False] * 4)
+
+        attempt(provisioner, max_attempts=4)
+
+        for delay, base in zip(sleeps, (1.0, 2.0, 4.0)):
+            assert base <= delay <= base * 1.1
+
+
+class TestProvision:
+    """Test the overall boot provisioning flow."""
+
+    class StoredCredentials:
+        def load_credentials(self):
+            return "HomeNet", "password123"
+
+    def test_ap_manager_prefetched_during_retries(self, sleeps, monkeypatch):
+        """Test the AP module is imported before the fallback needs it."""
+        monkeypatch.delitem(sys.modules, boot._AP_MANAGER_MODULE,
+                            raising=False)
+        provisioner = make_provisioner([False, False, False])
+        provisioner.credential_store = self.StoredCredentials()
+        provisioner.logged_in = False
+        loaded = []
+        monkeypatch.setattr(provisioner, "_start_ap", lambda: loaded.append(
+            boot._AP_MANAGER_MODULE in sys.modules) or True)
+
+        assert asyncio.run(provisioner.provision()) is True
+
+        assert loaded == [True]
+        assert provisioner.connection_result is ConnectionResult.FAILED
+
+    def test_no_prefetch_when_first_attempt_connects(
+            self, sleeps, monkeypatch):
+        """Test a successful boot never imports the AP manager."""
+        monkeypatch.delitem(sys.modules, boot._AP_MANAGER_MODULE,
+                            raising=False)
+        provisioner = make_provisioner([True])
+        provisioner.credential_store = self.StoredCredentials()
+        provisioner.logged_in = False
+
+        assert asyncio.run(provisioner.provision()) is True
+
+        assert boot._AP_MANAGER_MODULE not in sys.modules
+        assert provisioner.connection_result is ConnectionResult.CONNECTED
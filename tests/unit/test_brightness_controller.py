@@ -3,6 +3,8 @@ Unit tests for brightness controller module.
 Tests hardware caps, night mode transitions, and sensor integration.
 """
 
+import time
+
 import pytest
 from freezegun import freeze_time
 
@@ -77,6 +79,26 @@ class TestBrightnessController:
         """Test night mode detection at dawn."""
         assert controller.is_night_mode() is False
 
+    def test_is_night_mode_explicit_datetime(self, controller):
+        """Test night mode detection for explicitly passed times."""
+        from datetime import datetime
+
+        assert controller.is_night_mode(datetime(2024, 1, 15, 21, 59, 59)) \
+            is False
+        assert controller.is_night_mode(datetime(2024, 1, 15, 22, 0)) is True
+        assert controller.is_night_mode(datetime(2024, 1, 16, 5, 59, 59)) \
+            is True
+        assert controller.is_night_mode(datetime(2024, 1, 16, 6, 0)) is False
+
+    def test_is_night_mode_recomputed_on_new_minute(self, controller):
+        """Test cached night mode decision refreshes at minute boundary."""
+        with freeze_time("2024-01-15 21:59:30") as frozen:
+            assert controller.is_night_mode() is False
+            frozen.move_to("2024-01-15 21:59:59")
+            assert controller.is_night_mode() is False
+            frozen.move_to("2024-01-15 22:00:00")
+            assert controller.is_night_mode() is True
+
     @freeze_time("2024-01-15 12:00:00")
     def test_calculate_brightness_daytime(self, controller):
         """Test brightness calculation during daytime."""
@@ -138,6 +160,88 @@ class TestBrightnessController:
         assert brightness == 80  # Uses sensor value
         assert controller.last_sensor_value == 80
 
+    @freeze_time("2024-01-15 12:00:00")
+    def test_sensor_brightness_capped_by_max(self, controller):
+        """Test a bright sensor reading still respects max_brightness."""
+        sensor = MockSensorAdapter(brightness_value=250)
+        sensor.initialize()
+        controller.set_sensor_adapter(sensor)
+        controller.day_brightness = 200
+        controller.max_brightness = 100
+
+        assert controller.calculate_brightness() == 100
+
+    def test_sensor_reads_throttled_to_poll_interval(self, controller):
+        """Test sensor is not re-read until the poll interval elapses."""
+        sensor = MockSensorAdapter(brightness_value=80)
+        sensor.initialize()
+        controller.set_sensor_adapter(sensor)
+
+        with freeze_time("2024-01-15 12:00:00") as frozen:
+            assert controller.calculate_brightness() == 80
+
+            sensor.set_brightness(40)
+            frozen.tick(1)
+            assert controller.calculate_brightness() == 80
+
+            frozen.tick(2)
+            assert controller.calculate_brightness() == 40
+
+    def test_sensor_reads_shared_within_bucket(self, controller):
+        """Test callers within one poll bucket share a single read."""
+        reads = []
+
+        class CountingSensor:
+            def read_ambient_brightness(self):
+                reads.append(1)
+                return 90
+
+        controller.set_sensor_adapter(CountingSensor())
+
+        with freeze_time("2024-01-15 12:00:00") as frozen:
+            for _ in range(5):
+                controller.calculate_brightness()
+            assert len(reads) == 1
+
+            frozen.tick(controller.DEFAULT_SENSOR_POLL_SECONDS)
+            controller.calculate_brightness()
+            assert len(reads) == 2
+
+            # Swapping adapters invalidates the memoized reading
+            controller.set_sensor_adapter(CountingSensor())
+            controller.calculate_brightness()
+            assert len(reads) == 3
+
+    def test_sensor_poll_interval_zero_reads_every_call(self, controller):
+        """Test a zero poll interval disables sensor read caching."""
+        sensor = MockSensorAdapter(brightness_value=80)
+        sensor.initialize()
+        controller.set_sensor_adapter(sensor)
+        controller.set_sensor_poll_interval(0)
+
+        with freeze_time("2024-01-15 12:00:00"):
+            assert controller.calculate_brightness() == 80
+            sensor.set_brightness(40)
+            assert controller.calculate_brightness() == 40
+
+    @freeze_time("2024-01-15 12:00:00")
+    def test_sensor_jitter_within_hysteresis_ignored(self, controller):
+        """Test small sensor changes do not alter brightness."""
+        sensor = MockSensorAdapter(brightness_value=80)
+        sensor.initialize()
+        controller.set_sensor_adapter(sensor)
+        controller.set_sensor_poll_interval(0)
+
+        assert controller.calculate_brightness() == 80
+
+        sensor.set_brightness(75)
+        assert controller.calculate_brightness() == 80
+        assert controller.last_sensor_value == 80
+
+        sensor.set_brightness(70)
+        assert controller.calculate_brightness() == 70
+        assert controller.last_sensor_value == 70
+
     def test_has_sensor_false(self, controller):
         """Test sensor detection when not installed."""
         assert controller.has_sensor() is False
@@ -203,6 +307,47 @@ class TestBrightnessController:
             status = controller.get_status()
             assert status['is_night_mode'] is True
 
+    def test_next_transition_at_night_boundary(self, controller):
+        """Test next transition is the start or end of night mode."""
+        with freeze_time("2024-01-15 21:00:00"):
+            wait = controller.next_transition_monotonic() - time.monotonic()
+            assert wait == pytest.approx(3600)
+
+        with freeze_time("2024-01-16 05:30:00"):
+            wait = controller.next_transition_monotonic() - time.monotonic()
+            assert wait == pytest.approx(1800)
+
+    def test_next_transition_capped_and_sensor_polls(self, controller):
+        """Test lookahead is capped and sensors bring it forward."""
+        with freeze_time("2024-01-15 12:00:00"):
+            wait = controller.next_transition_monotonic() - time.monotonic()
+            assert wait == pytest.approx(
+                controller.MAX_TRANSITION_WAIT_SECONDS)
+
+            sensor = MockSensorAdapter(brightness_value=100)
+            sensor.initialize()
+            controller.set_sensor_adapter(sensor)
+            assert controller.next_transition_monotonic() == \
+                pytest.approx(time.monotonic())
+
+            controller.calculate_brightness()
+            wait = controller.next_transition_monotonic() - time.monotonic()
+            assert wait == pytest.approx(
+                controller.DEFAULT_SENSOR_POLL_SECONDS)
+
+    def test_get_status_reuses_recent_mode(self, controller):
+        """Test status reports the mode from the last calculation."""
+        with freeze_time("2024-01-15 21:59:50") as frozen:
+            controller.calculate_brightness()
+
+            # Crossing into night within the reuse window keeps the
+            # mode seen by calculate_brightness
+            frozen.tick(30)
+            assert controller.get_status()['is_night_mode'] is False
+
+            frozen.tick(60)
+            assert controller.get_status()['is_night_mode'] is True
+
     def test_default_day_brightness_uses_max(self):
         """Test that day_brightness defaults to max_brightness when None."""
         controller = BrightnessController(
@@ -0,0 +1,49 @@
+"""
+Unit tests for brightness numeric kernels.
+Tests fixed-point ADC normalization and brightness combination.
+"""
+
+import pytest
+
+from weatherbox.brightness import _kernel
+
+
+class TestNormalizeAdc:
+    """Test fixed-point ADC to 0-255 mapping."""
+
+    @pytest.fixture
+    def scale(self):
+        """Scale factor for a 1000-65000 ADC window."""
+        return _kernel.adc_scale_q16(65000 - 1000)
+
+    def test_endpoints(self, scale):
+        """Test readings outside the window saturate."""
+        assert _kernel.normalize_adc(0, 1000, 65000, scale, False) == 0
+        assert _kernel.normalize_adc(1000, 1000, 65000, scale, False) == 0
+        assert _kernel.normalize_adc(65000, 1000, 65000, scale, False) == 255
+        assert _kernel.normalize_adc(70000, 1000, 65000, scale, False) == 255
+
+    def test_matches_float_interpolation(self, scale):
+        """Test fixed-point result stays within 1 of float math."""
+        for raw in range(1000, 65000, 997):
+            expected = int((raw - 1000) * 255 / 64000)
+            actual = _kernel.normalize_adc(raw, 1000, 65000, scale, False)
+            assert abs(actual - expected) <= 1
+
+    def test_invert(self, scale):
+        """Test inverted sensors map darkness to 255."""
+        assert _kernel.normalize_adc(0, 1000, 65000, scale, True) == 255
+
+    def test_empty_range(self):
+        """Test a zero-width ADC window does not divide by zero."""
+        assert _kernel.adc_scale_q16(0) == 0
+
+
+class TestCombine:
+    """Test base/sensor/cap combination."""
+
+    def test_takes_minimum(self):
+        """Test result is the minimum of base, sensor and cap."""
+        assert _kernel.combine(150, 80, 200) == 80
+        assert _kernel.combine(150, 220, 200) == 150
+        assert _kernel.combine(250, 240, 200) == 200
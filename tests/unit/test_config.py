@@ -0,0 +1,104 @@
+"""
+Unit tests for config module.
+Tests YAML loading, parsed-config caching and WiFi credential writes.
+"""
+
+import os
+
+import pytest
+
+from weatherbox.config import (
+    load_config, save_wifi_credentials, update_config)
+
+
+class TestLoadConfig:
+    """Test load_config parsing and caching."""
+
+    @pytest.fixture
+    def cfg_path(self, tmp_path):
+        """Create a small config file."""
+        path = tmp_path / "config.yaml"
+        path.write_text("display:\n  brightness: 120\n", encoding="utf-8")
+        return str(path)
+
+    def test_missing_file_returns_empty(self, tmp_path):
+        """Test nonexistent config loads as empty dict."""
+        assert load_config(str(tmp_path / "missing.yaml")) == {}
+
+    def test_cached_result_is_not_shared(self, cfg_path):
+        """Test callers cannot mutate the cached config."""
+        cfg = load_config(cfg_path)
+        cfg['display']['brightness'] = 0
+
+        assert load_config(cfg_path)['display']['brightness'] == 120
+
+    def test_reloads_when_file_changes(self, cfg_path):
+        """Test cache is invalidated by a rewrite of the file."""
+        assert load_config(cfg_path)['display']['brightness'] == 120
+
+        with open(cfg_path, 'w', encoding='utf-8') as fh:
+            fh.write("display:\n  brightness: 30\n")
+        st = os.stat(cfg_path)
+        os.utime(cfg_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+
+        assert load_config(cfg_path)['display']['brightness'] == 30
+
+    def test_save_wifi_credentials_round_trip(self, cfg_path):
+        """Test saved WiFi credentials are visible to the next load."""
+        save_wifi_credentials("HomeNet", "homepass123", path=cfg_path)
+
+        cfg = load_config(cfg_path)
+        assert cfg['wifi'] == {'ssid': "HomeNet", 'password': "homepass123"}
+        assert cfg['display']['brightness'] == 120
+
+    def test_save_wifi_credentials_uses_given_cfg(self, cfg_path):
+        """Test a caller-supplied cfg is written without re-loading."""
+        cfg = {'display': {'brightness': 50}}
+        save_wifi_credentials("HomeNet", "pw", path=cfg_path, cfg=cfg)
+
+        assert load_config(cfg_path) == {
+            'display': {'brightness': 50},
+            'wifi': {'ssid': "HomeNet", 'password': "pw"},
+        }
+
+    def test_write_is_atomic_and_keeps_mode(self, cfg_path):
+        """Test writes leave no temp files and preserve permissions."""
+        os.chmod(cfg_path, 0o640)
+
+        save_wifi_credentials("HomeNet", "pw", path=cfg_path)
+
+        assert os.listdir(os.path.dirname(cfg_path)) == ["config.yaml"]
+        assert os.stat(cfg_path).st_mode & 0o777 == 0o640
+
+    def test_failed_write_closes_temp_file(self, cfg_path, monkeypatch):
+        """Test a failure copying the mode leaks neither fd nor temp file."""
+        from weatherbox import config
+        real_stat = os.stat
+        opened = set(os.listdir('/proc/self/fd'))
+
+        def denied_stat(path, *args, **kwargs):
+            if os.fspath(path) == os.path.abspath(cfg_path):
+                raise PermissionError(13, "Permission denied", path)
+            return real_stat(path, *args, **kwargs)
+        monkeypatch.setattr(config.os, "stat", denied_stat)
+
+        with pytest.raises(PermissionError):
+            save_wifi_credentials("HomeNet", "pw", path=cfg_path, cfg={})
+        monkeypatch.undo()
+
+        assert set(os.listdir('/proc/self/fd')) <= opened
+        assert os.listdir(os.path.dirname(cfg_path)) == ["config.yaml"]
+
+
+class TestUpdateConfig:
+    """Test update_config read-modify-write."""
+
+    def test_deep_merges_patch(self, tmp_path):
+        """Test nested keys are merged rather than replaced."""
+        path = str(tmp_path / "config.yaml")
+        update_config({'display': {'brightness': 80, 'matrices': 4}}, path)
+
+        cfg = update_config({'display': {'brightness': 20}}, path)
+
+        assert cfg == {'display': {'brightness': 20, 'matrices': 4}}
+        assert load_config(path) == cfg
@@ -0,0 +1,228 @@
+"""
+Unit tests for display adapter module.
+Tests bitmap storage and the mock display adapter used in CI.
+"""
+
+import pytest
+
+from weatherbox.display.adapter import Bitmap
+
+
+class TestBitmap:
+    """Test Bitmap pixel storage."""
+
+    def test_default_bitmap_is_blank(self):
+        """Test new bitmap has 64 zeroed pixels."""
+        bitmap = Bitmap()
+
+        assert len(bitmap.data) == 64
+        assert bitmap.tobytes() == bytes(64)
+
+    def test_set_and_get_pixel(self):
+        """Test pixel round trip."""
+        bitmap = Bitmap()
+        bitmap.set_pixel(3, 5, 200)
+
+        assert bitmap.get_pixel(3, 5) == 200
+        assert bitmap.data[5 * 8 + 3] == 200
+
+    def test_set_pixel_clamps_value(self):
+        """Test out-of-range pixel values are clamped to 0-255."""
+        bitmap = Bitmap()
+        bitmap.set_pixel(0, 0, 300)
+        bitmap.set_pixel(1, 0, -5)
+
+        assert bitmap.get_pixel(0, 0) == 255
+        assert bitmap.get_pixel(1, 0) == 0
+
+    def test_out_of_bounds_pixels_ignored(self):
+        """Test out-of-bounds coordinates are ignored."""
+        bitmap = Bitmap()
+        bitmap.set_pixel(8, 0, 255)
+
+        assert bitmap.get_pixel(8, 0) == 0
+        assert bitmap.tobytes() == bytes(64)
+
+    def test_clear_is_in_place(self):
+        """Test clear zeroes the existing buffer."""
+        bitmap = Bitmap()
+        buffer = bitmap.data
+        bitmap.set_pixel(2, 2, 99)
+
+        bitmap.clear()
+
+        assert bitmap.data is buffer
+        assert bitmap.tobytes() == bytes(64)
+
+    def test_from_buffer(self):
+        """Test creating a bitmap from raw bytes."""
+        raw = bytes(range(64))
+        bitmap = Bitmap.from_buffer(raw)
+
+        assert bitmap.get_pixel(7, 7) == 63
+        assert bitmap.tobytes() == raw
+
+    def test_from_buffer_wrong_length(self):
+        """Test buffer length must match bitmap size."""
+        with pytest.raises(ValueError):
+            Bitmap.from_buffer(bytes(10))
+
+    def test_repr_counts_lit_pixels(self):
+        """Test repr reports number of lit pixels."""
+        bitmap = Bitmap()
+        bitmap.set_pixel(0, 0, 1)
+        bitmap.set_pixel(1, 1, 255)
+
+        assert repr(bitmap) == "Bitmap(8x8, 2 pixels)"
+
+
+class TestPackedFrames:
+    """Test 1-bit-per-pixel frame packing."""
+
+    def test_pack_row_bits(self):
+        """Test bit x of each row byte maps to column x."""
+        bitmap = Bitmap()
+        bitmap.set_pixel(0, 0, 255)
+        bitmap.set_pixel(7, 0, 1)
+        bitmap.set_pixel(3, 2, 128)
+
+        packed = bitmap.pack()
+
+        assert packed[0] == 0b10000001
+        assert packed[1] == 0
+        assert packed[2] == 0b00001000
+
+    def test_pack_matches_icon_encoding(self):
+        """Test packing matches the led8x8icons 64-bit layout."""
+        from weatherbox.led8x8icons import LED8x8ICONS
+
+        value = LED8x8ICONS['SUNNY']
+        bitmap = Bitmap()
+        for y in range(8):
+            for x in range(8):
+                if (value >> (8 * y + x)) & 1:
+                    bitmap.set_pixel(x, y, 255)
+
+        assert int.from_bytes(bitmap.pack(), 'little') == value
+
+    def test_unpack_round_trip(self):
+        """Test unpack restores lit pixels at full intensity."""
+        bitmap = Bitmap()
+        bitmap.set_pixel(1, 1, 40)
+        bitmap.set_pixel(6, 7, 255)
+
+        restored = Bitmap.unpack(bitmap.pack())
+
+        assert restored.get_pixel(1, 1) == 255
+        assert restored.get_pixel(6, 7) == 255
+        assert repr(restored) == "Bitmap(8x8, 2 pixels)"
+
+    def test_pack_frame_into_shared_buffer(self):
+        """Test pack_frame fills one contiguous buffer."""
+        from weatherbox.display.adapter import pack_frame
+
+        bitmaps = [Bitmap() for _ in range(4)]
+        bitmaps[2].set_pixel(0, 0, 255)
+        out = bytearray(32)
+
+        assert pack_frame(bitmaps, out) is out
+        assert out[16] == 1
+        assert out.count(0) == 31
+
+
+class TestMockDisplayAdapter:
+    """Test MockDisplayAdapter render behaviour."""
+
+    @pytest.fixture
+    def display(self):
+        """Create initialized mock display."""
+        from weatherbox.display.adapter import MockDisplayAdapter
+
+        adapter = MockDisplayAdapter(matrix_count=4)
+        adapter.initialize()
+        return adapter
+
+    def test_render_all_accepts_packed_frame(self, display):
+        """Test render_all accepts a packed frame buffer."""
+        packed = bytearray(32)
+        packed[8] = 0b00000010  # Matrix 1, row 0, column 1
+
+        assert display.render_all(bytes(packed)) is True
+        assert display.get_frame(1).get_pixel(1, 0) == 255
+        assert display.get_packed_frame() == bytes(packed)
+
+    def test_render_all_rejects_wrong_packed_length(self, display):
+        """Test packed frames must cover every matrix."""
+        assert display.render_all(bytes(16)) is False
+
+    def test_render_all_bitmaps_updates_packed_frame(self, display):
+        """Test rendering bitmaps also maintains the packed frame."""
+        bitmaps = [Bitmap() for _ in range(4)]
+        bitmaps[3].set_pixel(7, 7, 255)
+
+        assert display.render_all(bitmaps) is True
+        assert display.get_packed_frame()[31] == 0b10000000
+
+    def test_frames_updated_in_place(self, display):
+        """Test held frame references observe renders and clears."""
+        frame = display.get_frame(0)
+        source = Bitmap()
+        source.set_pixel(2, 2, 90)
+
+        display.render_frame(0, source)
+        assert display.get_frame(0) is frame
+        assert frame.get_pixel(2, 2) == 90
+        assert display.get_packed_frame()[2] == 0b00000100
+
+        # Later edits to the source bitmap do not leak into the display
+        source.set_pixel(2, 2, 10)
+        assert frame.get_pixel(2, 2) == 90
+
+        display.clear_all()
+        assert display.get_frame(0) is frame
+        assert frame.get_pixel(2, 2) == 0
+        assert display.get_packed_frame() == bytes(32)
+
+
+class TestMonoBitmap:
+    """Test packed 64-bit monochrome bitmaps."""
+
+    def test_set_get_clear(self):
+        """Test pixel writes map onto single bits."""
+        from weatherbox.display.adapter import MonoBitmap
+
+        bitmap = MonoBitmap()
+        bitmap.set_pixel(3, 2, 100)
+        bitmap.set_pixel(0, 0, 255)
+
+        assert bitmap.bits == (1 << 19) | 1
+        assert bitmap.get_pixel(3, 2) == 255
+        assert bitmap.get_pixel(4, 2) == 0
+        assert repr(bitmap) == "MonoBitmap(8x8, 2 pixels)"
+
+        bitmap.set_pixel(3, 2, 0)
+        assert bitmap.bits == 1
+
+        bitmap.clear()
+        assert bitmap.bits == 0
+
+    def test_matches_expanded_bitmap(self):
+        """Test MonoBitmap packs and expands like an equivalent Bitmap."""
+        from weatherbox.display.adapter import MonoBitmap
+        from weatherbox.led8x8icons import LED8x8ICONS
+
+        mono = MonoBitmap(LED8x8ICONS['SUNNY'])
+        full = Bitmap.unpack(mono.pack())
+
+        assert mono.data == full.data
+        assert mono.pack() == full.pack()
+
+    def test_packs_into_frame(self):
+        """Test MonoBitmap writes straight into a packed frame."""
+        from weatherbox.display.adapter import MonoBitmap, pack_frame
+
+        bitmaps = [MonoBitmap(), MonoBitmap(0xFF << 56)]
+        out = pack_frame(bitmaps, bytearray(16))
+
+        assert out[15] == 0xFF
+        assert out.count(0) == 15
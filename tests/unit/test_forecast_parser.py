@@ -107,6 +107,46 @@ class TestForecastParser:
         assert summary['max_temperature'] is None
         assert summary['min_temperature'] is None
 
+    def test_aggregate_daily_summary_cached(
+            self, parser, sample_periods, monkeypatch):
+        """Test repeated summaries of the same list are not recomputed."""
+        calls = []
+        compute = parser._aggregate_daily_summary
+        monkeypatch.setattr(parser, "_aggregate_daily_summary",
+                            lambda *a: calls.append(a) or compute(*a))
+        date = sample_periods[0]['timestamp']
+
+        first = parser.aggregate_daily_summary(sample_periods, date)
+        first['weather_type'] = 'Edited'
+        second = parser.aggregate_daily_summary(sample_periods, date)
+
+        assert len(calls) == 1
+        assert second['weather_type'] != 'Edited'
+
+        # A new or grown list is summarised afresh
+        parser.aggregate_daily_summary(list(sample_periods), date)
+        sample_periods.append(dict(sample_periods[0]))
+        parser.aggregate_daily_summary(sample_periods, date)
+        assert len(calls) == 3
+
+    def test_aggregate_daily_summary_refreshed_in_place(
+            self, parser, sample_periods):
+        """Test refilling the same list with new periods is not stale."""
+        date = sample_periods[0]['timestamp']
+        first = parser.aggregate_daily_summary(sample_periods, date)
+
+        # Next fetch: same number of periods, shifted a day, all rainy
+        sample_periods[:] = [
+            {**p, 'timestamp': p['timestamp'].replace(day=16),
+             'weather_type': 'Rainy'}
+            for p in sample_periods]
+        old_day = parser.aggregate_daily_summary(sample_periods, date)
+
+        assert first['period_count'] > 0
+        assert old_day['period_count'] == 0
+        assert parser.aggregate_daily_summary(
+            sample_periods, date.replace(day=16))['weather_type'] == 'Rainy'
+
     def test_aggregate_multi_day(self, parser):
         """Test aggregating periods from multiple days."""
         periods = [
@@ -134,6 +174,26 @@ class TestForecastParser:
         assert summaries[1]['date'].date() == datetime(2024, 1, 16).date()
         assert summaries[2]['date'].date() == datetime(2024, 1, 17).date()
 
+    def test_aggregate_multi_day_matches_per_day(self, parser):
+        """Test the bucketed pass agrees with per-date aggregation."""
+        periods = [
+            {
+                'timestamp': datetime(2024, 1, 15 + hour // 24, hour % 24),
+                'weather_type': ('Clear', 'Rainy', 'Fog')[hour % 3],
+                'temperature': hour % 11 if hour % 4 else None,
+            }
+            for hour in range(0, 72, 3)
+        ]
+        periods.append({'weather_type': 'Clear'})  # No timestamp
+
+        summaries = parser.aggregate_multi_day(periods)
+
+        assert summaries == [
+            parser.aggregate_daily_summary(periods, datetime(2024, 1, day))
+            for day in (15, 16, 17)
+        ]
+        assert parser.last_parsed_count == 8
+
     def test_weather_type_distribution(self, parser, sample_periods):
         """Test weather type distribution calculation."""
         distribution = parser.get_weather_type_distribution(sample_periods)
@@ -178,6 +238,21 @@ class TestForecastParser:
         assert is_valid is False
         assert any('weather_type' in e for e in errors)
 
+    def test_validate_periods_caps_errors(self, parser):
+        """Test validation stops once max_errors have been collected."""
+        periods = [{'weather_type': 1}] * 1000
+
+        is_valid, errors = parser.validate_periods(periods, max_errors=5)
+
+        assert is_valid is False
+        assert len(errors) == 5
+        assert errors[0] == "Period 0 missing keys: {'timestamp'}"
+
+    def test_iter_validation_errors_is_lazy(self, parser, sample_periods):
+        """Test the error generator yields nothing for valid periods."""
+        assert next(parser.iter_validation_errors(sample_periods), None) \
+            is None
+
     def test_validate_periods_not_list(self, parser):
         """Test validation catches non-list input."""
         is_valid, errors = parser.validate_periods({'weather_type': 'Clear'})
@@ -203,6 +278,17 @@ class TestForecastParser:
         weather_type = parser._select_weather_type(periods)
         assert weather_type == 'Clear'  # 3 out of 5
 
+    def test_select_weather_type_tie_keeps_first_seen(self, parser):
+        """Test ties resolve to the type that appeared first."""
+        periods = [
+            {'weather_type': 'Rainy'},
+            {'weather_type': 'Clear'},
+            {'weather_type': 'Clear'},
+            {'weather_type': 'Rainy'},
+        ]
+
+        assert parser._select_weather_type(periods) == 'Rainy'
+
     def test_last_parsed_count(self, parser, sample_periods):
         """Test that parser tracks period count."""
         target_date = datetime(2024, 1, 15)
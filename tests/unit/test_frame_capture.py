@@ -0,0 +1,191 @@
+"""
+Unit tests for frame capture display adapter.
+Tests buffered frame writes and captured frame inspection.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from weatherbox.display.adapter import Bitmap
+from weatherbox.display.frame_capture import FrameCaptureAdapter
+
+
+@pytest.fixture
+def capture(tmp_path):
+    """Create initialized capture adapter writing to a temp dir."""
+    adapter = FrameCaptureAdapter(
+        capture_dir=str(tmp_path / "frames"), flush_threshold=4)
+    adapter.initialize()
+    return adapter
+
+
+def _lit_bitmap(x: int = 0, y: int = 0) -> Bitmap:
+    bitmap = Bitmap()
+    bitmap.set_pixel(x, y, 255)
+    return bitmap
+
+
+class TestBufferedCapture:
+    """Test frames are buffered and flushed in batches."""
+
+    def test_frames_buffered_below_threshold(self, capture):
+        """Test nothing is written until the batch fills."""
+        capture.render_frame(0, _lit_bitmap())
+        capture.render_frame(1, _lit_bitmap())
+
+        assert list(capture.capture_dir.glob("frame_*.json")) == []
+
+    def test_flush_writes_pending_frames(self, capture):
+        """Test flush writes every buffered frame."""
+        for i in range(3):
+            capture.render_frame(i, _lit_bitmap())
+
+        capture.flush()
+
+        assert len(list(capture.capture_dir.glob("frame_*.json"))) == 3
+
+    def test_threshold_triggers_background_write(self, capture):
+        """Test a full batch is written without an explicit flush."""
+        for i in range(4):
+            capture.render_frame(i % 4, _lit_bitmap())
+
+        capture._queue.join()
+        assert len(list(capture.capture_dir.glob("frame_*.json"))) == 4
+
+    def test_shutdown_flushes(self, capture):
+        """Test shutdown writes buffered frames."""
+        capture.render_all([_lit_bitmap(i, i) for i in range(4)])
+        capture.shutdown()
+
+        assert len(list(capture.capture_dir.glob("frame_*.json"))) == 1
+
+    def test_load_captured_frame(self, capture):
+        """Test captured frames can be listed and loaded."""
+        capture.render_all([_lit_bitmap(i, i) for i in range(4)])
+
+        frames = capture.get_captured_frames()
+        data = capture.load_frame(frames[-1])
+
+        assert data['render_count'] == 1
+        assert data['matrices'][2]['pixel_count'] == 1
+        assert data['matrices'][2]['bitmap'][2 * 8 + 2] == 255
+
+    def test_clear_all_reuses_bitmaps(self, capture):
+        """Test render and clear copy into the adapter's own bitmaps."""
+        owned = list(capture.matrices)
+        source = _lit_bitmap(3, 3)
+
+        capture.render_frame(0, source)
+        source.clear()
+        assert capture.matrices[0].get_pixel(3, 3) == 255
+
+        capture.clear_all()
+        assert all(a is b for a, b in zip(capture.matrices, owned))
+        assert capture.matrices[0].get_pixel(3, 3) == 0
+
+    def test_timestamp_written_as_iso(self, capture):
+        """Test the raw capture stamp is stored as an ISO string."""
+        capture.render_all([_lit_bitmap() for _ in range(4)])
+
+        data = capture.load_frame(capture.get_captured_frames()[-1])
+
+        assert datetime.fromisoformat(data['timestamp'])
+
+    def test_pixel_count_derived_on_load(self, capture):
+        """Test pixel_count is computed on load, not written per frame."""
+        capture.render_all([_lit_bitmap(i, 0) for i in range(4)])
+        frame_file = capture.get_captured_frames()[-1]
+
+        assert b'pixel_count' not in frame_file.read_bytes()
+        data = capture.load_frame(frame_file)
+        assert [m['pixel_count'] for m in data['matrices']] == [1, 1, 1, 1]
+
+    def test_sparse_encoding_round_trip(self, capture):
+        """Test frames are stored as mask + vals and decoded on load."""
+        bitmap = Bitmap()
+        bitmap.set_pixel(0, 0, 7)
+        bitmap.set_pixel(5, 3, 200)
+        bitmap.set_pixel(7, 7, 255)
+        capture.render_all([bitmap, Bitmap(), Bitmap(), Bitmap()])
+        frame_file = capture.get_captured_frames()[-1]
+
+        raw = json.loads(frame_file.read_bytes())
+        assert raw['matrices'][0]['vals'] == [7, 200, 255]
+        assert 'bitmap' not in raw['matrices'][0]
+
+        data = capture.load_frame(frame_file)
+        assert data['matrices'][0]['bitmap'] == list(bitmap.data)
+        assert data['matrices'][1]['bitmap'] == [0] * 64
+
+    def test_shutdown_stops_writer(self, capture):
+        """Test shutdown drains the queue and stops the writer thread."""
+        for i in range(4):
+            capture.render_frame(i, _lit_bitmap())
+        writer = capture._writer
+
+        capture.shutdown()
+
+        assert not writer.is_alive()
+        assert len(list(capture.capture_dir.glob("frame_*.json"))) == 4
+
+
+class TestWriterQueue:
+    """Test the bounded queue between capture and the writer thread."""
+
+    def test_full_queue_writes_batch_inline(
+            self, tmp_path, monkeypatch, caplog):
+        """Test a stalled writer makes capture write inline, not drop."""
+        capture = FrameCaptureAdapter(
+            capture_dir=str(tmp_path), flush_threshold=1, queue_size=1)
+        capture.initialize()
+        monkeypatch.setattr(capture, 'QUEUE_PUT_TIMEOUT', 0.01)
+        release = threading.Event()
+        write_batch = capture._write_batch
+
+        def stalled_write(batch):
+            if threading.current_thread() is capture._writer:
+                release.wait(5)
+            write_batch(batch)
+
+        monkeypatch.setattr(capture, '_write_batch', stalled_write)
+
+        capture.render_frame(0, _lit_bitmap())   # Taken by the writer
+        while not capture._queue.empty():
+            time.sleep(0.001)
+        capture.render_frame(0, _lit_bitmap())   # Fills the queue
+        capture.render_frame(0, _lit_bitmap())   # Written inline
+
+        assert "writing 1 captured frames inline" in caplog.text
+        assert (tmp_path / "frame_000003.json").exists()
+        release.set()
+        capture.shutdown()
+
+        assert len(list(tmp_path.glob("frame_*.json"))) == 3
+
+
+class TestCapturedFrames:
+    """Test listing of captured frame files."""
+
+    def test_lists_frames_written_this_session(self, capture):
+        """Test written frames are listed in order without duplicates."""
+        capture.render_frame(0, _lit_bitmap())
+        capture.render_frame(1, _lit_bitmap())
+        capture.clear_all()
+
+        frames = capture.get_captured_frames()
+
+        assert [f.name for f in frames] == [
+            "frame_000001.json", "frame_000002.json"]
+
+    def test_falls_back_to_directory_scan(self, capture):
+        """Test captures from an earlier run are found on a cold start."""
+        capture.render_frame(0, _lit_bitmap())
+        capture.shutdown()
+
+        reopened = FrameCaptureAdapter(capture_dir=str(capture.capture_dir))
+
+        assert reopened.get_captured_frames() == capture.get_captured_frames()
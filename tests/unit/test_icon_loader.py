@@ -0,0 +1,151 @@
+"""
+Unit tests for icon loader.
+Tests weather type to icon ID mapping and case-insensitive lookups.
+"""
+
+import pytest
+import yaml
+
+from weatherbox.icons.loader import (
+    IconLoader, _fast_lower, load_icon_mapping)
+
+
+@pytest.fixture
+def icons_path(tmp_path):
+    """Create a small icons.yaml."""
+    path = tmp_path / "icons.yaml"
+    path.write_text(
+        "fallback: 9\n"
+        "mappings:\n"
+        "  Clear: 1\n"
+        "  Partly cloudy: 2\n",
+        encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def loader(icons_path):
+    """Create loader reading the temp config."""
+    return IconLoader(config_path=str(icons_path))
+
+
+class TestIconLookup:
+    """Test icon ID lookups."""
+
+    def test_exact_match(self, loader):
+        """Test exact weather type match."""
+        assert loader.get_icon_id("Partly cloudy") == 2
+
+    def test_case_insensitive_match(self, loader):
+        """Test lookups ignore case."""
+        assert loader.get_icon_id("PARTLY CLOUDY") == 2
+        assert loader.is_mapped("clear")
+
+    def test_unmapped_uses_fallback(self, loader):
+        """Test unmapped types get the configured fallback."""
+        assert loader.get_icon_id("Sandstorm") == 9
+        assert loader.get_unmapped_types(
+            ["clear", "Sandstorm", "Fog"]) == ["Sandstorm", "Fog"]
+
+    def test_assigned_mappings_are_indexed(self, loader):
+        """Test replacing mappings rebuilds the case-insensitive index."""
+        loader.mappings = {"Heavy rain": 7}
+
+        assert loader.get_icon_id("heavy rain") == 7
+        assert not loader.is_mapped("clear")
+
+    def test_reload_picks_up_changes(self, loader, icons_path):
+        """Test reload replaces mappings from disk."""
+        icons_path.write_text("mappings:\n  Fog: 4\n", encoding="utf-8")
+
+        loader.reload_mapping()
+
+        assert loader.get_icon_id("fog") == 4
+        assert not loader.is_mapped("Clear")
+
+
+class TestYamlCache:
+    """Test parsed icon config is reused while the file is unchanged."""
+
+    def test_reload_unchanged_file_skips_parse(
+            self, loader, monkeypatch):
+        """Test reloading an untouched file does not re-parse it."""
+        assert loader.is_mapped("Clear")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("config re-parsed")
+        monkeypatch.setattr(yaml, "load", fail)
+
+        loader.reload_mapping()
+
+        assert loader.get_icon_id("Clear") == 1
+
+    def test_standalone_load_returns_copy(self, icons_path):
+        """Test callers cannot mutate the cached mappings."""
+        mappings = load_icon_mapping(str(icons_path))
+        mappings["Clear"] = 99
+
+        assert load_icon_mapping(str(icons_path))["Clear"] == 1
+
+
+class TestLazyLoad:
+    """Test icons.yaml is only read when the mapping is first needed."""
+
+    def test_construction_does_not_read_config(self, icons_path, monkeypatch):
+        """Test creating a loader leaves the config file untouched."""
+        reads = []
+        monkeypatch.setattr(yaml, "load", lambda *a, **k: reads.append(a))
+
+        IconLoader(config_path=str(icons_path))
+
+        assert reads == []
+
+    def test_fallback_loaded_on_access(self, loader):
+        """Test the configured fallback is read on first access."""
+        assert loader._loaded is False
+        assert loader.fallback_icon_id == 9
+        assert loader._loaded is True
+
+    def test_reload_defers_read(self, loader, icons_path):
+        """Test reload_mapping waits for the next lookup to re-read."""
+        assert loader.get_icon_id("Clear") == 1
+        icons_path.write_text("mappings:\n  Fog: 4\n", encoding="utf-8")
+
+        loader.reload_mapping()
+
+        assert loader._loaded is False
+        assert loader.mappings == {"Fog": 4}
+
+
+class TestFastLower:
+    """Test the lowercase helper used for lookups."""
+
+    def test_lowercase_input_reused(self):
+        """Test already-lowercase strings are returned unchanged."""
+        s = "partly cloudy"
+        assert _fast_lower(s) is s
+
+    def test_mixed_case_lowered(self):
+        """Test other strings are lowercased."""
+        assert _fast_lower("Heavy Rain") == "heavy rain"
+        assert _fast_lower("123") == "123"
+
+
+class TestIconIdCache:
+    """Test memoised icon ID lookups."""
+
+    def test_repeat_lookup_cached(self, loader):
+        """Test repeated lookups hit the cache."""
+        loader.get_icon_id("Clear")
+        loader.get_icon_id("Clear")
+
+        info = loader._icon_id_cached.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+    def test_cache_cleared_on_new_mappings(self, loader):
+        """Test a cached ID is not served after the mapping changes."""
+        assert loader.get_icon_id("Clear") == 1
+
+        loader.mappings = {"Clear": 5}
+
+        assert loader.get_icon_id("Clear") == 5
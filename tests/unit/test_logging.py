@@ -0,0 +1,96 @@
+"""
+Unit tests for logging configuration.
+Tests handler setup for console, file and muted configurations.
+Output handlers sit behind a QueueHandler/QueueListener pair.
+"""
+
+import logging
+import logging.handlers
+
+import pytest
+
+from weatherbox.logging import (
+    _stop_queue_listener,
+    configure_display_logging,
+    configure_logging,
+)
+
+
+@pytest.fixture(params=[configure_logging, configure_display_logging])
+def configure(request):
+    """Run each test against both configure functions."""
+    return request.param
+
+
+@pytest.fixture(autouse=True)
+def restore_loggers():
+    """Leave the package loggers as other tests expect them."""
+    saved = []
+    for name in ("weatherbox.provisioning", "weatherbox.display"):
+        logger = logging.getLogger(name)
+        saved.append((logger, logger.level, logger.propagate,
+                      list(logger.handlers)))
+    yield
+    for logger, level, propagate, handlers in saved:
+        _stop_queue_listener(logger)
+        logger.setLevel(level)
+        logger.propagate = propagate
+        logger.handlers[:] = handlers
+
+
+class TestConfigureLogging:
+    """Test logger handler configuration."""
+
+    def test_console_handler(self, configure):
+        """Test console output attaches a stream handler at the level."""
+        logger = configure(log_level="WARNING")
+
+        assert [type(h) for h in logger.handlers] == [
+            logging.handlers.QueueHandler]
+        (handler,) = logger._queue_listener.handlers
+        assert isinstance(handler, logging.StreamHandler)
+        assert handler.level == logging.WARNING
+        assert logger.propagate is True
+
+    def test_file_handler_creates_directory(self, configure, tmp_path):
+        """Test file logging creates the log directory."""
+        log_file = tmp_path / "logs" / "weatherbox.log"
+
+        logger = configure(log_file=str(log_file), console_output=False)
+
+        assert log_file.parent.is_dir()
+        assert [type(h) for h in logger._queue_listener.handlers] == [
+            logging.handlers.RotatingFileHandler]
+
+    def test_records_written_by_listener(self, configure, tmp_path):
+        """Test queued records reach the file once the listener drains."""
+        log_file = tmp_path / "weatherbox.log"
+        logger = configure(log_file=str(log_file), console_output=False)
+
+        logger.info("queued %s", "record")
+        _stop_queue_listener(logger)
+
+        assert "[INFO]" in log_file.read_text()
+        assert "queued record" in log_file.read_text()
+
+    def test_reconfigure_stops_previous_listener(self, configure):
+        """Test configuring again replaces the old listener thread."""
+        first = configure()._queue_listener
+        thread = first._thread
+
+        logger = configure()
+
+        assert not thread.is_alive()
+        assert logger._queue_listener is not first
+        assert len(logger.handlers) == 1
+
+    def test_no_outputs_uses_null_handler(self, configure):
+        """Test a muted logger only gets a NullHandler."""
+        logger = configure(console_output=False)
+
+        assert [type(h) for h in logger.handlers] == [logging.NullHandler]
+        assert logger.propagate is False
+        assert logger._queue_listener is None
+
+        # Re-enabling output restores propagation
+        assert configure().propagate is True
@@ -47,6 +47,13 @@ class TestRetryScheduler:
             assert scheduler.attempt_count == i
             assert interval == timedelta(minutes=1)
 
+    def test_record_failure_reads_clock_once(self, scheduler):
+        """Test first failure stamps start and retry with the same time."""
+        with freeze_time("2024-01-15 12:00:00", auto_tick_seconds=1):
+            scheduler.record_failure()
+
+        assert scheduler.started_at == scheduler.last_retry_at
+
     @freeze_time("2024-01-15 12:00:00")
     def test_record_failure_phase2(self, scheduler):
         """Test failures 6-17 use 5-minute backoff."""
@@ -90,6 +97,59 @@ class TestRetryScheduler:
             assert scheduler.state == RetryState.BACKOFF_EXHAUSTED
             assert scheduler.is_retry_exhausted() is True
 
+    def test_record_failure_exhausted_custom_window(self):
+        """Test exhaustion honours a non-default retry window."""
+        scheduler = RetryScheduler(max_retry_hours=2, jitter=False)
+        current_time = datetime(2024, 1, 15, 12, 0)
+        scheduler.started_at = current_time
+
+        with freeze_time(current_time + timedelta(hours=1)):
+            assert scheduler.record_failure() == timedelta(minutes=1)
+
+        with freeze_time(current_time + timedelta(hours=3)):
+            interval = scheduler.record_failure()
+
+        assert scheduler.state == RetryState.BACKOFF_EXHAUSTED
+        assert interval == timedelta(hours=2)
+
+    def test_record_failure_ignores_wall_clock_jump(self, scheduler,
+                                                    monkeypatch):
+        """Test a wall-clock step does not exhaust retries early."""
+        ticks = iter([1000.0, 1060.0])
+        monkeypatch.setattr(
+            "weatherbox.weather.retry_scheduler.monotonic",
+            lambda: next(ticks))
+
+        scheduler.record_failure()
+        # Wall clock stepped two days since the first failure
+        scheduler.started_at -= timedelta(days=2)
+        interval = scheduler.record_failure()
+
+        assert scheduler.state == RetryState.BACKOFF_1_MIN
+        assert interval == timedelta(minutes=1)
+
+    @freeze_time("2024-01-15 12:00:00")
+    def test_jitter_stays_within_phase_bounds(self):
+        """Test jittered intervals fall between 1x and 3x the phase base."""
+        scheduler = RetryScheduler(max_retry_hours=24, jitter=True)
+        for attempt in range(1, 25):
+            interval = scheduler.record_failure()
+            base = (timedelta(minutes=1) if attempt <= 5
+                    else timedelta(minutes=5) if attempt <= 17
+                    else timedelta(minutes=10))
+
+            assert base <= interval <= base * 3
+
+    @freeze_time("2024-01-15 12:00:00")
+    def test_jitter_spreads_schedulers(self):
+        """Test schedulers failing together pick different intervals."""
+        intervals = {
+            RetryScheduler(max_retry_hours=24, jitter=True).record_failure()
+            for _ in range(10)
+        }
+
+        assert len(intervals) > 1
+
     @freeze_time("2024-01-15 12:00:00")
     def test_record_success_clears_state(self, scheduler):
         """Test successful update resets retry state."""
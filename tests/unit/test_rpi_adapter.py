@@ -0,0 +1,194 @@
+"""
+Unit tests for Raspberry Pi LED matrix adapter.
+Uses a fake rgbmatrix object to record the calls made to the library.
+"""
+
+import pytest
+
+from weatherbox.display.adapter import Bitmap
+from weatherbox.display.rpi_adapter import PILImage, RpiAdapter
+
+
+class FakeCanvas:
+    """Records SetPixel/SetImage calls made by the adapter."""
+
+    def __init__(self):
+        self.pixels = {}
+        self.images = []
+        self.brightness = 100
+
+    def SetPixel(self, x, y, r, g, b):
+        self.pixels[(x, y)] = (r, g, b)
+
+    def SetImage(self, image, offset_x=0, offset_y=0):
+        self.images.append((image, offset_x, offset_y))
+
+    def Clear(self):
+        self.pixels.clear()
+        self.images.clear()
+
+
+class FakeMatrix(FakeCanvas):
+    """Fake RGBMatrix with double-buffered canvases."""
+
+    def __init__(self):
+        super().__init__()
+        self.front = None
+        self.swaps = 0
+
+    def CreateFrameCanvas(self):
+        return FakeCanvas()
+
+    def SwapOnVSync(self, canvas):
+        previous, self.front = self.front or FakeCanvas(), canvas
+        self.swaps += 1
+        return previous
+
+
+@pytest.fixture
+def adapter():
+    """Create adapter wired to a fake matrix."""
+    rpi = RpiAdapter()
+    rpi.matrix = FakeMatrix()
+    rpi._canvas = rpi.matrix.CreateFrameCanvas()
+    rpi._initialized = True
+    return rpi
+
+
+@pytest.fixture
+def no_pillow(monkeypatch):
+    """Force the SetPixel fallback path."""
+    monkeypatch.setattr(PILImage, "get_module", classmethod(
+        lambda cls: None))
+
+
+@pytest.fixture
+def bitmap():
+    """Bitmap with a single lit pixel at (1, 2)."""
+    bm = Bitmap()
+    bm.set_pixel(1, 2, 90)
+    return bm
+
+
+class TestRenderFrame:
+    """Test single-matrix rendering."""
+
+    def test_setpixel_fallback_without_pillow(
+            self, adapter, bitmap, no_pillow):
+        """Test per-pixel writes are used when Pillow is missing."""
+        assert adapter.render_frame(2, bitmap) is True
+
+        front = adapter.matrix.front
+        assert len(front.pixels) == 4 * 64
+        assert front.pixels[(17, 2)] == (90, 90, 90)
+        assert front.pixels[(16, 2)] == (0, 0, 0)
+
+    def test_setimage_with_pillow(self, adapter, bitmap):
+        """Test the whole frame is one SetImage blit when Pillow is present."""
+        pytest.importorskip("PIL")
+
+        assert adapter.render_frame(2, bitmap) is True
+
+        front = adapter.matrix.front
+        assert front.pixels == {}
+        assert len(front.images) == 1
+        image, offset_x, offset_y = front.images[0]
+        assert (offset_x, offset_y) == (0, 0)
+        assert image.mode == "RGB"
+        assert image.size == (32, 8)
+        assert image.getpixel((17, 2)) == (90, 90, 90)
+        assert image.getpixel((1, 2)) == (0, 0, 0)
+
+    def test_invalid_index(self, adapter, bitmap):
+        """Test out-of-range matrix index is rejected."""
+        assert adapter.render_frame(4, bitmap) is False
+
+    def test_partial_update_keeps_other_matrices(
+            self, adapter, bitmap, no_pillow):
+        """Test updating one matrix redraws the others unchanged."""
+        adapter.render_frame(0, bitmap)
+        other = Bitmap()
+        other.set_pixel(0, 0, 200)
+        adapter.render_frame(3, other)
+
+        front = adapter.matrix.front
+        assert front.pixels[(1, 2)] == (90, 90, 90)
+        assert front.pixels[(24, 0)] == (200, 200, 200)
+
+
+class TestRenderAll:
+    """Test double-buffered full-frame rendering."""
+
+    def test_single_swap_per_frame(self, adapter, bitmap, no_pillow):
+        """Test all matrices land on the display in one vsync swap."""
+        assert adapter.render_all([bitmap] * 4) is True
+
+        assert adapter.matrix.swaps == 1
+        front = adapter.matrix.front
+        for col in (1, 9, 17, 25):
+            assert front.pixels[(col, 2)] == (90, 90, 90)
+
+    def test_single_blit_per_frame(self, adapter):
+        """Test matrices are tiled left to right in one image."""
+        pytest.importorskip("PIL")
+        bitmaps = [Bitmap() for _ in range(4)]
+        for i, bm in enumerate(bitmaps):
+            bm.set_pixel(7, 7, 10 * (i + 1))
+
+        assert adapter.render_all(bitmaps) is True
+
+        (image, _, _), = adapter.matrix.front.images
+        assert [image.getpixel((8 * i + 7, 7))[0] for i in range(4)] == [
+            10, 20, 30, 40]
+
+    def test_clear_all(self, adapter, bitmap, no_pillow):
+        """Test clearing swaps in a blank frame."""
+        adapter.render_all([bitmap] * 4)
+        assert adapter.clear_all() is True
+
+        front = adapter.matrix.front
+        assert set(front.pixels.values()) == {(0, 0, 0)}
+
+    def test_too_many_bitmaps(self, adapter, bitmap):
+        """Test more bitmaps than matrices is rejected."""
+        assert adapter.render_all([bitmap] * 5) is False
+
+    def test_rgb_image_reused_between_frames(self, adapter, bitmap):
+        """Test each frame refills the same RGB image in place."""
+        pytest.importorskip("PIL")
+
+        adapter.render_all([bitmap] * 4)
+        (first, _, _), = adapter.matrix.front.images
+        adapter.clear_all()
+        (second, _, _), = adapter.matrix.front.images
+
+        assert second is first
+        assert second.getpixel((1, 2)) == (0, 0, 0)
+
+
+class TestTone:
+    """Test colour tone lookup tables."""
+
+    def test_amber_tone_with_pillow(self, adapter, bitmap):
+        """Test the tone tables are applied to the frame image."""
+        pytest.importorskip("PIL")
+
+        assert adapter.set_tone('amber') is True
+        adapter.render_frame(0, bitmap)
+
+        (image, _, _), = adapter.matrix.front.images
+        assert image.getpixel((1, 2)) == (90, 45, 0)
+
+    def test_tone_change_redraws(self, adapter, bitmap, no_pillow):
+        """Test changing tone redraws the current frame via SetPixel."""
+        adapter.render_frame(0, bitmap)
+
+        assert adapter.set_tone('red') is True
+
+        assert adapter.matrix.swaps == 2
+        assert adapter.matrix.front.pixels[(1, 2)] == (90, 0, 0)
+
+    def test_unknown_tone(self, adapter):
+        """Test an unknown tone is rejected and the tone kept."""
+        assert adapter.set_tone('purple') is False
+        assert adapter.tone == 'white'
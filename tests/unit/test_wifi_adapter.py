@@ -167,9 +167,177 @@ class TestMockWifiAdapter:
         assert status.ip_address == "192.168.1.50"
 
 
+class TestBinaryAvailable:
+    """Test the shared PATH lookup used by both adapters."""
+
+    def test_lookup_is_memoised(self):
+        """Test repeated lookups for a binary scan PATH once."""
+        from weatherbox.wifi import adapter
+
+        adapter._binary_available.cache_clear()
+        try:
+            with patch('weatherbox.wifi.adapter.shutil.which',
+                       return_value='/usr/bin/nmcli') as mock_which:
+                assert adapter._binary_available('nmcli') is True
+                assert adapter._binary_available('nmcli') is True
+
+            mock_which.assert_called_once_with('nmcli')
+        finally:
+            adapter._binary_available.cache_clear()
+
+
 class TestNetworkManagerAdapter:
     """Test NetworkManager adapter with mocks."""
 
+    @pytest.fixture(autouse=True)
+    def nmcli_present(self):
+        """Pretend nmcli is installed and keep off the real system bus."""
+        with patch('weatherbox.wifi.nm_adapter._binary_available',
+                   return_value=True), \
+                patch('weatherbox.wifi.nm_adapter.NetworkManagerAdapter'
+                      '._open_dbus'):
+            yield
+
+    @pytest.fixture
+    def dbus_adapter(self):
+        """Adapter wired to fake NetworkManager D-Bus objects."""
+        from weatherbox.wifi.nm_adapter import NetworkManagerAdapter
+
+        objects = {
+            '/dev/wlan0': {
+                'State': 100,
+                'ActiveConnection': '/active/1',
+                'Ip4Config': '/ip4/1',
+            },
+            '/active/1': {'Id': 'HomeNet'},
+            '/ip4/1': {'AddressData': [
+                {'address': ('s', '192.168.1.50'), 'prefix': ('u', 24)}]},
+            '/ap/1': {'Ssid': b'HomeNet', 'Strength': 82,
+                      'Flags': 1, 'WpaFlags': 0, 'RsnFlags': 0x188},
+            '/ap/2': {'Ssid': b'Cafe', 'Strength': 40,
+                      'Flags': 0, 'WpaFlags': 0, 'RsnFlags': 0},
+            '/ap/3': {'Ssid': b'', 'Strength': 10},
+        }
+        scans = iter(range(1000))
+
+        def properties(path, interface, timeout=10):
+            if interface.endswith('.Wireless'):
+                # Each read sees a newer LastScan, i.e. the rescan landed
+                return {'LastScan': next(scans)}
+            return objects[path]
+
+        adapter = NetworkManagerAdapter()
+        adapter._wifi_device = '/dev/wlan0'
+        adapter._dbus_call = MagicMock(
+            return_value=(['/ap/1', '/ap/2', '/ap/3'],))
+        adapter._dbus_properties = MagicMock(side_effect=properties)
+        return adapter
+
+    @patch('weatherbox.wifi.nm_adapter.subprocess.run')
+    def test_scan_uses_dbus(self, mock_run, dbus_adapter):
+        """Test scan reads access points over D-Bus without forking."""
+        networks = dbus_adapter.scan(timeout_seconds=5)
+
+        assert [(n.ssid, n.signal_strength, n.security)
+                for n in networks] == [
+            ("HomeNet", 82, "WPA2"), ("Cafe", 40, "Open")]
+        assert not mock_run.called
+
+    def test_scan_requests_rescan(self, dbus_adapter):
+        """Test scan asks NetworkManager for fresh results first."""
+        dbus_adapter.scan(timeout_seconds=5)
+
+        methods = [c.args[2] for c in dbus_adapter._dbus_call.call_args_list]
+        assert methods == ['RequestScan', 'GetAllAccessPoints']
+
+    def test_scan_survives_rejected_rescan(self, dbus_adapter):
+        """Test a refused rescan (e.g. already scanning) still lists APs."""
+        def call(path, interface, method, *args):
+            if method == 'RequestScan':
+                raise RuntimeError("Scanning not allowed while already busy")
+            return (['/ap/1', '/ap/2'],)
+        dbus_adapter._dbus_call.side_effect = call
+
+        assert [n.ssid for n in dbus_adapter.scan(timeout_seconds=5)] == [
+            "HomeNet", "Cafe"]
+
+    def test_scan_timeout_bounds_whole_scan(self, dbus_adapter):
+        """Test per-AP reads share one deadline rather than each waiting."""
+        dbus_adapter.scan(timeout_seconds=5)
+
+        ap_timeouts = [
+            c.args[2] for c in dbus_adapter._dbus_properties.call_args_list
+            if c.args[0].startswith('/ap/')]
+        assert len(ap_timeouts) == 3
+        assert all(0 < t <= 5 for t in ap_timeouts)
+        assert ap_timeouts == sorted(ap_timeouts, reverse=True)
+
+    def test_scan_stops_at_deadline(self, dbus_adapter):
+        """Test no access points are read once the deadline has passed."""
+        assert dbus_adapter.scan(timeout_seconds=0) == []
+        assert not [
+            c for c in dbus_adapter._dbus_properties.call_args_list
+            if c.args[0].startswith('/ap/')]
+
+    @patch('weatherbox.wifi.nm_adapter.subprocess.run')
+    def test_scan_falls_back_to_nmcli(self, mock_run, dbus_adapter):
+        """Test a failing D-Bus scan falls back to nmcli."""
+        dbus_adapter._dbus_call.side_effect = OSError("bus gone")
+        mock_run.return_value = MagicMock(returncode=0, stdout="header\n")
+
+        assert dbus_adapter.scan(timeout_seconds=5) == []
+        assert mock_run.called
+
+    @patch('weatherbox.wifi.nm_adapter.subprocess.run')
+    def test_status_uses_dbus(self, mock_run, dbus_adapter):
+        """Test status reads the active connection over D-Bus."""
+        status = dbus_adapter.status()
+
+        assert status.connected is True
+        assert status.ssid == "HomeNet"
+        assert status.ip_address == "192.168.1.50"
+        assert not mock_run.called
+
+    def test_dbus_calls_are_serialised(self):
+        """Test concurrent callers never share the connection at once."""
+        pytest.importorskip("jeepney")
+        import threading
+        import time
+        from weatherbox.wifi.nm_adapter import NetworkManagerAdapter
+
+        active, overlaps = [], []
+
+        class SlowConnection:
+            def send_and_get_reply(self, message, timeout, unwrap):
+                active.append(message)
+                overlaps.append(len(active))
+                time.sleep(0.01)
+                active.remove(message)
+                return ([],)
+
+        adapter = NetworkManagerAdapter()
+        adapter._dbus = SlowConnection()
+        threads = [
+            threading.Thread(target=adapter._dbus_call,
+                             args=('/dev/wlan0', 'iface', 'Method'))
+            for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert overlaps == [1, 1, 1, 1]
+
+    def test_security_from_flags(self):
+        """Test access point flags map to security labels."""
+        from weatherbox.wifi.nm_adapter import NetworkManagerAdapter
+
+        security = NetworkManagerAdapter._security_from_flags
+        assert security(1, 0, 0x500) == "WPA3"
+        assert security(1, 0x108, 0) == "WPA"
+        assert security(1, 0, 0) == "WEP"
+        assert security(0, 0, 0) == "Open"
+
     @patch('weatherbox.wifi.nm_adapter.subprocess.run')
     def test_scan_can_be_called(self, mock_run):
         """Test that scan method can be called."""
@@ -201,6 +369,21 @@ class TestNetworkManagerAdapter:
         assert mock_run.called
         assert isinstance(result, bool)
 
+    @patch('weatherbox.wifi.nm_adapter.subprocess.run')
+    def test_connect_rejected_password_raises(self, mock_run):
+        """Test nmcli secrets errors surface as WifiAuthError."""
+        from weatherbox.wifi import nm_adapter
+
+        mock_run.return_value = MagicMock(returncode=0)
+        adapter = nm_adapter.NetworkManagerAdapter()
+        mock_run.return_value = MagicMock(
+            returncode=4,
+            stderr="Error: Connection activation failed: "
+                   "Secrets were required, but not provided.")
+
+        with pytest.raises(nm_adapter.WifiAuthError):
+            adapter.connect("TestNet", "wrongpass", timeout_seconds=10)
+
     @patch('weatherbox.wifi.nm_adapter.subprocess.run')
     def test_disconnect_can_be_called(self, mock_run):
         """Test that disconnect method can be called."""
@@ -214,6 +397,41 @@ class TestNetworkManagerAdapter:
         assert mock_run.called
         assert isinstance(result, bool)
 
+    @patch('weatherbox.wifi.nm_adapter.subprocess.run')
+    def test_status_parses_terse_output(self, mock_run):
+        """Test status reads the terse key:value fields from nmcli."""
+        from weatherbox.wifi.nm_adapter import NetworkManagerAdapter
+
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout="GENERAL.STATE:100 (connected)\n"
+                   "GENERAL.CONNECTION:Home\\:Net\n"
+                   "IP4.ADDRESS[1]:192.168.1.50/24\n"
+                   "IP4.ADDRESS[2]:10.0.0.5/8\n")
+
+        status = NetworkManagerAdapter().status()
+
+        assert status.connected is True
+        assert status.ssid == "Home:Net"
+        assert status.ip_address == "192.168.1.50"
+        assert mock_run.call_args[0][0][:2] == ['nmcli', '-t']
+
+    @patch('weatherbox.wifi.nm_adapter.subprocess.run')
+    def test_status_disconnected(self, mock_run):
+        """Test an unconnected device reports no SSID or address."""
+        from weatherbox.wifi.nm_adapter import NetworkManagerAdapter
+
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout="GENERAL.STATE:30 (disconnected)\n"
+                   "GENERAL.CONNECTION:\n")
+
+        status = NetworkManagerAdapter().status()
+
+        assert status.connected is False
+        assert status.ssid is None
+        assert status.ip_address is None
+
 
 class TestWpaSupplicantAdapter:
     """Test wpa_supplicant adapter with mocks."""
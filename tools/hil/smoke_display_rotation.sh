@@ -300,7 +300,7 @@ try:
     from weatherbox.weather.retry_scheduler import RetryScheduler, RetryState
     from datetime import timedelta
     
-    scheduler = RetryScheduler()
+    scheduler = RetryScheduler(jitter=False)
     
     # First failure should trigger 1-min backoff
     interval = scheduler.record_failure()